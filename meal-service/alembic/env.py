@@ -10,6 +10,9 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 from core.database import Base
 from models.meal import Meal, RecipeList
+from models.recipe_summary import RecipeSummary
+from models.recipe_cook_stats import GroupRecipeCookStats, RecipeCookStats
+from models.outbox import OutboxEvent
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,35 @@
+"""add partial index for meal expiry
+
+Revision ID: 3b7d9f1a2c4e
+Revises: ed6e6e4d08bc
+Create Date: 2026-10-19 17:34:18.620473
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d9f1a2c4e'
+down_revision: Union[str, Sequence[str], None] = 'ed6e6e4d08bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expiry job: pending meals walked in meal_id order, date checked from the index
+    op.create_index(
+        "ix_meals_created_meal_id_date",
+        "meals",
+        ["meal_id", "date"],
+        unique=False,
+        postgresql_where=sa.text("meal_status = 'CREATED'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_meals_created_meal_id_date", table_name="meals")
@@ -0,0 +1,39 @@
+"""add recipe summaries replica
+
+Revision ID: 8c1e4a7b2d95
+Revises: 3b7d9f1a2c4e
+Create Date: 2026-10-19 18:40:12.274518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1e4a7b2d95'
+down_revision: Union[str, Sequence[str], None] = '3b7d9f1a2c4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recipe_summaries',
+    sa.Column('recipe_id', sa.Integer(), nullable=False),
+    sa.Column('recipe_name', sa.String(), nullable=False),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('prep_time', sa.Integer(), nullable=True),
+    sa.Column('cook_time', sa.Integer(), nullable=True),
+    sa.Column('default_servings', sa.Integer(), nullable=True),
+    sa.Column('level', sa.String(), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('recipe_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('recipe_summaries')
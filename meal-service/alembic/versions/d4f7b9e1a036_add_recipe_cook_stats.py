@@ -0,0 +1,105 @@
+"""add recipe cook stats and outbox events
+
+Revision ID: d4f7b9e1a036
+Revises: 8c1e4a7b2d95
+Create Date: 2026-10-19 19:05:37.946120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7b9e1a036'
+down_revision: Union[str, Sequence[str], None] = '8c1e4a7b2d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _stats_columns() -> list:
+    return [
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        sa.Column('cook_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('servings_cooked', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_cooked_on', sa.Date(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('topic', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=True),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id')
+    )
+    op.create_index('ix_outbox_events_pending', 'outbox_events', ['available_at', 'id'], unique=False,
+                    postgresql_where=sa.text('sent_at IS NULL'))
+
+    op.create_table('group_recipe_cook_stats',
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    *_stats_columns(),
+    sa.PrimaryKeyConstraint('group_id', 'recipe_id')
+    )
+    op.create_table('recipe_cook_stats',
+    *_stats_columns(),
+    sa.PrimaryKeyConstraint('recipe_id')
+    )
+
+    # Backfill from the finished meals so far (a recipe appears at most once per meal)
+    op.execute("""
+        INSERT INTO group_recipe_cook_stats (group_id, recipe_id, cook_count, servings_cooked, last_cooked_on)
+        SELECT m.group_id, r.recipe_id, count(*), sum(r.servings), max(m.date)
+        FROM meals m
+        JOIN recipe_lists r ON r.meal_id = m.meal_id
+        WHERE m.meal_status = 'DONE'
+        GROUP BY m.group_id, r.recipe_id
+    """)
+    op.execute("""
+        INSERT INTO recipe_cook_stats (recipe_id, cook_count, servings_cooked, last_cooked_on)
+        SELECT recipe_id, sum(cook_count), sum(servings_cooked), max(last_cooked_on)
+        FROM group_recipe_cook_stats
+        GROUP BY recipe_id
+    """)
+    # One recipe_cook_counts snapshot per group, so recipe-service starts from the backfilled totals
+    op.execute("""
+        INSERT INTO outbox_events (event_id, topic, key, payload, attempts)
+        SELECT gen_random_uuid(), 'meal_service.recipe.cooked', g.group_id::text,
+               jsonb_build_object(
+                   'event_type', 'recipe_cook_counts',
+                   'data', jsonb_build_object(
+                       'group_id', g.group_id,
+                       'recipes', jsonb_agg(jsonb_build_object(
+                           'recipe_id', g.recipe_id,
+                           'group_cook_count', g.cook_count,
+                           'group_last_cooked_on', g.last_cooked_on,
+                           'cook_count', t.cook_count,
+                           'last_cooked_on', t.last_cooked_on
+                       ) ORDER BY g.recipe_id)
+                   )
+               ),
+               0
+        FROM group_recipe_cook_stats g
+        JOIN recipe_cook_stats t ON t.recipe_id = g.recipe_id
+        GROUP BY g.group_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('recipe_cook_stats')
+    op.drop_table('group_recipe_cook_stats')
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events', postgresql_where=sa.text('sent_at IS NULL'))
+    op.drop_table('outbox_events')
@@ -1,16 +1,21 @@
 from contextlib import asynccontextmanager
-from core.database import engine, Base
+from core.database import engine, Base, database_manager
 from core.config import settings
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from core.head_chef_middleware import HeadChefMiddleware
-from core.messaging import kafka_manager
+from core.head_chef_access import head_chef_access
+from services.shopping_plan_drafter import shopping_plan_drafter
+from core.messaging import kafka_manager, outbox_relay
 from apis.v1.meal_api import meal_router
-from tasks.scheduler import setup_scheduler
+from messaging.consumers.group_membership_consumer import consume_group_membership_events
+from messaging.consumers.recipe_summary_consumer import consume_recipe_events
+from tasks.scheduler import setup_scheduler, job_coordinator
 from shopping_shared.caching.redis_manager import redis_manager
 from core.config import settings
 from shopping_shared.utils.logger_utils import get_logger
+import asyncio
 
 logger = get_logger("MealService")
 
@@ -26,7 +31,15 @@ async def lifespan(app: FastAPI):
             db=settings.REDIS_DB,
             password=settings.REDIS_PASSWORD
         )
+        await database_manager.setup(
+            database_uri=settings.ASYNC_DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW
+        )
         kafka_manager.setup(bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS)
+        outbox_relay.start()
+        head_chef_access.start()
+        shopping_plan_drafter.start()
         scheduler = setup_scheduler()
         scheduler.start()
         logger.info("Meal Service started successfully")
@@ -34,13 +47,27 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to start Meal Service: {str(e)}", exc_info=True)
         raise
 
+    tasks = [
+        asyncio.create_task(consume_group_membership_events()),
+        asyncio.create_task(consume_recipe_events())
+    ]
+
     yield
 
     logger.info("Shutting down Meal Service...")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
     try:
         scheduler.shutdown()
+        await head_chef_access.close()
+        await shopping_plan_drafter.close()
+        await job_coordinator.stop()
+        await outbox_relay.stop()
         await kafka_manager.close()
         await redis_manager.close()
+        await database_manager.dispose()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}", exc_info=True)
 
@@ -1,13 +1,17 @@
 import uuid
 from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, datetime, time
 from services.meal_command_handler import MealCommandHandler
 from services.meal_transition import MealTransition
-from schemas.meal_schemas import DailyMealsCommand, MealResponse, MealMissingResponse
+from services.meal_calendar import meal_calendar, MAX_RANGE_DAYS
+from services.shopping_plan_drafter import shopping_plan_drafter
+from schemas.meal_schemas import DailyMealsCommand, BulkMealsCommand, MealResponse, MealMissingResponse, ShoppingPlanDraftResponse
 from enums.meal_type import MealType
 from core.database import get_db
+from shopping_shared.middleware.fastapi_auth import CurrentUser
 
 meal_command_handler = MealCommandHandler()
 meal_transition = MealTransition()
@@ -26,13 +30,63 @@ meal_router = APIRouter(
 def get_meals(meal_date: date, group_id: uuid.UUID = Query(...), meal_type: Optional[MealType] = None, db: Session = Depends(get_db)):
     return meal_command_handler.get(db, meal_date, group_id, meal_type)
 
+@meal_router.get(
+    "/range",
+    response_model=list[MealResponse | MealMissingResponse],
+    status_code=status.HTTP_200_OK,
+    description=(
+        f"Get the meals of a group for every day from 'from' to 'to' (inclusive, at most {MAX_RANGE_DAYS} days), "
+        "breakfast to dinner per day, for week and month calendars. Unplanned slots are returned as missing meals."
+    )
+)
+async def get_meal_range(
+    from_date: date = Query(..., alias="from", description="First day (inclusive)"),
+    to_date: date = Query(..., alias="to", description="Last day (inclusive)"),
+    group_id: uuid.UUID = Query(...),
+    db: Session = Depends(get_db)
+):
+    return await meal_calendar.get_range(db, group_id, from_date, to_date)
+
+@meal_router.get(
+    "/shopping_plan_draft",
+    response_model=ShoppingPlanDraftResponse,
+    status_code=status.HTTP_200_OK,
+    description=(
+        f"Build a shopping plan draft for the group's created meals from 'from' to 'to' (inclusive, at most {MAX_RANGE_DAYS} days): "
+        "the recipes' ingredients minus the group's unexpired stock. The response is a ready PlanCreate payload "
+        "for shopping-storage-service, assigned by the caller. 'deadline' defaults to the start of the first day. "
+        "Returns 404 if a planned recipe no longer exists, 502 if recipe or storage service cannot be reached."
+    )
+)
+async def get_shopping_plan_draft(
+    user: CurrentUser,
+    from_date: date = Query(..., alias="from", description="First day (inclusive)"),
+    to_date: date = Query(..., alias="to", description="Last day (inclusive)"),
+    group_id: uuid.UUID = Query(...),
+    deadline: Optional[datetime] = Query(None, description="Deadline of the plan"),
+    db: Session = Depends(get_db)
+):
+    if to_date < from_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must not be after 'to'")
+    if (to_date - from_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Range must not exceed {MAX_RANGE_DAYS} days")
+    servings = await run_in_threadpool(shopping_plan_drafter.recipe_servings, db, group_id, from_date, to_date)
+    return await shopping_plan_drafter.draft(
+        servings,
+        group_id=group_id,
+        assigner_id=uuid.UUID(user["sub"]),
+        deadline=deadline or datetime.combine(from_date, time.min),
+        from_date=from_date,
+        to_date=to_date,
+    )
+
 @meal_router.post(
     "/command",
     response_model=list[MealResponse | MealMissingResponse],
     status_code=status.HTTP_200_OK,
     description="Process daily meal commands for upserting, deleting, or skipping meals."
 )
-def process_daily_meal_command(
+async def process_daily_meal_command(
     daily_command: DailyMealsCommand, 
     group_id: uuid.UUID = Query(..., description="Group ID for authorization check"),
     db: Session = Depends(get_db)
@@ -43,7 +97,31 @@ def process_daily_meal_command(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="group_id in query parameter must match group_id in request body"
         )
-    responses = meal_command_handler.handle(db, daily_command)
+    responses = await run_in_threadpool(meal_command_handler.handle, db, daily_command)
+    await meal_calendar.invalidate(group_id, [daily_command.date])
+    return responses
+
+@meal_router.post(
+    "/command/bulk",
+    response_model=list[MealResponse | MealMissingResponse],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Process meal commands for up to 31 days in a single transaction (e.g. planning a week at once). "
+        "Either every command is applied or none is. Returns breakfast, lunch and dinner of each day, in request order."
+    )
+)
+async def process_bulk_meal_command(
+    command: BulkMealsCommand,
+    group_id: uuid.UUID = Query(..., description="Group ID for authorization check"),
+    db: Session = Depends(get_db)
+):
+    if command.group_id != group_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="group_id in query parameter must match group_id in request body"
+        )
+    responses = await run_in_threadpool(meal_command_handler.handle_bulk, db, command)
+    await meal_calendar.invalidate(group_id, [day.date for day in command.days])
     return responses
 
 @meal_router.post(
@@ -56,12 +134,14 @@ def process_daily_meal_command(
         "After cancellation, the meal status will be CANCELLED."
     )
 )
-def cancel_meal(
+async def cancel_meal(
     id: int, 
     group_id: uuid.UUID = Query(..., description="Group ID for authorization check"),
     db: Session = Depends(get_db)
 ):
-    return meal_transition.cancel(db, id, group_id)
+    meal = await run_in_threadpool(meal_transition.cancel, db, id, group_id)
+    await meal_calendar.invalidate(group_id, [meal.date])
+    return meal
 
 
 @meal_router.post(
@@ -74,12 +154,14 @@ def cancel_meal(
         "After reopening, the meal status will be CREATED."
     )
 )
-def reopen_meal(
+async def reopen_meal(
     id: int, 
     group_id: uuid.UUID = Query(..., description="Group ID for authorization check"),
     db: Session = Depends(get_db)
 ):
-    return meal_transition.reopen(db, id, group_id)
+    meal = await run_in_threadpool(meal_transition.reopen, db, id, group_id)
+    await meal_calendar.invalidate(group_id, [meal.date])
+    return meal
 
 
 @meal_router.post(
@@ -92,10 +174,12 @@ def reopen_meal(
         "After finishing, the meal status will be DONE."
     )
 )
-def finish_meal(
+async def finish_meal(
     id: int, 
     group_id: uuid.UUID = Query(..., description="Group ID for authorization check"),
     db: Session = Depends(get_db)
 ):
-    return meal_transition.finish(db, id, group_id)
+    meal = await run_in_threadpool(meal_transition.finish, db, id, group_id)
+    await meal_calendar.invalidate(group_id, [meal.date])
+    return meal
 
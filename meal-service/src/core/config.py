@@ -17,11 +17,23 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
 
     USER_SERVICE_URL: str = "http://user-service:8000"
+    USER_SERVICE_TIMEOUT_SECONDS: float = 5.0
+    HEAD_CHEF_CACHE_TTL_SECONDS: int = 300
+    RECIPE_SERVICE_URL: str = "http://recipe-service:8000"
+    SHOPPING_STORAGE_SERVICE_URL: str = "http://shopping-storage-service:8000"
+    INTERNAL_SERVICE_TIMEOUT_SECONDS: float = 10.0
 
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/meal_db"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/meal_db"
+
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+
     # Redis Configuration
     REDIS_HOST: str = "redis-caching"
     REDIS_PORT: int = 6379
@@ -0,0 +1,110 @@
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+import httpx
+from shopping_shared.utils.logger_utils import get_logger
+from core.config import settings
+
+logger = get_logger("HeadChefAccess")
+
+MAX_CACHED_MEMBERS = 50_000
+
+
+class HeadChefAccess:
+    """
+    Answers "is this user the head chef of this group?" for the meal command routes.
+    Calls to user-service's access-check endpoint share one pooled httpx client, and definitive answers
+    (authorized or not) are kept in a per-process TTL cache keyed by (user_id, group_id).
+    Entries are dropped early by the group membership consumer when the head chef changes or a member leaves;
+    the TTL only bounds staleness if such an event is missed. Errors and timeouts are never cached.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = MAX_CACHED_MEMBERS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: Dict[Tuple[uuid.UUID, uuid.UUID], Tuple[bool, float]] = {}
+        # Bumped by every invalidation, so a check that was in flight meanwhile does not cache a stale answer
+        self._generation = 0
+
+    def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=settings.USER_SERVICE_URL,
+                timeout=settings.USER_SERVICE_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                headers={"Content-Type": "application/json"},
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._cache.clear()
+
+    async def is_head_chef(self, user_id: uuid.UUID, group_id: uuid.UUID) -> bool:
+        key = (user_id, group_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            is_head_chef, expires_at = cached
+            if expires_at > time.monotonic():
+                return is_head_chef
+            del self._cache[key]
+
+        generation = self._generation
+        is_head_chef = await self._fetch(user_id, group_id)
+        if is_head_chef is None:
+            # Fail closed, but ask again next time
+            return False
+        if generation == self._generation:
+            self._store(key, is_head_chef)
+        return is_head_chef
+
+    def invalidate_group(self, group_id: uuid.UUID) -> None:
+        self._generation += 1
+        for key in [key for key in self._cache if key[1] == group_id]:
+            del self._cache[key]
+
+    def invalidate_member(self, user_id: uuid.UUID, group_id: uuid.UUID) -> None:
+        self._generation += 1
+        self._cache.pop((user_id, group_id), None)
+
+    def _store(self, key: Tuple[uuid.UUID, uuid.UUID], is_head_chef: bool) -> None:
+        if len(self._cache) >= self.max_entries:
+            now = time.monotonic()
+            for expired in [k for k, (_, expires_at) in self._cache.items() if expires_at <= now]:
+                del self._cache[expired]
+            if len(self._cache) >= self.max_entries:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (is_head_chef, time.monotonic() + self.ttl_seconds)
+
+    async def _fetch(self, user_id: uuid.UUID, group_id: uuid.UUID) -> Optional[bool]:
+        """Returns the user-service answer, or None when it could not be obtained."""
+        if self._client is None:
+            self.start()
+        url = f"/api/v1/user-service/groups/internal/{group_id}/members/{user_id}/access-check"
+
+        try:
+            response = await self._client.post(url, json={"check_head_chef": True})
+        except httpx.TimeoutException:
+            logger.error(f"Timeout when calling user-service to check head chef: {url}")
+            return None
+        except httpx.RequestError as e:
+            logger.error(f"Error calling user-service to check head chef: {e}")
+            return None
+
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, dict):
+                result_data = data.get("data", {})
+                return bool(result_data.get("authorized", False) and result_data.get("is_head_chef", False))
+            return False
+        if response.status_code in (403, 404):
+            # Member but not head chef / not a member or group not found
+            return False
+        logger.error(f"Unexpected response from user-service: {response.status_code} - {response.text}")
+        return None
+
+
+head_chef_access = HeadChefAccess(ttl_seconds=settings.HEAD_CHEF_CACHE_TTL_SECONDS)
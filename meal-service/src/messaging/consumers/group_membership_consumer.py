@@ -0,0 +1,49 @@
+import uuid
+from core.messaging import kafka_manager
+from core.head_chef_access import head_chef_access
+from shopping_shared.messaging.kafka_topics import NOTIFICATION_TOPIC
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("GroupMembershipConsumer")
+
+MEMBER_EVENTS = {"group_user_removed", "group_user_left"}
+
+
+def handle_group_membership_event(event: dict) -> None:
+    group_id = uuid.UUID(event["group_id"])
+    if event.get("event_type") == "group_head_chef_updated":
+        # Both the old and the new head chef change role; the event does not name them
+        head_chef_access.invalidate_group(group_id)
+    else:
+        for user_id in event.get("receivers") or []:
+            head_chef_access.invalidate_member(uuid.UUID(user_id), group_id)
+
+
+async def consume_group_membership_events():
+    # Every replica keeps its own cache, so each one reads the whole topic without a consumer group,
+    # starting from the latest offset: entries cached before startup do not exist
+    consumer = kafka_manager.create_consumer(
+        NOTIFICATION_TOPIC,
+        group_id=None,
+        auto_offset_reset="latest"
+    )
+
+    try:
+        await consumer.start()
+        logger.info("Group membership consumer started")
+
+        async for msg in consumer:
+            try:
+                event = msg.value
+                event_type = event.get("event_type")
+                if event_type == "group_head_chef_updated" or event_type in MEMBER_EVENTS:
+                    handle_group_membership_event(event)
+                    logger.info(f"Invalidated head chef cache: event_type={event_type}, group_id={event.get('group_id')}")
+            except Exception as e:
+                logger.error(f"Error processing message: partition={msg.partition}, offset={msg.offset}, error={str(e)}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Error in group membership consumer: {str(e)}", exc_info=True)
+        raise
+    finally:
+        await consumer.stop()
+        logger.info("Group membership consumer stopped")
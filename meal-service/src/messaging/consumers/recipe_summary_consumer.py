@@ -0,0 +1,68 @@
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from core.database import database_manager
+from core.messaging import kafka_manager
+from models.recipe_summary import RecipeSummary
+from shopping_shared.messaging.kafka_topics import RECIPE_EVENTS_TOPIC
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("RecipeSummaryConsumer")
+
+SUMMARY_FIELDS = ("recipe_name", "image_url", "prep_time", "cook_time", "default_servings", "level")
+
+
+async def handle_recipe_event(event: dict) -> None:
+    """
+    Applies a recipe change to the replica. Events are replayed at least once and may arrive out of order
+    after a relay retry, so a row only moves forward in changed_at.
+    """
+    data = event["data"]
+    changed_at = datetime.fromisoformat(data["changed_at"])
+
+    async with database_manager.get_session() as session:
+        if event["event_type"] == "recipe_deleted":
+            await session.execute(
+                update(RecipeSummary)
+                .where(RecipeSummary.recipe_id == data["recipe_id"], RecipeSummary.changed_at <= changed_at)
+                .values(is_deleted=True, changed_at=changed_at)
+            )
+            return
+
+        values = {field: data.get(field) for field in SUMMARY_FIELDS}
+        stmt = insert(RecipeSummary).values(recipe_id=data["recipe_id"], is_deleted=False, changed_at=changed_at, **values)
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[RecipeSummary.recipe_id],
+            set_={**values, "is_deleted": False, "changed_at": changed_at},
+            where=RecipeSummary.changed_at <= stmt.excluded.changed_at
+        ))
+
+
+async def consume_recipe_events():
+    # One consumer group for all replicas: the replica lives in the shared database
+    consumer = kafka_manager.create_consumer(
+        RECIPE_EVENTS_TOPIC,
+        group_id="meal_service_recipe_summaries_group"
+    )
+
+    try:
+        await consumer.start()
+        logger.info("Recipe summary consumer started")
+
+        async for msg in consumer:
+            try:
+                event = msg.value
+                event_type = event.get("event_type")
+                if event_type in ("recipe_upserted", "recipe_deleted"):
+                    await handle_recipe_event(event)
+                    logger.info(f"Applied {event_type}: recipe_id={event['data']['recipe_id']}, partition={msg.partition}, offset={msg.offset}")
+                else:
+                    logger.warning(f"Unknown event_type: {event_type}, partition={msg.partition}, offset={msg.offset}")
+            except Exception as e:
+                logger.error(f"Error processing message: partition={msg.partition}, offset={msg.offset}, error={str(e)}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Error in recipe summary consumer: {str(e)}", exc_info=True)
+        raise
+    finally:
+        await consumer.stop()
+        logger.info("Recipe summary consumer stopped")
@@ -1,11 +1,13 @@
 import uuid
 from datetime import date
-from sqlalchemy import Integer, String, Date, ForeignKey, Enum, UniqueConstraint
+from typing import Optional
+from sqlalchemy import Integer, String, Date, ForeignKey, Enum, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from core.database import Base
 from enums.meal_type import MealType
 from enums.meal_status import MealStatus
+from models.recipe_summary import RecipeSummary
 
 
 class Meal(Base):
@@ -19,6 +21,8 @@ class Meal(Base):
 
     __table_args__ = (
         UniqueConstraint("date", "meal_type", "group_id", name="unique_meal_date_group_type"),
+        # Serves the expiry job: walks pending meals in meal_id order, date checked from the index
+        Index("ix_meals_created_meal_id_date", "meal_id", "date", postgresql_where=text("meal_status = 'CREATED'")),
     )
 
     recipe_list: Mapped[list["RecipeList"]] = relationship(
@@ -39,3 +43,9 @@ class RecipeList(Base):
         back_populates="recipe_list",
         foreign_keys=[meal_id]
     )
+    # Current name, image and times from the local recipe replica, joined wherever recipe lists are loaded
+    summary: Mapped[Optional[RecipeSummary]] = relationship(
+        primaryjoin="foreign(RecipeList.recipe_id) == RecipeSummary.recipe_id",
+        viewonly=True,
+        lazy="joined"
+    )
@@ -0,0 +1,92 @@
+import uuid
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List
+from sqlalchemy import Integer, Date, func, insert as core_insert
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Mapped, mapped_column
+from core.database import Base
+from models.outbox import OutboxEvent
+from shopping_shared.messaging.kafka_topics import RECIPE_COOKED_EVENTS_TOPIC
+
+
+class CookStatsMixin:
+    cook_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    servings_cooked: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_cooked_on: Mapped[date] = mapped_column(Date, nullable=False)
+
+
+class GroupRecipeCookStats(CookStatsMixin, Base):
+    """How often a group has cooked a recipe (finished meals containing it)."""
+    __tablename__ = "group_recipe_cook_stats"
+
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    recipe_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class RecipeCookStats(CookStatsMixin, Base):
+    """How often a recipe has been cooked across all groups."""
+    __tablename__ = "recipe_cook_stats"
+
+    recipe_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+def _increment(model, rows: List[dict]):
+    stmt = insert(model).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key.columns],
+        set_={
+            "cook_count": model.cook_count + stmt.excluded.cook_count,
+            "servings_cooked": model.servings_cooked + stmt.excluded.servings_cooked,
+            "last_cooked_on": func.greatest(model.last_cooked_on, stmt.excluded.last_cooked_on),
+        }
+    ).returning(model.recipe_id, model.cook_count, model.last_cooked_on)
+
+
+def record_recipes_cooked(connection, group_id: uuid.UUID, cooked_on: date, recipes: Iterable) -> None:
+    """
+    Counts a finished meal's recipes (RecipeList rows) in the group and global counters, and enqueues a
+    recipe_cooked event carrying the new totals, all in the caller's transaction.
+    The event holds totals rather than increments, so consumers stay correct under replays (take the max).
+    """
+    servings: Dict[int, int] = Counter()
+    for recipe in recipes:
+        servings[recipe.recipe_id] += recipe.servings
+    if not servings:
+        return
+
+    rows = [
+        {"recipe_id": recipe_id, "cook_count": 1, "servings_cooked": recipe_servings, "last_cooked_on": cooked_on}
+        for recipe_id, recipe_servings in sorted(servings.items())
+    ]
+    group_totals = {
+        recipe_id: (cook_count, last_cooked_on)
+        for recipe_id, cook_count, last_cooked_on in connection.execute(
+            _increment(GroupRecipeCookStats, [{"group_id": group_id, **row} for row in rows])
+        )
+    }
+    global_totals = {
+        recipe_id: (cook_count, last_cooked_on)
+        for recipe_id, cook_count, last_cooked_on in connection.execute(_increment(RecipeCookStats, rows))
+    }
+
+    connection.execute(core_insert(OutboxEvent).values(
+        topic=RECIPE_COOKED_EVENTS_TOPIC,
+        key=str(group_id),
+        payload={
+            "event_type": "recipe_cooked",
+            "data": {
+                "group_id": str(group_id),
+                "recipes": [
+                    {
+                        "recipe_id": recipe_id,
+                        "group_cook_count": group_totals[recipe_id][0],
+                        "group_last_cooked_on": group_totals[recipe_id][1].isoformat(),
+                        "cook_count": global_totals[recipe_id][0],
+                        "last_cooked_on": global_totals[recipe_id][1].isoformat(),
+                    }
+                    for recipe_id in servings
+                ],
+            },
+        },
+    ))
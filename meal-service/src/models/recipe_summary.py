@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Integer, String, Boolean, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from core.database import Base
+
+
+class RecipeSummary(Base):
+    """
+    Local replica of recipe-service's recipe summary fields, maintained from RECIPE_EVENTS_TOPIC.
+    Deleted recipes are kept (is_deleted) so past meals still show their last known name.
+    """
+    __tablename__ = "recipe_summaries"
+
+    recipe_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    recipe_name: Mapped[str] = mapped_column(String, nullable=False)
+    image_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    prep_time: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cook_time: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    default_servings: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    level: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # recipe-service's time of the change; older events are ignored
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,7 +1,7 @@
 import uuid
-from datetime import date
-from typing import Optional, List
-from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
+from typing import Optional, List, Literal
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enums.meal_action import MealAction
 from enums.meal_type import MealType
 from enums.meal_status import MealStatus
@@ -31,13 +31,49 @@ class DailyMealsCommand(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
+class DayMealsCommand(BaseModel):
+    date: date
+    breakfast: MealCommand
+    lunch: MealCommand
+    dinner: MealCommand
+
+    model_config = ConfigDict(extra="forbid")
+
+class BulkMealsCommand(BaseModel):
+    group_id: uuid.UUID
+    days: List[DayMealsCommand] = Field(min_length=1, max_length=31)
+
+    model_config = ConfigDict(extra="forbid")
+
+    @field_validator("days")
+    @classmethod
+    def check_unique_dates(cls, days: List[DayMealsCommand]) -> List[DayMealsCommand]:
+        if len({day.date for day in days}) != len(days):
+            raise ValueError("Each date may appear only once")
+        return days
+
+class RecipeSummaryResponse(BaseModel):
+    recipe_name: str
+    image_url: Optional[str] = None
+    prep_time: Optional[int] = None
+    cook_time: Optional[int] = None
+    default_servings: Optional[int] = None
+    level: Optional[str] = None
+    is_deleted: bool = False
+
+    model_config = ConfigDict(from_attributes=True)
+
+class MealRecipeResponse(RecipeBase):
+    # Current recipe data from the local replica; recipe_name above is the name at planning time
+    summary: Optional[RecipeSummaryResponse] = None
+
 class MealResponse(BaseModel):
     meal_id: int
     date: date
     group_id: uuid.UUID
     meal_type: MealType
     meal_status: MealStatus
-    recipe_list: List[RecipeBase] = []
+    recipe_list: List[MealRecipeResponse] = []
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -45,4 +81,19 @@ class MealMissingResponse(BaseModel):
     date: date
     group_id: uuid.UUID
     meal_type: MealType
-    detail: str
\ No newline at end of file
+    detail: str
+
+class ShoppingPlanItem(BaseModel):
+    type: Literal["countable_ingredient", "uncountable_ingredient"]
+    unit: str
+    quantity: float = Field(gt=0)
+    component_id: int = Field(ge=0)
+    component_name: str
+
+class ShoppingPlanDraftResponse(BaseModel):
+    """Same shape as shopping-storage-service's PlanCreate, so it can be posted to /v1/shopping_plans as is."""
+    group_id: uuid.UUID
+    deadline: datetime
+    assigner_id: uuid.UUID
+    shopping_list: List[ShoppingPlanItem]
+    others: Optional[dict] = None
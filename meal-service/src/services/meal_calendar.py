@@ -0,0 +1,113 @@
+import json
+import uuid
+from datetime import date, timedelta
+from typing import Iterable, Optional, Sequence
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from services.meal_command_handler import MealCommandHandler
+from shopping_shared.caching.redis_keys import RedisKeys
+from shopping_shared.caching.redis_manager import redis_manager
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("MealCalendar")
+
+MAX_RANGE_DAYS = 62
+WEEK_TTL_SECONDS = 600
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+class MealCalendar:
+    """
+    Serves date ranges of meals from week views cached in Redis (one key per group, generation and ISO week).
+    Missing weeks are assembled together from the database and cached. Writes bump the group's generation
+    instead of deleting keys: a reader that loaded rows before a write committed stores them under the old
+    generation, which no later read looks up, so a stale week can never be pinned for the TTL.
+    Redis errors never fail a request: reads fall back to the database and are then not cached.
+    """
+
+    def __init__(self, handler: MealCommandHandler, ttl_seconds: int = WEEK_TTL_SECONDS):
+        self.handler = handler
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(group_id: uuid.UUID, generation: int, start: date) -> str:
+        return RedisKeys.meal_week_view(str(group_id), generation, start.isoformat())
+
+    async def get_range(self, db: Session, group_id: uuid.UUID, start: date, end: date) -> list[dict]:
+        if start > end:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        if (end - start).days + 1 > MAX_RANGE_DAYS:
+            raise HTTPException(status_code=400, detail=f"Range must not exceed {MAX_RANGE_DAYS} days")
+
+        weeks = []
+        current = week_start(start)
+        while current <= end:
+            weeks.append(current)
+            current += timedelta(days=7)
+
+        # The generation must be read before the database, so rows older than a write can only land under it
+        generation = await self._generation(group_id)
+        views = await self._get_cached(group_id, generation, weeks) if generation is not None else {}
+        missing = [week for week in weeks if week not in views]
+        if missing:
+            fetched = await run_in_threadpool(self.handler.get_week_views, db, group_id, missing)
+            if generation is not None:
+                await self._set_cached(group_id, generation, fetched)
+            views.update(fetched)
+
+        return [
+            item for week in weeks for item in views[week]
+            if start <= date.fromisoformat(item["date"]) <= end
+        ]
+
+    async def _generation(self, group_id: uuid.UUID) -> Optional[int]:
+        try:
+            value = await redis_manager.client.get(RedisKeys.meal_week_generation(str(group_id)))
+        except Exception as e:
+            logger.warning(f"Meal week generation read failed: {e}")
+            return None
+        return int(value) if value is not None else 0
+
+    async def _get_cached(self, group_id: uuid.UUID, generation: int, weeks: Sequence[date]) -> dict[date, list[dict]]:
+        try:
+            values = await redis_manager.client.mget([self._key(group_id, generation, week) for week in weeks])
+        except Exception as e:
+            logger.warning(f"Meal week cache read failed: {e}")
+            return {}
+        return {week: json.loads(value) for week, value in zip(weeks, values) if value is not None}
+
+    async def _set_cached(self, group_id: uuid.UUID, generation: int, views: dict[date, list[dict]]) -> None:
+        try:
+            async with redis_manager.client.pipeline(transaction=False) as pipe:
+                for week, view in views.items():
+                    pipe.set(self._key(group_id, generation, week), json.dumps(view), ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Meal week cache write failed: {e}")
+
+    async def invalidate(self, group_id: uuid.UUID, dates: Iterable[date]) -> None:
+        await self.invalidate_many((group_id, day) for day in dates)
+
+    async def invalidate_many(self, group_dates: Iterable[tuple[uuid.UUID, date]]) -> None:
+        """
+        Bumps the generation of every group in the given (group_id, date) pairs, which retires all their cached
+        weeks at once; the old keys are never read again and expire with the TTL.
+        The generation keys have no TTL: if one expired, its counter would restart and could meet live old views.
+        """
+        group_ids = {group_id for group_id, _ in group_dates}
+        if not group_ids:
+            return
+        try:
+            async with redis_manager.client.pipeline(transaction=False) as pipe:
+                for group_id in group_ids:
+                    pipe.incr(RedisKeys.meal_week_generation(str(group_id)))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Meal week cache invalidation failed for {len(group_ids)} groups: {e}")
+
+
+meal_calendar = MealCalendar(MealCommandHandler())
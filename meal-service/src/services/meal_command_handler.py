@@ -2,67 +2,99 @@ import uuid
 from fastapi import HTTPException
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
-from datetime import date
+from sqlalchemy import select, delete, tuple_, or_
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date, timedelta
 from typing import Optional, Sequence
+from enums.meal_action import MealAction
 from enums.meal_type import MealType
 from models.meal import Meal, RecipeList
-from schemas.meal_schemas import MealCommand, DailyMealsCommand, MealResponse, MealMissingResponse
+from schemas.meal_schemas import DailyMealsCommand, DayMealsCommand, BulkMealsCommand, MealResponse, MealMissingResponse
+
+MEAL_TYPES = [MealType.BREAKFAST, MealType.LUNCH, MealType.DINNER]
 
 class MealCommandHandler:
-    def handle(self, db: Session, daily_command: DailyMealsCommand) -> list[Meal | MealMissingResponse]:
-        responses = []
-        for meal_type, meal_command in [(MealType.BREAKFAST, daily_command.breakfast),
-                                        (MealType.LUNCH, daily_command.lunch),
-                                        (MealType.DINNER, daily_command.dinner)]:
-            if meal_command.action == "upsert":
-                response = self.upsert(db, daily_command.date, daily_command.group_id, meal_type, meal_command)
-                responses.append(response)
-            elif meal_command.action == "delete":
-                response = self.delete(db, daily_command.date, daily_command.group_id, meal_type)
-                responses.append(response)
-            elif meal_command.action == "skip":
-                response = self.get(db, daily_command.date, daily_command.group_id, meal_type)[0]
-                responses.append(response)
-            else:
-                raise HTTPException(status_code=400, detail=f"Invalid action {meal_command.action} for meal {meal_type}")
-        return responses
+    def handle(self, db: Session, daily_command: DailyMealsCommand) -> list[MealResponse | MealMissingResponse]:
+        # Validated conversion: a field added to only one of the two day schemas fails here instead of being dropped
+        day = DayMealsCommand.model_validate(daily_command.model_dump(exclude={"group_id"}))
+        return self.handle_bulk(db, BulkMealsCommand(group_id=daily_command.group_id, days=[day]))
 
-    def upsert(self, db: Session, date: date, group_id: uuid.UUID, meal_type: MealType, meal_command: MealCommand):
-        meal: Meal | None = db.execute(
-            select(Meal).where(Meal.date == date, Meal.group_id == group_id, Meal.meal_type == meal_type)
-        ).scalars().first()
-        if not meal:
-            meal = Meal(date=date, group_id=group_id, meal_type=meal_type)
-            db.add(meal)
-        if meal_command.recipe_list is not None:
-            meal.recipe_list = [RecipeList(recipe_id=recipe.recipe_id,
-                                           recipe_name=recipe.recipe_name,
-                                           servings=recipe.servings)
-                                for recipe in meal_command.recipe_list]
+    def handle_bulk(self, db: Session, command: BulkMealsCommand) -> list[MealResponse | MealMissingResponse]:
+        """
+        Applies the commands of several days in one transaction: all upserted meals are written with one
+        INSERT ... ON CONFLICT (date, meal_type, group_id), replaced recipe lists with one DELETE and one INSERT,
+        deleted meals with one DELETE each for recipes and meals. Results are returned per day, breakfast to dinner.
+        """
+        group_id = command.group_id
+        upserts = {}
+        deletes = []
+        for day in command.days:
+            for meal_type in MEAL_TYPES:
+                meal_command = getattr(day, meal_type.value)
+                if meal_command.action == MealAction.UPSERT:
+                    upserts[(day.date, meal_type)] = meal_command.recipe_list
+                elif meal_command.action == MealAction.DELETE:
+                    deletes.append((day.date, meal_type))
+                elif meal_command.action != MealAction.SKIP:
+                    raise HTTPException(status_code=400, detail=f"Invalid action {meal_command.action} for meal {meal_type}")
 
         try:
-            db.commit()
-            db.refresh(meal)
-        except IntegrityError as e:
-            db.rollback()
-            raise HTTPException(status_code=400, detail=f"Integrity error: {str(e)}")
+            with db.begin():
+                if upserts:
+                    stmt = insert(Meal).values([
+                        {"date": meal_date, "meal_type": meal_type, "group_id": group_id}
+                        for meal_date, meal_type in upserts
+                    ])
+                    # No-op update so RETURNING also yields the ids of meals that already existed
+                    stmt = stmt.on_conflict_do_update(
+                        constraint="unique_meal_date_group_type",
+                        set_={"group_id": stmt.excluded.group_id}
+                    ).returning(Meal.meal_id, Meal.date, Meal.meal_type)
+                    meal_ids = {(meal_date, meal_type): meal_id for meal_id, meal_date, meal_type in db.execute(stmt)}
+
+                    replaced = {meal_ids[key]: recipes for key, recipes in upserts.items() if recipes is not None}
+                    if replaced:
+                        db.execute(delete(RecipeList).where(RecipeList.meal_id.in_(replaced.keys())))
+                        rows = [
+                            {"meal_id": meal_id, **recipe.model_dump()}
+                            for meal_id, recipes in replaced.items() for recipe in recipes
+                        ]
+                        if rows:
+                            db.execute(insert(RecipeList).values(rows))
 
-        return meal
+                if deletes:
+                    deleted_meals = (
+                        select(Meal.meal_id)
+                        .where(Meal.group_id == group_id, tuple_(Meal.date, Meal.meal_type).in_(deletes))
+                    )
+                    db.execute(delete(RecipeList).where(RecipeList.meal_id.in_(deleted_meals)))
+                    db.execute(
+                        delete(Meal)
+                        .where(Meal.meal_id.in_(deleted_meals))
+                        .execution_options(synchronize_session=False)
+                    )
 
-    def delete(self, db: Session, date: date, group_id: uuid.UUID, meal_type: MealType) -> MealMissingResponse:
-        meal: Meal | None = db.execute(
-            select(Meal).where(Meal.date == date, Meal.group_id == group_id, Meal.meal_type == meal_type)
-        ).scalars().first()
-        if meal:
-            db.delete(meal)
-            db.commit()
-        return MealMissingResponse(
-            date=date,
-            group_id=group_id,
-            meal_type=meal_type,
-            detail="Meal deleted"
-        )
+                meals = db.execute(
+                    select(Meal)
+                    .options(selectinload(Meal.recipe_list))
+                    .where(Meal.group_id == group_id, Meal.date.in_([day.date for day in command.days]))
+                    .execution_options(populate_existing=True)
+                ).scalars().all()
+                meal_map = {(meal.date, meal.meal_type): meal for meal in meals}
+
+                deleted = set(deletes)
+                return [
+                    MealResponse.model_validate(meal) if (meal := meal_map.get((day.date, meal_type)))
+                    else MealMissingResponse(
+                        date=day.date,
+                        group_id=group_id,
+                        meal_type=meal_type,
+                        detail="Meal deleted" if (day.date, meal_type) in deleted else "Meal has not been planned yet"
+                    )
+                    for day in command.days for meal_type in MEAL_TYPES
+                ]
+        except IntegrityError as e:
+            raise HTTPException(status_code=400, detail=f"Integrity error: {str(e)}")
 
     def get(self, db: Session, date: date, group_id: uuid.UUID, meal_type: Optional[MealType] = None) -> Sequence[MealResponse | MealMissingResponse]:
         stmt = select(Meal).options(selectinload(Meal.recipe_list)).where(Meal.date == date, Meal.group_id == group_id)
@@ -92,4 +124,33 @@ class MealCommandHandler:
                 for meal_type in [MealType.BREAKFAST, MealType.LUNCH, MealType.DINNER]
             ]
 
+    def get_week_views(self, db: Session, group_id: uuid.UUID, week_starts: Sequence[date]) -> dict[date, list[dict]]:
+        """
+        Assembles the meals of whole weeks (Monday to Sunday, breakfast to dinner) as JSON-ready dicts.
+        All weeks are read with one query for the meals and one for their recipe lists (selectinload).
+        """
+        meals = db.execute(
+            select(Meal)
+            .options(selectinload(Meal.recipe_list))
+            .where(
+                Meal.group_id == group_id,
+                or_(*[Meal.date.between(start, start + timedelta(days=6)) for start in week_starts])
+            )
+        ).scalars().all()
+        meal_map = {(meal.date, meal.meal_type): meal for meal in meals}
 
+        views = {}
+        for start in week_starts:
+            views[start] = [
+                (
+                    MealResponse.model_validate(meal) if (meal := meal_map.get((day, meal_type))) else MealMissingResponse(
+                        date=day,
+                        group_id=group_id,
+                        meal_type=meal_type,
+                        detail="Meal has not been planned yet"
+                    )
+                ).model_dump(mode="json")
+                for day in (start + timedelta(days=offset) for offset in range(7))
+                for meal_type in MEAL_TYPES
+            ]
+        return views
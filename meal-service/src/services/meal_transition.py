@@ -1,60 +1,38 @@
 import uuid
-from typing import Optional
-from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import select
 from enums.meal_status import MealStatus
 from models.meal import Meal
+from models.recipe_cook_stats import record_recipes_cooked
 from schemas.meal_schemas import MealResponse
+from shopping_shared.crud.state_transition import StateTransition, Guard
 
 
 class MealTransition:
-    def _preconditions_check(self, meal: Optional[Meal], allowed_status: MealStatus, group_id: uuid.UUID):
-        if meal is None:
-            raise HTTPException(status_code=404, detail=f"Meal not found")
-        if meal.group_id != group_id:
-            raise HTTPException(status_code=403, detail=f"Meal does not belong to the specified group")
-        if meal.meal_status != allowed_status:
-            raise HTTPException(status_code=400, detail=f"Operation not allowed: meal status must be {allowed_status}, got {meal.meal_status}")
+    # Each transition is a single conditional UPDATE ... RETURNING; group ownership is reported before status
+    CANCEL = StateTransition(Meal, Meal.meal_id, Meal.meal_status,
+                             MealStatus.CREATED, MealStatus.CANCELLED, entity="meal", status_first=False)
+    REOPEN = StateTransition(Meal, Meal.meal_id, Meal.meal_status,
+                             MealStatus.CANCELLED, MealStatus.CREATED, entity="meal", status_first=False)
+    FINISH = StateTransition(Meal, Meal.meal_id, Meal.meal_status,
+                             MealStatus.CREATED, MealStatus.DONE, entity="meal", status_first=False)
+
+    @staticmethod
+    def _group_guard(group_id: uuid.UUID) -> Guard:
+        return Guard(Meal.group_id, group_id, 403, "Meal does not belong to the specified group")
 
     def cancel(self, db: Session, id: int, group_id: uuid.UUID) -> MealResponse:
         with db.begin():
-            meal = db.execute(
-                select(Meal)
-                .where(Meal.meal_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(meal, MealStatus.CREATED, group_id)
-
-            meal.meal_status = MealStatus.CANCELLED
-
+            meal = self.CANCEL.apply(db, id, guards=[self._group_guard(group_id)])
             return MealResponse.model_validate(meal)
 
     def reopen(self, db: Session, id: int, group_id: uuid.UUID) -> MealResponse:
         with db.begin():
-            meal = db.execute(
-                select(Meal)
-                .where(Meal.meal_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(meal, MealStatus.CANCELLED, group_id)
-
-            meal.meal_status = MealStatus.CREATED
-
+            meal = self.REOPEN.apply(db, id, guards=[self._group_guard(group_id)])
             return MealResponse.model_validate(meal)
 
     def finish(self, db: Session, id: int, group_id: uuid.UUID) -> MealResponse:
+        """Also counts the meal's recipes as cooked by the group (see record_recipes_cooked)."""
         with db.begin():
-            meal = db.execute(
-                select(Meal)
-                .where(Meal.meal_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(meal, MealStatus.CREATED, group_id)
-
-            meal.meal_status = MealStatus.DONE
-
-            return MealResponse.model_validate(meal)
\ No newline at end of file
+            meal = self.FINISH.apply(db, id, guards=[self._group_guard(group_id)])
+            record_recipes_cooked(db.connection(), meal.group_id, meal.date, meal.recipe_list)
+            return MealResponse.model_validate(meal)
@@ -0,0 +1,142 @@
+import math
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from core.config import settings
+from enums.meal_status import MealStatus
+from models.meal import Meal, RecipeList
+from schemas.meal_schemas import ShoppingPlanDraftResponse, ShoppingPlanItem
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("ShoppingPlanDrafter")
+
+
+class ShoppingPlanDrafter:
+    """
+    Turns a group's planned meals over a date range into a shopping plan draft, server-side:
+    the recipes of the range are summed in one query, their ingredients aggregated by one call to
+    recipe-service's /v2/recipes/flattened, and the group's stock of all those ingredients read by one call
+    to shopping-storage-service's /v1/storable_units/stock. Only the missing quantities end up in the draft.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.INTERNAL_SERVICE_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def recipe_servings(db: Session, group_id: uuid.UUID, from_date: date, to_date: date) -> Dict[int, int]:
+        """Total servings per recipe over the group's created meals in the range."""
+        stmt = (
+            select(RecipeList.recipe_id, func.sum(RecipeList.servings))
+            .join(Meal, Meal.meal_id == RecipeList.meal_id)
+            .where(
+                Meal.group_id == group_id,
+                Meal.date.between(from_date, to_date),
+                Meal.meal_status == MealStatus.CREATED,
+            )
+            .group_by(RecipeList.recipe_id)
+        )
+        return {recipe_id: int(servings) for recipe_id, servings in db.execute(stmt)}
+
+    async def draft(
+        self,
+        servings: Dict[int, int],
+        group_id: uuid.UUID,
+        assigner_id: uuid.UUID,
+        deadline: datetime,
+        from_date: date,
+        to_date: date
+    ) -> ShoppingPlanDraftResponse:
+        shopping_list: List[ShoppingPlanItem] = []
+        if servings:
+            ingredients = await self._flattened(servings)
+            stock = await self._stock(group_id, [item["ingredient"]["component_id"] for item in ingredients])
+            shopping_list = self._missing(ingredients, stock)
+
+        return ShoppingPlanDraftResponse(
+            group_id=group_id,
+            deadline=deadline,
+            assigner_id=assigner_id,
+            shopping_list=shopping_list,
+            others={"meal_plan": {"from": from_date.isoformat(), "to": to_date.isoformat()}},
+        )
+
+    @staticmethod
+    def _missing(ingredients: List[Dict[str, Any]], stock: Dict[Tuple[int, Optional[str]], Dict[str, Any]]) -> List[ShoppingPlanItem]:
+        shopping_list: List[ShoppingPlanItem] = []
+        for item in ingredients:
+            ingredient = item["ingredient"]
+            component_id = ingredient["component_id"]
+            if ingredient["type"] == "countable_ingredient":
+                unit = ingredient["c_measurement_unit"]
+                held = stock.get((component_id, None), {}).get("package_quantity", 0)
+                # Countable items are bought whole
+                missing = math.ceil(item["quantity"] - held)
+            else:
+                unit = ingredient["uc_measurement_unit"]
+                held = stock.get((component_id, unit), {}).get("content_quantity") or 0
+                missing = round(item["quantity"] - held, 2)
+            if missing > 0:
+                shopping_list.append(ShoppingPlanItem(
+                    type=ingredient["type"],
+                    unit=unit,
+                    quantity=missing,
+                    component_id=component_id,
+                    component_name=ingredient["component_name"],
+                ))
+        return shopping_list
+
+    async def _flattened(self, servings: Dict[int, int]) -> List[Dict[str, Any]]:
+        response = await self._post(
+            f"{settings.RECIPE_SERVICE_URL}/v2/recipes/flattened",
+            [{"recipe_id": recipe_id, "quantity": quantity} for recipe_id, quantity in servings.items()],
+        )
+        if response.status_code == 404:
+            raise HTTPException(status_code=404, detail=response.json().get("detail", "Recipe not found"))
+        return self._json(response)["ingredients"]
+
+    async def _stock(self, group_id: uuid.UUID, component_ids: List[int]) -> Dict[Tuple[int, Optional[str]], Dict[str, Any]]:
+        if not component_ids:
+            return {}
+        response = await self._post(
+            f"{settings.SHOPPING_STORAGE_SERVICE_URL}/v1/storable_units/stock",
+            {"group_id": str(group_id), "component_ids": component_ids},
+        )
+        stock: Dict[Tuple[int, Optional[str]], Dict[str, Any]] = {}
+        for entry in self._json(response)["data"]:
+            stock[(entry["component_id"], entry["content_unit"])] = entry
+        return stock
+
+    async def _post(self, url: str, body: Any) -> httpx.Response:
+        if self._client is None:
+            self.start()
+        try:
+            return await self._client.post(url, json=body)
+        except httpx.RequestError as e:
+            logger.error(f"Error calling {url}: {e}")
+            raise HTTPException(status_code=502, detail=f"Upstream service unavailable: {url}")
+
+    @staticmethod
+    def _json(response: httpx.Response) -> Dict[str, Any]:
+        if response.status_code != 200:
+            logger.error(f"Unexpected response from {response.request.url}: {response.status_code} - {response.text}")
+            raise HTTPException(status_code=502, detail=f"Upstream service returned {response.status_code}")
+        return response.json()
+
+
+shopping_plan_drafter = ShoppingPlanDrafter()
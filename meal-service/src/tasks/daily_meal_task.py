@@ -1,76 +1,96 @@
-from collections import defaultdict
+import time
 from datetime import date
-from typing import Dict, List
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from core.database import SessionLocal
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select, func
+from core.database import database_manager
 from enums.meal_status import MealStatus
 from enums.meal_type import MealType
 from core.messaging import kafka_manager
-from models.meal import Meal
+from models.meal import Meal, RecipeList
+from models.recipe_summary import RecipeSummary
+from shopping_shared.messaging.bounded_publisher import BoundedPublisher
 from shopping_shared.messaging.kafka_topics import NOTIFICATION_TOPIC
+from shopping_shared.scheduling.job_coordinator import Shard, shard_filter
 from shopping_shared.utils.logger_utils import get_logger
 
 
 logger = get_logger("Daily Meal Task")
 
+STREAM_BATCH_SIZE = 2000
+MAX_IN_FLIGHT = 500
 
-def fetch_today_meals_grouped() -> Dict[str, Dict[str, List[str]]]:
-    db = SessionLocal()
-    today = date.today()
-    try:
-        meals = db.execute(
-            select(Meal)
-            .where(Meal.date == today, Meal.meal_status == MealStatus.CREATED)
-            .options(selectinload(Meal.recipe_list))
-        ).scalars().all()
+MEAL_KEYS = {
+    MealType.BREAKFAST: "breakfast",
+    MealType.LUNCH: "lunch",
+    MealType.DINNER: "dinner",
+}
 
-        grouped: Dict[str, Dict[str, List[str]]] = defaultdict(
-            lambda: {"breakfast": [], "lunch": [], "dinner": []}
-        )
 
-        for meal in meals:
-            gid = str(meal.group_id)
-            recipes = [r.recipe_name for r in (meal.recipe_list or [])]
-            if meal.meal_type == MealType.BREAKFAST:
-                grouped[gid]["breakfast"] = recipes
-            elif meal.meal_type == MealType.LUNCH:
-                grouped[gid]["lunch"] = recipes
-            elif meal.meal_type == MealType.DINNER:
-                grouped[gid]["dinner"] = recipes
+def today_meals_statement(shard: Optional[Shard] = None):
+    """
+    One row per (meal, recipe) of today's created meals, ordered by group so groups arrive contiguously.
+    Recipe names come from the local recipe replica when it has them.
+    """
+    stmt = (
+        select(Meal.group_id, Meal.meal_type, func.coalesce(RecipeSummary.recipe_name, RecipeList.recipe_name))
+        .outerjoin(RecipeList, RecipeList.meal_id == Meal.meal_id)
+        .outerjoin(RecipeSummary, RecipeSummary.recipe_id == RecipeList.recipe_id)
+        .where(Meal.date == date.today(), Meal.meal_status == MealStatus.CREATED)
+        .order_by(Meal.group_id, Meal.meal_type, RecipeList.recipe_id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    if shard is not None:
+        stmt = stmt.where(shard_filter(Meal.group_id, shard))
+    return stmt
 
-        return dict(grouped)
-    finally:
-        db.close()
 
+async def publish_daily_meals(shard: Optional[Shard] = None) -> None:
+    """
+    Sends one daily_meal notification per group with today's recipes by meal type.
+    Rows are streamed with a server-side cursor ordered by group, so only one group is held in memory,
+    and notifications are published concurrently with a bounded number of unacknowledged sends.
+    With a shard, only the groups hashing into it are handled (see JobCoordinator.sharded).
+    """
+    started = time.monotonic()
+    groups = 0
+    current_group: Optional[UUID] = None
+    meals: Dict[str, List[str]] = {}
 
-async def publish_daily_meals() -> None:
-    grouped = fetch_today_meals_grouped()
-    if not grouped:
-        logger.info("No meals found for today. Skipping daily_meal publish.")
-        return
-
-    for group_id, meals in grouped.items():
-        payload = {
-            "event_type": "daily_meal",
-            "group_id": group_id,
-            "receiver_is_head_chef": True,
-            "data": {
-                "breakfast": meals.get("breakfast", []) or [],
-                "lunch": meals.get("lunch", []) or [],
-                "dinner": meals.get("dinner", []) or [],
-            },
-        }
-
-        try:
-            await kafka_manager.send_message(
+    async with BoundedPublisher(kafka_manager, max_in_flight=MAX_IN_FLIGHT) as publisher:
+        async def publish_group(group_id: UUID, meals: Dict[str, List[str]]):
+            await publisher.publish(
                 topic=NOTIFICATION_TOPIC,
-                value=payload,
+                value={
+                    "event_type": "daily_meal",
+                    "group_id": str(group_id),
+                    "receiver_is_head_chef": True,
+                    "data": meals,
+                },
                 key=f"{group_id}-meal",
-                wait=True,
             )
-            logger.info(f"Published daily_meal event: group_id={group_id}")
-        except Exception as e:
-            logger.error(f"Failed to publish daily_meal for group {group_id}: {e}", exc_info=True)
 
+        async with database_manager.get_session() as session:
+            result = await session.stream(today_meals_statement(shard))
+            async for group_id, meal_type, recipe_name in result:
+                if group_id != current_group:
+                    if current_group is not None:
+                        await publish_group(current_group, meals)
+                        groups += 1
+                    current_group = group_id
+                    meals = {key: [] for key in MEAL_KEYS.values()}
+                # A meal without recipes still comes back once, with a NULL recipe_name
+                if recipe_name is not None:
+                    meals[MEAL_KEYS[meal_type]].append(recipe_name)
 
+        if current_group is not None:
+            await publish_group(current_group, meals)
+            groups += 1
+
+    if not groups:
+        logger.info("No meals found for today. Skipping daily_meal publish.")
+        return
+    logger.info(
+        f"Daily meals: groups={groups}, sent={publisher.sent}, failed={publisher.failed}, "
+        f"elapsed={time.monotonic() - started:.2f}s"
+    )
@@ -1,18 +1,67 @@
+import asyncio
+import time
 from datetime import date
-from sqlalchemy import update
+from sqlalchemy import update, select
 from enums.meal_status import MealStatus
 from models.meal import Meal
-from core.database import SessionLocal
+from core.database import database_manager
+from services.meal_calendar import meal_calendar
+from shopping_shared.utils.logger_utils import get_logger
 
-def expire_meals():
-    db = SessionLocal()
+logger = get_logger("Expire Meals Task")
+
+CHUNK_SIZE = 500
+CHUNK_PAUSE_SECONDS = 0.05
+PROGRESS_EVERY_CHUNKS = 20
+
+
+async def expire_meals():
+    """
+    Expires CREATED meals dated before today, in chunks of consecutive meal_ids.
+    Each chunk is its own short transaction: the next CHUNK_SIZE pending ids after the previous chunk are taken
+    from the partial index ix_meals_created_meal_id_date (rows locked by a concurrent transition are skipped and
+    left for the next run), updated, and their cached week views invalidated. The job yields between chunks.
+    """
+    started = time.monotonic()
     today = date.today()
-    try:
-        with db.begin():
-            db.execute(
+    last_id = 0
+    chunks = 0
+    expired = 0
+
+    while True:
+        chunk_started = time.monotonic()
+        async with database_manager.get_session() as session:
+            pending = (
+                select(Meal.meal_id)
+                .where(Meal.meal_status == MealStatus.CREATED, Meal.date < today, Meal.meal_id > last_id)
+                .order_by(Meal.meal_id)
+                .limit(CHUNK_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await session.execute(
                 update(Meal)
-                .where(Meal.meal_status == MealStatus.CREATED, Meal.date < today)
+                .where(Meal.meal_id.in_(pending.scalar_subquery()))
                 .values(meal_status=MealStatus.EXPIRED)
+                .returning(Meal.meal_id, Meal.group_id, Meal.date)
+                .execution_options(synchronize_session=False)
+            )).all()
+
+        if not rows:
+            break
+        chunks += 1
+        expired += len(rows)
+        last_id = max(meal_id for meal_id, _, _ in rows)
+        # Cached week views still show these meals as created
+        await meal_calendar.invalidate_many((group_id, meal_date) for _, group_id, meal_date in rows)
+
+        if chunks % PROGRESS_EVERY_CHUNKS == 0:
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Meal expiry progress: chunks={chunks}, expired={expired}, last_id={last_id}, "
+                f"chunk_ms={(time.monotonic() - chunk_started) * 1000:.0f}, rate={expired / elapsed:.0f}/s"
             )
-    finally:
-        db.close()
\ No newline at end of file
+        if len(rows) < CHUNK_SIZE:
+            break
+        await asyncio.sleep(CHUNK_PAUSE_SECONDS)
+
+    logger.info(f"Meal expiry done: chunks={chunks}, expired={expired}, elapsed={time.monotonic() - started:.2f}s")
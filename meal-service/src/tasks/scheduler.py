@@ -2,15 +2,22 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from .expire_meals_task import expire_meals
 from .daily_meal_task import publish_daily_meals
+from shopping_shared.caching.redis_manager import redis_manager
+from shopping_shared.scheduling.job_coordinator import JobCoordinator
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("Scheduler")
 
 scheduler = AsyncIOScheduler()
 
+# Every replica runs this scheduler; the coordinator makes each fire do the work once
+job_coordinator = JobCoordinator(redis_manager, service="meal-service")
+
 def setup_scheduler():
+    job_coordinator.start()
+
     scheduler.add_job(
-        expire_meals,
+        job_coordinator.exclusive(expire_meals, "expire_meals"),
         trigger=CronTrigger(hour=0, minute=1),
         id="expire_meals",
         name="Expire expired meals",
@@ -18,7 +25,7 @@ def setup_scheduler():
     )
 
     scheduler.add_job(
-        publish_daily_meals,
+        job_coordinator.sharded(publish_daily_meals, "publish_daily_meals"),
         trigger=CronTrigger(hour=6, minute=0),
         id="publish_daily_meals",
         name="Publish daily meal notifications (06:00)",
@@ -7,6 +7,7 @@ This script tests the complete flow using real user accounts through the API gat
 
 import requests
 import json
+import math
 import random
 import string
 import uuid
@@ -433,6 +434,41 @@ class RealIntegrationTester:
             print_error(f"Non-head chef was not properly blocked - reopen: {resp_reopen.status_code}, finish: {resp_finish.status_code}")
             return False
 
+    def test_bulk_command_permissions(self):
+        """Test that the multi-day command is applied for head chef and blocked for others"""
+        print_info("\n--- 10. TESTING - Bulk Meal Command (Multi-Day) ---")
+
+        start = datetime.strptime(self.context["today"], "%Y-%m-%d") + timedelta(days=1)
+        payload = {
+            "group_id": self.context["group_id"],
+            "days": [
+                {
+                    "date": (start + timedelta(days=offset)).strftime("%Y-%m-%d"),
+                    "breakfast": {"action": "skip"},
+                    "lunch": {
+                        "action": "upsert",
+                        "recipe_list": [{"recipe_id": 12, "recipe_name": "Week Lunch", "servings": 2}]
+                    },
+                    "dinner": {"action": "delete"}
+                }
+                for offset in range(7)
+            ]
+        }
+        url = f"{BASE_URL}/v1/meals/command/bulk?group_id={self.context['group_id']}"
+
+        resp_blocked = requests.post(url, json=payload, headers=self.context["non_head_chef_headers"], verify=VERIFY_SSL)
+        resp = requests.post(url, json=payload, headers=self.context["head_chef_headers"], verify=VERIFY_SSL)
+        print_info(f"Bulk command responses: non-head chef {resp_blocked.status_code}, head chef {resp.status_code}")
+
+        if resp_blocked.status_code != 403:
+            print_error("Non-head chef was not blocked from the bulk command")
+            return False
+        if resp.status_code == 200 and len(resp.json()) == 21:
+            print_success("Head chef planned 7 days in one bulk command")
+            return True
+        print_error(f"Bulk command failed: {resp.text}")
+        return False
+
     def test_get_endpoint_accessible(self):
         """Test that GET endpoints are accessible to all users"""
         print_info("\n--- 7. TESTING - GET Endpoints Are Accessible ---")
@@ -453,6 +489,162 @@ class RealIntegrationTester:
             print_warning(f"GET endpoint blocked: {resp.status_code}")
             return resp.status_code in [200, 404]
 
+    def test_range_endpoint(self):
+        """Test the calendar range read returns every slot of the requested days"""
+        print_info("\n--- 11. TESTING - Meal Range (Calendar) ---")
+
+        start = datetime.strptime(self.context["today"], "%Y-%m-%d")
+        resp = requests.get(
+            f"{BASE_URL}/v1/meals/range",
+            params={
+                "from": start.strftime("%Y-%m-%d"),
+                "to": (start + timedelta(days=6)).strftime("%Y-%m-%d"),
+                "group_id": self.context["group_id"]
+            },
+            headers=self.context["non_head_chef_headers"],
+            verify=VERIFY_SSL
+        )
+        print_info(f"Range endpoint response: {resp.status_code}")
+
+        if resp.status_code == 200 and len(resp.json()) == 21:
+            print_success("Range endpoint returned 7 days x 3 meals")
+            return True
+        print_error(f"Range endpoint failed: {resp.text}")
+        return False
+
+    def test_shopping_plan_draft(self):
+        """Test the draft sums servings across meals, scales the recipe's ingredients and subtracts the group's stock"""
+        print_info("\n--- 12. TESTING - Shopping Plan Draft ---")
+
+        headers = self.context["head_chef_headers"]
+        group_id = self.context["group_id"]
+        start = datetime.strptime(self.context["today"], "%Y-%m-%d") + timedelta(days=10)
+        first_day, second_day = start.strftime("%Y-%m-%d"), (start + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        # Ingredients of one serving of the recipe, to compute the expected draft
+        resp = requests.post(
+            f"{BASE_URL}/v2/recipes/flattened",
+            json=[{"recipe_id": 12, "quantity": 1}],
+            headers=headers,
+            verify=VERIFY_SSL
+        )
+        if resp.status_code != 200 or not resp.json()["ingredients"]:
+            print_error(f"Failed to get recipe ingredients: {resp.text}")
+            return False
+        per_serving = resp.json()["ingredients"]
+
+        # 2 servings on the first day and 3 on the second: the draft needs 5 servings
+        for day, meal_type, servings in [(first_day, "breakfast", 2), (second_day, "lunch", 3)]:
+            payload = {
+                "date": day,
+                "group_id": group_id,
+                "breakfast": {"action": "skip"},
+                "lunch": {"action": "skip"},
+                "dinner": {"action": "skip"}
+            }
+            payload[meal_type] = {
+                "action": "upsert",
+                "recipe_list": [{"recipe_id": 12, "recipe_name": "Draft Recipe", "servings": servings}]
+            }
+            resp = requests.post(
+                f"{BASE_URL}/v1/meals/command?group_id={group_id}",
+                json=payload,
+                headers=headers,
+                verify=VERIFY_SSL
+            )
+            if resp.status_code != 200:
+                print_error(f"Failed to plan {meal_type} on {day}: {resp.text}")
+                return False
+
+        # Put part of the first ingredient in stock
+        resp = requests.post(
+            f"{BASE_URL}/v1/storages/",
+            json={"storage_name": "Draft Fridge", "storage_type": "fridge", "group_id": group_id},
+            headers=headers,
+            verify=VERIFY_SSL
+        )
+        if resp.status_code != 201:
+            print_error(f"Failed to create storage: {resp.text}")
+            return False
+        stocked = per_serving[0]["ingredient"]
+        unit_payload = {
+            "unit_name": stocked["component_name"],
+            "storage_id": resp.json()["storage_id"],
+            "package_quantity": 1,
+            "component_id": stocked["component_id"],
+            "content_type": stocked["type"]
+        }
+        if stocked["type"] == "uncountable_ingredient":
+            unit_payload["content_quantity"] = per_serving[0]["quantity"]
+            unit_payload["content_unit"] = stocked["uc_measurement_unit"]
+        resp = requests.post(f"{BASE_URL}/v1/storable_units/", json=unit_payload, headers=headers, verify=VERIFY_SSL)
+        if resp.status_code != 201:
+            print_error(f"Failed to add stock: {resp.text}")
+            return False
+
+        resp = requests.post(
+            f"{BASE_URL}/v1/storable_units/stock",
+            json={"group_id": group_id, "component_ids": [stocked["component_id"]]},
+            headers=headers,
+            verify=VERIFY_SSL
+        )
+        if resp.status_code != 200 or [entry["package_quantity"] for entry in resp.json()["data"]] != [1]:
+            print_error(f"Component stock does not show the added unit: {resp.status_code} - {resp.text}")
+            return False
+
+        # 5 servings of everything, minus the stocked package (countable, bought whole) or serving (uncountable)
+        expected = {}
+        for item in per_serving:
+            ingredient = item["ingredient"]
+            held = 0
+            if ingredient["component_id"] == stocked["component_id"]:
+                held = unit_payload.get("content_quantity", unit_payload["package_quantity"])
+            if ingredient["type"] == "countable_ingredient":
+                quantity = math.ceil(item["quantity"] * 5 - held)
+            else:
+                quantity = round(item["quantity"] * 5 - held, 2)
+            if quantity > 0:
+                expected[ingredient["component_id"]] = quantity
+
+        resp = requests.get(
+            f"{BASE_URL}/v1/meals/shopping_plan_draft",
+            params={"from": first_day, "to": second_day, "group_id": group_id},
+            headers=headers,
+            verify=VERIFY_SSL
+        )
+        print_info(f"Shopping plan draft response: {resp.status_code} - {resp.text}")
+        if resp.status_code != 200:
+            print_error("Shopping plan draft failed")
+            return False
+        drafted = {item["component_id"]: item["quantity"] for item in resp.json()["shopping_list"]}
+        if drafted.keys() != expected.keys() or any(abs(drafted[cid] - expected[cid]) > 0.01 for cid in expected):
+            print_error(f"Draft does not match: expected {expected}, got {drafted}")
+            return False
+        print_success("Draft aggregated 5 servings across two meals and subtracted the stock")
+
+        # A range without planned meals gives an empty list, an inverted range is rejected
+        empty_day = (start + timedelta(days=30)).strftime("%Y-%m-%d")
+        resp = requests.get(
+            f"{BASE_URL}/v1/meals/shopping_plan_draft",
+            params={"from": empty_day, "to": empty_day, "group_id": group_id},
+            headers=headers,
+            verify=VERIFY_SSL
+        )
+        if resp.status_code != 200 or resp.json()["shopping_list"] != []:
+            print_error(f"Draft of an empty range is not empty: {resp.status_code} - {resp.text}")
+            return False
+        resp = requests.get(
+            f"{BASE_URL}/v1/meals/shopping_plan_draft",
+            params={"from": second_day, "to": first_day, "group_id": group_id},
+            headers=headers,
+            verify=VERIFY_SSL
+        )
+        if resp.status_code != 400:
+            print_error(f"Inverted range was not rejected: {resp.status_code} - {resp.text}")
+            return False
+        print_success("Empty range drafted nothing and inverted range was rejected")
+        return True
+
     def run_tests(self):
         """Run all integration tests"""
         print_info("Starting Real Integration Tests for Head Chef Middleware")
@@ -477,7 +669,10 @@ class RealIntegrationTester:
             ("Head Chef Can Reopen Meals", self.test_head_chef_can_reopen_meals),
             ("Head Chef Can Finish Meals", self.test_head_chef_can_finish_meals),
             ("Non-Head Chef Cannot Reopen/Finish Meals", self.test_non_head_chef_cannot_reopen_or_finish_meals),
+            ("Bulk Meal Command", self.test_bulk_command_permissions),
             ("GET Endpoint Accessible", self.test_get_endpoint_accessible),
+            ("Meal Range Endpoint", self.test_range_endpoint),
+            ("Shopping Plan Draft", self.test_shopping_plan_draft),
         ]
 
         results = []
@@ -22,6 +22,7 @@ from app.consumers.handlers.user_leave_group_handler import UserLeaveGroupHandle
 from app.consumers.handlers.update_head_chef_role_handler import UpdateHeadChefRoleHandler
 from app.consumers.handlers.food_expiring_soon_handler import FoodExpiringSoonHandler
 from app.consumers.handlers.food_expired_handler import FoodExpiredHandler
+from app.consumers.handlers.food_expiration_digest_handler import FoodExpirationDigestHandler
 from app.consumers.handlers.plan_assigned_handler import PlanAssignedHandler
 from app.consumers.handlers.plan_reported_handler import PlanReportedHandler
 from app.consumers.handlers.plan_expired_handler import PlanExpiredHandler
@@ -77,6 +78,7 @@ async def consume_notifications(app=None):
         "group_head_chef_updated": UpdateHeadChefRoleHandler(),
         "food_expiring_soon": FoodExpiringSoonHandler(),
         "food_expired": FoodExpiredHandler(),
+        "food_expiration_digest": FoodExpirationDigestHandler(),
         "plan_assigned": PlanAssignedHandler(),
         "plan_reported": PlanReportedHandler(),
         "plan_expired": PlanExpiredHandler(),
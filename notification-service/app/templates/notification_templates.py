@@ -90,6 +90,51 @@ class FoodExpiredNotificationTemplate(BaseNotificationTemplate):
         "group_name": str
     }
 
+class FoodExpirationDigestNotificationTemplate(BaseNotificationTemplate):
+    template_code = "FOOD_EXPIRATION_DIGEST"
+    title = "Cập nhật hạn sử dụng thực phẩm của nhóm {group_name}"
+    content = (
+        "Thực phẩm đã hết hạn hôm nay: {expired}\n"
+        "Thực phẩm sắp hết hạn: {expiring_soon}\n"
+        "Hãy kiểm tra và sử dụng sớm nhé!"
+    )
+    data_fields = {
+        "group_name": str,
+        "expired": list,
+        "expiring_soon": list,
+    }
+
+    @classmethod
+    def _format_item_list(cls, items: list[dict]) -> str:
+        if not items:
+            return "Không có"
+        formatted = []
+        for item in items:
+            text = f"'{item['unit_name']}' ({item['storage_name']}"
+            if item.get("expiration_date"):
+                text += f", hạn {item['expiration_date']}"
+            formatted.append(text + ")")
+        return ", ".join(formatted)
+
+    @classmethod
+    def render(cls, raw_data: dict) -> dict:
+        is_valid, errors = cls.validate_raw_data(raw_data)
+        if not is_valid:
+            raise ValueError(
+                f"Invalid raw_data for template '{cls.template_code}': {errors}"
+            )
+
+        formatted_data = {
+            **raw_data,
+            "expired": cls._format_item_list(raw_data["expired"]),
+            "expiring_soon": cls._format_item_list(raw_data["expiring_soon"]),
+        }
+
+        return {
+            "title": cls.title.format(**formatted_data),
+            "content": cls.content.format(**formatted_data),
+        }
+
 class PlanAssignedNotificationTemplate(BaseNotificationTemplate):
     template_code = "PLAN_ASSIGNED"
     title = "Kế hoạch mua sắm đã được giao!"
@@ -12,8 +12,10 @@ from core.database import Base
 from models.recipe_component import (
     RecipeComponent, Ingredient, CountableIngredient, UncountableIngredient, Recipe, ComponentList
 )
-from models.component_existence import ComponentExistence
+from models.component_existence import ComponentExistence, ComponentExistenceChange
 from models.group_preference import GroupPreference, TagRelation
+from models.outbox import OutboxEvent
+from models.recipe_popularity import RecipePopularity, GroupRecipePopularity
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,71 @@
+"""add outbox events and seed recipe summaries
+
+Revision ID: 4e8a2c6d0f13
+Revises: d9f50d70ec50
+Create Date: 2026-10-19 18:21:44.803157
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a2c6d0f13'
+down_revision: Union[str, Sequence[str], None] = 'd9f50d70ec50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('topic', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=True),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id')
+    )
+    op.create_index('ix_outbox_events_pending', 'outbox_events', ['available_at', 'id'], unique=False,
+                    postgresql_where=sa.text('sent_at IS NULL'))
+    # One recipe_upserted event per existing recipe, so replicas start from a full snapshot
+    op.execute("""
+        INSERT INTO outbox_events (event_id, topic, key, payload, attempts)
+        SELECT gen_random_uuid(), 'recipe_service.recipe.change', r.component_id::text,
+               jsonb_build_object(
+                   'event_type', 'recipe_upserted',
+                   'data', jsonb_build_object(
+                       'recipe_id', r.component_id,
+                       'changed_at', to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"'),
+                       'recipe_name', r.component_name,
+                       'image_url', r.image_url,
+                       'prep_time', r.prep_time,
+                       'cook_time', r.cook_time,
+                       'default_servings', r.default_servings,
+                       'level', CASE r.level::text
+                                    WHEN 'EASY' THEN 'Dễ'
+                                    WHEN 'MEDIUM' THEN 'Trung bình'
+                                    WHEN 'HARD' THEN 'Khó'
+                                END
+                   )
+               ),
+               0
+        FROM recipes r
+        ORDER BY r.component_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events', postgresql_where=sa.text('sent_at IS NULL'))
+    op.drop_table('outbox_events')
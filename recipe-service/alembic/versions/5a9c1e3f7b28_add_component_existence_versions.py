@@ -0,0 +1,35 @@
+"""add component existence versions
+
+Revision ID: 5a9c1e3f7b28
+Revises: 7b3e5d9a1c24
+Create Date: 2026-10-19 21:18:02.771649
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9c1e3f7b28'
+down_revision: Union[str, Sequence[str], None] = '7b3e5d9a1c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('component_existence', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_table('component_existence_changes',
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    sa.Column('unit_name', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('group_id', 'unit_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('component_existence_changes')
+    op.drop_column('component_existence', 'version')
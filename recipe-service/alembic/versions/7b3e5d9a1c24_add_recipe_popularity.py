@@ -0,0 +1,41 @@
+"""add recipe popularity
+
+Revision ID: 7b3e5d9a1c24
+Revises: 4e8a2c6d0f13
+Create Date: 2026-10-19 19:26:51.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e5d9a1c24'
+down_revision: Union[str, Sequence[str], None] = '4e8a2c6d0f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recipe_popularity',
+    sa.Column('recipe_id', sa.Integer(), nullable=False),
+    sa.Column('cook_count', sa.Integer(), nullable=False),
+    sa.Column('last_cooked_on', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('recipe_id')
+    )
+    op.create_table('group_recipe_popularity',
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    sa.Column('recipe_id', sa.Integer(), nullable=False),
+    sa.Column('cook_count', sa.Integer(), nullable=False),
+    sa.Column('last_cooked_on', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('group_id', 'recipe_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('group_recipe_popularity')
+    op.drop_table('recipe_popularity')
@@ -1,5 +1,5 @@
 from contextlib import asynccontextmanager
-from core.database import engine, Base
+from core.database import engine, Base, database_manager
 from core.config import settings
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,9 +7,10 @@ from fastapi.responses import HTMLResponse
 from core.admin_middleware import AdminMiddleware
 from apis.v2.ingredient_api import ingredient_router
 from apis.v2.recipe_api import recipe_router
-from core.messaging import kafka_manager
+from core.messaging import kafka_manager, outbox_relay
 from messaging.consumers.component_existence_consumer import consume_component_existence_events
 from messaging.consumers.group_tags_consumer import consume_group_tags_events
+from messaging.consumers.recipe_cooked_consumer import consume_recipe_cooked_events
 from core.caching import redis_manager
 from shopping_shared.utils.logger_utils import get_logger
 import asyncio
@@ -28,7 +29,13 @@ async def lifespan(app: FastAPI):
             db=settings.REDIS_DB,
             password=settings.REDIS_PASSWORD
         )
+        await database_manager.setup(
+            database_uri=settings.ASYNC_DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW
+        )
         kafka_manager.setup(bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS)
+        outbox_relay.start()
         logger.info("Recipe Service started successfully")
     except Exception as e:
         logger.error(f"Failed to start Recipe Service: {str(e)}", exc_info=True)
@@ -36,7 +43,8 @@ async def lifespan(app: FastAPI):
 
     tasks = [
         asyncio.create_task(consume_component_existence_events()),
-        asyncio.create_task(consume_group_tags_events())
+        asyncio.create_task(consume_group_tags_events()),
+        asyncio.create_task(consume_recipe_cooked_events())
     ]
 
     yield
@@ -47,8 +55,10 @@ async def lifespan(app: FastAPI):
     await asyncio.gather(*tasks, return_exceptions=True)
     
     try:
+        await outbox_relay.stop()
         await kafka_manager.close()
         await redis_manager.close()
+        await database_manager.dispose()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}", exc_info=True)
     
@@ -1,57 +1,17 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import JSONResponse
-from fastapi import status
-from shopping_shared.middleware.fastapi_auth import get_current_user
-from shopping_shared.exceptions import Unauthorized
-from shopping_shared.utils.logger_utils import get_logger
+from starlette.types import ASGIApp
+from shopping_shared.middleware.asgi_auth import AuthMiddleware, AuthRule, require_role
 
-logger = get_logger("AdminMiddleware")
 
+class AdminMiddleware(AuthMiddleware):
+    """Every request except reads (and the recipe flattened endpoint) requires the admin role."""
 
-class AdminMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.method in ("GET", "OPTIONS"):
-            return await call_next(request)
-        
-        # Skip authentication for recipe flattened endpoint
-        if request.url.path == "/v2/recipes/flattened":
-            return await call_next(request)
-        
-        try:
-            auth_payload = await get_current_user(request)
-            user_role = auth_payload.get("role")
-
-            if user_role != "admin":
-                logger.warning(
-                    f"Non-admin user attempted {request.method} {request.url.path}. "
-                    f"User role: {user_role}, User ID: {auth_payload.get('sub')}"
-                )
-                return JSONResponse(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    content={
-                        "detail": "Admin role required for this operation",
-                        "required_role": "admin",
-                        "current_role": user_role
-                    }
-                )
-
-            logger.debug(
-                f"Admin access granted for {request.method} {request.url.path}. "
-                f"User ID: {auth_payload.get('sub')}"
-            )
-            return await call_next(request)
-            
-        except Unauthorized as e:
-            logger.warning(f"Unauthorized request: {request.method} {request.url.path} - {str(e)}")
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": str(e)}
-            )
-        except Exception as e:
-            logger.exception(f"Error in admin middleware: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": "Internal server error during authentication"}
-            )
-
+    def __init__(self, app: ASGIApp):
+        super().__init__(
+            app,
+            rules=[
+                # Skip authentication for recipe flattened endpoint
+                AuthRule(r"/v2/recipes/flattened"),
+                AuthRule(r".*", methods={"GET"}),
+                AuthRule(r".*", authorizer=require_role("admin")),
+            ],
+        )
@@ -1,10 +1,15 @@
 from core.messaging import kafka_manager
 from shopping_shared.messaging.topics import COMPONENT_EXISTENCE_TOPIC
-from messaging.handlers.component_existence_handler import handle_component_existence_update
+from messaging.handlers.component_existence_handler import handle_component_existence_update, handle_component_existence_delta
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("ComponentExistenceConsumer")
 
+EVENT_HANDLERS = {
+    "update_component_existence": handle_component_existence_update,
+    "component_existence_delta": handle_component_existence_delta,
+}
+
 
 async def consume_component_existence_events():
     consumer = kafka_manager.create_consumer(
@@ -22,8 +27,9 @@ async def consume_component_existence_events():
                 event_type = event.get("event_type")
                 logger.info(f"Received message: event_type={event_type}, partition={msg.partition}, offset={msg.offset}")
                 
-                if event_type == "update_component_existence":
-                    handle_component_existence_update(event.get("data"))
+                handler = EVENT_HANDLERS.get(event_type)
+                if handler is not None:
+                    handler(event.get("data"))
                     logger.info(f"Successfully handled message: event_type={event_type}, partition={msg.partition}, offset={msg.offset}")
                 else:
                     logger.warning(f"Unknown event_type: {event_type}, partition={msg.partition}, offset={msg.offset}")
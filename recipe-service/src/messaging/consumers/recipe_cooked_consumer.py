@@ -0,0 +1,44 @@
+from core.messaging import kafka_manager
+from shopping_shared.messaging.kafka_topics import RECIPE_COOKED_EVENTS_TOPIC
+from messaging.handlers.recipe_cooked_handler import handle_recipe_cooked
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("RecipeCookedConsumer")
+
+# recipe_cook_counts is the per-group snapshot seeded by meal-service's backfill; both carry totals
+EVENT_HANDLERS = {
+    "recipe_cooked": handle_recipe_cooked,
+    "recipe_cook_counts": handle_recipe_cooked,
+}
+
+
+async def consume_recipe_cooked_events():
+    consumer = kafka_manager.create_consumer(
+        RECIPE_COOKED_EVENTS_TOPIC,
+        group_id="recipe_service_recipe_cooked_group"
+    )
+
+    try:
+        await consumer.start()
+        logger.info("Recipe cooked consumer started")
+
+        async for msg in consumer:
+            try:
+                event = msg.value
+                event_type = event.get("event_type")
+                logger.info(f"Received message: event_type={event_type}, partition={msg.partition}, offset={msg.offset}")
+
+                handler = EVENT_HANDLERS.get(event_type)
+                if handler is not None:
+                    handler(event.get("data"))
+                    logger.info(f"Successfully handled message: event_type={event_type}, partition={msg.partition}, offset={msg.offset}")
+                else:
+                    logger.warning(f"Unknown event_type: {event_type}, partition={msg.partition}, offset={msg.offset}")
+            except Exception as e:
+                logger.error(f"Error processing message: partition={msg.partition}, offset={msg.offset}, error={str(e)}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Error in recipe cooked consumer: {str(e)}", exc_info=True)
+        raise
+    finally:
+        await consumer.stop()
+        logger.info("Recipe cooked consumer stopped")
@@ -1,36 +1,112 @@
 import uuid
 from typing import Dict, Any
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
 from core.database import SessionLocal
-from models.component_existence import ComponentExistence
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("ComponentExistenceHandler")
 
+# Deltas and snapshots carry the producer's per-group version, and the relay may deliver them out of order.
+# A delta only touches the names whose last applied version is older (component_existence_changes), and a snapshot
+# keeps the names changed by newer deltas; change rows covered by a snapshot are dropped.
+_APPLY_SNAPSHOT_SQL = text("""
+    WITH recent AS (
+        SELECT unit_name FROM component_existence_changes WHERE group_id = :group_id AND version > :version
+    ),
+    pruned AS (
+        DELETE FROM component_existence_changes WHERE group_id = :group_id AND version <= :version
+    ),
+    snapshot AS (
+        SELECT name FROM unnest(CAST(:unit_names AS text[])) AS name
+        WHERE name NOT IN (SELECT unit_name FROM recent)
+    )
+    INSERT INTO component_existence (group_id, component_name_list, version)
+    VALUES (:group_id, (SELECT coalesce(jsonb_agg(name ORDER BY name), '[]'::jsonb) FROM snapshot), :version)
+    ON CONFLICT (group_id) DO UPDATE SET component_name_list = (
+        SELECT coalesce(jsonb_agg(name ORDER BY name), '[]'::jsonb)
+        FROM (
+            SELECT name FROM snapshot
+            UNION
+            SELECT name FROM jsonb_array_elements_text(component_existence.component_name_list) AS name
+            WHERE name IN (SELECT unit_name FROM recent)
+        ) merged
+    ), version = excluded.version
+    WHERE component_existence.version <= excluded.version
+""").bindparams(bindparam("group_id", type_=UUID(as_uuid=True)))
+
+# Merges the accepted part of the delta into the stored JSONB list in place, creating the row on first sight
+_APPLY_DELTA_SQL = text("""
+    WITH incoming AS (
+        SELECT name, true AS present FROM unnest(CAST(:added AS text[])) AS name
+        UNION ALL
+        SELECT name, false FROM unnest(CAST(:removed AS text[])) AS name
+    ),
+    accepted AS (
+        INSERT INTO component_existence_changes (group_id, unit_name, version)
+        SELECT :group_id, name, :version FROM incoming
+        WHERE :version > coalesce((SELECT version FROM component_existence WHERE group_id = :group_id), 0)
+        ON CONFLICT (group_id, unit_name) DO UPDATE SET version = excluded.version
+        WHERE component_existence_changes.version < excluded.version
+        RETURNING unit_name
+    ),
+    applied AS (
+        SELECT name, present FROM incoming WHERE name IN (SELECT unit_name FROM accepted)
+    )
+    INSERT INTO component_existence (group_id, component_name_list)
+    VALUES (:group_id, (SELECT coalesce(jsonb_agg(name ORDER BY name), '[]'::jsonb) FROM applied WHERE present))
+    ON CONFLICT (group_id) DO UPDATE SET component_name_list = (
+        SELECT coalesce(jsonb_agg(name ORDER BY name), '[]'::jsonb)
+        FROM (
+            SELECT jsonb_array_elements_text(component_existence.component_name_list) AS name
+            UNION
+            SELECT name FROM applied WHERE present
+        ) merged
+        WHERE name NOT IN (SELECT name FROM applied WHERE NOT present)
+    )
+""").bindparams(bindparam("group_id", type_=UUID(as_uuid=True)))
+
+
 def handle_component_existence_update(data: Dict[str, Any]):
     db = SessionLocal()
     try:
         group_id_raw = data.get("group_id")
         group_id = uuid.UUID(group_id_raw) if isinstance(group_id_raw, str) else group_id_raw
         unit_names = data.get("unit_names", [])
+        version = data.get("version")
+        if version is None:
+            logger.warning(f"Skipping unversioned component existence snapshot: group_id={group_id}")
+            return
 
         with db.begin():
-            if not unit_names:
-                db.query(ComponentExistence).filter(ComponentExistence.group_id == group_id).delete()
-            else:
-                existing = db.query(ComponentExistence).filter(ComponentExistence.group_id == group_id).first()
-                if existing:
-                    existing.component_name_list = unit_names
-                else:
-                    db_obj = ComponentExistence(
-                        group_id=group_id,
-                        component_name_list=unit_names
-                    )
-                    db.add(db_obj)
-        
-        logger.info(f"Successfully processed component existence update: group_id={group_id}")
+            db.execute(_APPLY_SNAPSHOT_SQL, {"group_id": group_id, "version": version, "unit_names": unit_names})
+
+        logger.info(f"Successfully processed component existence update: group_id={group_id}, version={version}")
     except Exception as e:
         logger.error(f"Error processing component existence update: group_id={data.get('group_id')}, error={str(e)}", exc_info=True)
         raise
     finally:
         db.close()
 
+
+def handle_component_existence_delta(data: Dict[str, Any]):
+    db = SessionLocal()
+    try:
+        group_id_raw = data.get("group_id")
+        group_id = uuid.UUID(group_id_raw) if isinstance(group_id_raw, str) else group_id_raw
+        added = data.get("added", [])
+        removed = data.get("removed", [])
+        version = data.get("version")
+        if version is None:
+            logger.warning(f"Skipping unversioned component existence delta: group_id={group_id}")
+            return
+
+        with db.begin():
+            db.execute(_APPLY_DELTA_SQL, {"group_id": group_id, "version": version, "added": added, "removed": removed})
+
+        logger.info(f"Successfully applied component existence delta: group_id={group_id}, version={version}, added={len(added)}, removed={len(removed)}")
+    except Exception as e:
+        logger.error(f"Error applying component existence delta: group_id={data.get('group_id')}, error={str(e)}", exc_info=True)
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,62 @@
+import uuid
+from datetime import date
+from typing import Dict, Any, List
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from core.database import SessionLocal
+from models.recipe_popularity import RecipePopularity, GroupRecipePopularity
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("RecipeCookedHandler")
+
+
+def _fold(model, rows: List[dict]):
+    # Events carry totals, so keeping the greatest value makes replays and reordering harmless
+    stmt = insert(model).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key.columns],
+        set_={
+            "cook_count": func.greatest(model.cook_count, stmt.excluded.cook_count),
+            "last_cooked_on": func.greatest(model.last_cooked_on, stmt.excluded.last_cooked_on),
+        }
+    )
+
+
+def handle_recipe_cooked(data: Dict[str, Any]):
+    """Folds the cook counts of a recipe_cooked (or recipe_cook_counts snapshot) event into the popularity tables."""
+    group_id = uuid.UUID(str(data["group_id"]))
+    recipes = data.get("recipes", [])
+    if not recipes:
+        return
+
+    # Sorted so concurrent handlers lock the global rows in the same order
+    recipes = sorted(recipes, key=lambda recipe: recipe["recipe_id"])
+    global_rows = [
+        {
+            "recipe_id": recipe["recipe_id"],
+            "cook_count": recipe["cook_count"],
+            "last_cooked_on": date.fromisoformat(recipe["last_cooked_on"]),
+        }
+        for recipe in recipes
+    ]
+    group_rows = [
+        {
+            "group_id": group_id,
+            "recipe_id": recipe["recipe_id"],
+            "cook_count": recipe["group_cook_count"],
+            "last_cooked_on": date.fromisoformat(recipe["group_last_cooked_on"]),
+        }
+        for recipe in recipes
+    ]
+
+    db = SessionLocal()
+    try:
+        with db.begin():
+            db.execute(_fold(GroupRecipePopularity, group_rows))
+            db.execute(_fold(RecipePopularity, global_rows))
+        logger.info(f"Successfully folded recipe cook counts: group_id={group_id}, recipes={len(recipes)}")
+    except Exception as e:
+        logger.error(f"Error handling recipe cooked event: {str(e)}", exc_info=True)
+        raise
+    finally:
+        db.close()
@@ -1,4 +1,5 @@
 import uuid
+from sqlalchemy import BigInteger, String
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from core.database import Base
@@ -9,4 +10,14 @@ class ComponentExistence(Base):
 
     group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
     component_name_list: Mapped[list[str]] = mapped_column(JSONB, nullable=False)
+    # Version of the last full snapshot applied
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
 
+
+class ComponentExistenceChange(Base):
+    """Version of the last delta applied to a unit name, newer than the group's snapshot."""
+    __tablename__ = "component_existence_changes"
+
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    unit_name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,5 @@
+from shopping_shared.messaging.outbox import OutboxMixin
+from core.database import Base
+
+class OutboxEvent(OutboxMixin, Base):
+    __tablename__ = "outbox_events"
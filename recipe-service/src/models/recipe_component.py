@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String, Float, Enum, ForeignKey, UniqueConstraint, Index, text
+from datetime import datetime, timezone
+from sqlalchemy import Integer, String, Float, Enum, ForeignKey, UniqueConstraint, Index, text, event, insert, inspect
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from enums.c_measurement_unit import CMeasurementUnit
@@ -6,6 +7,8 @@ from enums.uc_measurement_unit import UCMeasurementUnit
 from enums.category import Category
 from enums.level import Level
 from core.database import Base
+from models.outbox import OutboxEvent
+from shopping_shared.messaging.kafka_topics import RECIPE_EVENTS_TOPIC
 
 class RecipeComponent(Base):
     __tablename__ = "recipe_components"
@@ -132,3 +135,47 @@ class RecipesFlattened(Base):
         foreign_keys=[component_id],
         uselist=False
     )
+
+
+# Fields replicated by other services (meal-service's recipe_summaries)
+RECIPE_SUMMARY_FIELDS = ("component_name", "image_url", "prep_time", "cook_time", "default_servings", "level")
+
+
+def enqueue_recipe_event(connection, event_type: str, recipe: "Recipe") -> None:
+    """
+    Writes a recipe change event to the outbox in the flush that changes the recipe.
+    changed_at lets consumers drop events that arrive out of order (e.g. after a relay retry).
+    """
+    data = {"recipe_id": recipe.component_id, "changed_at": datetime.now(timezone.utc).isoformat()}
+    if event_type == "recipe_upserted":
+        data.update({
+            "recipe_name": recipe.component_name,
+            "image_url": recipe.image_url,
+            "prep_time": recipe.prep_time,
+            "cook_time": recipe.cook_time,
+            "default_servings": recipe.default_servings,
+            "level": recipe.level.value if recipe.level is not None else None,
+        })
+    connection.execute(insert(OutboxEvent).values(
+        topic=RECIPE_EVENTS_TOPIC,
+        key=str(recipe.component_id),
+        payload={"event_type": event_type, "data": data},
+    ))
+
+
+@event.listens_for(Recipe, "after_insert")
+def publish_recipe_after_insert(mapper, connection, target):
+    enqueue_recipe_event(connection, "recipe_upserted", target)
+
+
+@event.listens_for(Recipe, "after_update")
+def publish_recipe_after_update(mapper, connection, target):
+    # Component list edits do not change the summary
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in RECIPE_SUMMARY_FIELDS):
+        enqueue_recipe_event(connection, "recipe_upserted", target)
+
+
+@event.listens_for(Recipe, "after_delete")
+def publish_recipe_after_delete(mapper, connection, target):
+    enqueue_recipe_event(connection, "recipe_deleted", target)
@@ -0,0 +1,25 @@
+import uuid
+from datetime import date
+from sqlalchemy import Integer, Date
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from core.database import Base
+
+
+class RecipePopularity(Base):
+    """How often a recipe has been cooked across all groups, folded from meal-service's recipe_cooked events."""
+    __tablename__ = "recipe_popularity"
+
+    recipe_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cook_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_cooked_on: Mapped[date] = mapped_column(Date, nullable=False)
+
+
+class GroupRecipePopularity(Base):
+    """How often a group has cooked a recipe."""
+    __tablename__ = "group_recipe_popularity"
+
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    recipe_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cook_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_cooked_on: Mapped[date] = mapped_column(Date, nullable=False)
@@ -2,12 +2,13 @@ import json
 import uuid
 from sqlalchemy.orm import Session
 from typing import List, Dict
-from math import tanh
+from math import tanh, log1p
 import heapq
 from core.caching import redis_manager
 from models.recipe_component import RecipesFlattened
 from models.group_preference import GroupPreference, TagRelation
 from models.component_existence import ComponentExistence
+from models.recipe_popularity import RecipePopularity, GroupRecipePopularity
 from schemas.ingredient_schemas import IngredientResponse
 
 
@@ -59,6 +60,10 @@ class Recommender:
 
         return total_points
 
+    def calculate_popularity_points(self, cook_count: int, group_cook_count: int) -> float:
+        # Global counts grow with the user base, so they are damped with a log; the group's own habits weigh as much
+        return 0.5 * tanh(log1p(cook_count) / 4) + 0.5 * tanh(group_cook_count / 5)
+
     async def recommend(self, db: Session, group_id: uuid.UUID) -> List[int]:
         cache_key = f"recipe:recommendations:{group_id}"
 
@@ -82,6 +87,15 @@ class Recommender:
         ).first()
         component_name_set = set(component_existence.component_name_list) if component_existence else set()     # type: ignore
 
+        cook_counts: Dict[int, int] = dict(
+            db.query(RecipePopularity.recipe_id, RecipePopularity.cook_count).all()                             # type: ignore
+        )
+        group_cook_counts: Dict[int, int] = dict(
+            db.query(GroupRecipePopularity.recipe_id, GroupRecipePopularity.cook_count).filter(                 # type: ignore
+                GroupRecipePopularity.group_id == group_id
+            ).all()
+        )
+
         recipes_flattened_list = db.query(RecipesFlattened).all()
 
         recipe_scores: list[tuple[float, int]] = []
@@ -106,7 +120,12 @@ class Recommender:
             exist_points = len(ingredient_name_set & component_name_set)
             tag_points = self.calculate_tag_points(recipe_tag_set, group_tag_set)
 
-            total_point = tanh(exist_points) + tanh(tag_points)
+            popularity_points = self.calculate_popularity_points(
+                cook_counts.get(recipes_flattened.component_id, 0),
+                group_cook_counts.get(recipes_flattened.component_id, 0)
+            )
+
+            total_point = tanh(exist_points) + tanh(tag_points) + popularity_points
 
             if len(recipe_scores) < self.top_k:
                 heapq.heappush(recipe_scores, (total_point, recipes_flattened.component_id))
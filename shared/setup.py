@@ -20,6 +20,7 @@ setup(
             'greenlet==3.2.4',
             'idna==3.10',
             'psycopg2-binary==2.9.10',
+            'asyncpg==0.30.0',
             'redis==5.2.1'
         ],
         'sanic': [
@@ -8,6 +8,7 @@ class RedisKeys:
 
     # --- Service Prefixes ---
     USER_SERVICE = "user-service"
+    MEAL_SERVICE = "meal-service"
 
     # --- Cache Patterns (Constants used for Decorators & Wildcard Deletion) ---
 
@@ -65,6 +66,35 @@ class RedisKeys:
         """Key for Idempotency Locks/Results."""
         return f"{RedisKeys.USER_SERVICE}:idempotency:{user_id}:{idem_key}"
 
+    # --- Distributed Scheduling (shared by every service running APScheduler jobs) ---
+
+    @staticmethod
+    def scheduler_lease(service: str, job_id: str) -> str:
+        """Key holding the lease of the instance allowed to run an exclusive job."""
+        return f"{service}:scheduler:lease:{job_id}"
+
+    @staticmethod
+    def scheduler_members(service: str) -> str:
+        """Sorted set of live scheduler instances (score = last heartbeat)."""
+        return f"{service}:scheduler:members"
+
+    @staticmethod
+    def scheduler_shard_plan(service: str, job_id: str) -> str:
+        """Key pinning the member list used to shard one run of a sharded job."""
+        return f"{service}:scheduler:shard-plan:{job_id}"
+
+    # --- Meal Service ---
+
+    @staticmethod
+    def meal_week_generation(group_id: str) -> str:
+        """Counter bumped on every meal write of a group; week views are keyed by it."""
+        return f"{RedisKeys.MEAL_SERVICE}:groups:{group_id}:meals:generation"
+
+    @staticmethod
+    def meal_week_view(group_id: str, generation: int, week_start: str) -> str:
+        """Key for the assembled meals of a group's week (week_start = Monday, ISO date) at a cache generation."""
+        return f"{RedisKeys.MEAL_SERVICE}:groups:{group_id}:meals:g{generation}:week:{week_start}"
+
     # --- Helper methods to format patterns manually ---
     
     @staticmethod
@@ -0,0 +1,101 @@
+from typing import Generic, TypeVar, Optional, Sequence, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
+from sqlalchemy.inspection import inspect
+from pydantic import BaseModel
+from fastapi import HTTPException
+
+"""
+    Generic async CRUD base class, the AsyncSession counterpart of CRUDBase.
+    Relationships are always eager-loaded (selectinload) because lazy loading is not available on AsyncSession.
+"""
+
+ModelType = TypeVar("ModelType", bound=DeclarativeBase)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: type[ModelType]):
+        self.model = model
+        self._relationships = {name: rel for name, rel in inspect(self.model).relationships.items()}
+        self._pk = inspect(self.model).primary_key[0]
+
+    def _load_with_relationships(self, stmt: Select) -> Select:
+        for rel in self._relationships.keys():
+            stmt = stmt.options(selectinload(getattr(self.model, rel)))
+        return stmt
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        stmt = select(self.model).where(self._pk == id)                                         # type: ignore
+        stmt = self._load_with_relationships(stmt)
+        result = await db.execute(stmt)
+        return result.scalars().first()
+
+    async def get_many(self, db: AsyncSession, cursor: Optional[int] = None, limit: int = 100) -> Sequence[ModelType]:
+        stmt = select(self.model).order_by(self._pk.desc()).limit(limit)
+        if cursor is not None:
+            stmt = stmt.where(self._pk < cursor)
+        stmt = self._load_with_relationships(stmt)
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    async def delete(self, db: AsyncSession, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    def _separate_data(self, obj_data: Dict[str, Any]):
+        scalar_data = {}
+        relationship_data = {}
+        for key, value in obj_data.items():
+            if key in self._relationships:
+                relationship_data[key] = value
+            else:
+                scalar_data[key] = value
+        return scalar_data, relationship_data
+
+    async def _reload(self, db: AsyncSession, db_obj: ModelType) -> ModelType:
+        # Re-select with eager loading so relationships are usable after the session is closed
+        stmt = select(self.model).where(self._pk == getattr(db_obj, self._pk.key))            # type: ignore
+        stmt = self._load_with_relationships(stmt).execution_options(populate_existing=True)
+        result = await db.execute(stmt)
+        return result.scalars().one()
+
+    async def _commit(self, db: AsyncSession, db_obj: ModelType) -> ModelType:
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=f"Integrity error: {str(e)}")
+        return await self._reload(db, db_obj)
+
+    async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = obj_in.model_dump()
+        scalar_data, relationship_data = self._separate_data(obj_in_data)
+        db_obj = self.model(**scalar_data)
+        for field, value in relationship_data.items():
+            if value is not None:
+                related_model = self._relationships[field].mapper.class_
+                related_objects = [related_model(**item) for item in value]
+                setattr(db_obj, field, related_objects)
+        db.add(db_obj)
+        return await self._commit(db, db_obj)
+
+    async def update(self, db: AsyncSession, obj_in: UpdateSchemaType, db_obj: ModelType) -> ModelType:
+        # db_obj is expected to come from get(), so its collections are already loaded
+        obj_in_data = obj_in.model_dump(exclude_unset=True)
+        scalar_data, relationship_data = self._separate_data(obj_in_data)
+        for field, value in scalar_data.items():
+            setattr(db_obj, field, value)
+        for field, value in relationship_data.items():
+            if value is not None:
+                related_model = self._relationships[field].mapper.class_
+                new_objects = [related_model(**item) for item in value]
+                setattr(db_obj, field, new_objects)
+        db.add(db_obj)
+        return await self._commit(db, db_obj)
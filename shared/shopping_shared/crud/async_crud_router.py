@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Depends, Query, Body, status, HTTPException, Path
+from typing import TypeVar, Type, Optional, Callable, AsyncGenerator, Any
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+from pydantic import BaseModel
+from shopping_shared.crud.async_crud_base import AsyncCRUDBase
+from shopping_shared.schemas.cursor_pagination_schema import CursorPaginationResponse
+
+"""
+    Generic async CRUD router factory, the AsyncCRUDBase counterpart of the services' create_crud_router.
+    The session dependency is injected so each service can pass its own (e.g. database_manager.get_db).
+"""
+
+ModelType = TypeVar("ModelType", bound=DeclarativeBase)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+ResponseSchemaType = TypeVar("ResponseSchemaType", bound=BaseModel)
+
+def create_async_crud_router(
+        *,
+        model: Type[ModelType],
+        crud_base: AsyncCRUDBase,
+        create_schema: Type[CreateSchemaType],
+        update_schema: Type[UpdateSchemaType],
+        response_schema: Type[ResponseSchemaType],
+        get_db: Callable[[], AsyncGenerator[AsyncSession, Any]],
+        prefix: str = "",
+        tags: Optional[list[str]] = None
+) -> APIRouter:
+    router = APIRouter(prefix=prefix, tags=tags)
+    model_name = crud_base.model.__name__
+
+    @router.get(
+        "/{id}",
+        response_model=response_schema,
+        status_code=status.HTTP_200_OK,
+        description=f"Retrieve a {model_name} by its unique ID. Returns 404 if the {model_name} does not exist."
+    )
+    async def get_item(id: int = Path(..., ge=1), db: AsyncSession = Depends(get_db)):
+        obj = await crud_base.get(db, id)
+        if obj is None:
+            raise HTTPException(status_code=404, detail=f"{model_name} with id={id} not found")
+        return obj
+
+    @router.get(
+        "/",
+        response_model=CursorPaginationResponse[response_schema],                                 # type: ignore
+        status_code=status.HTTP_200_OK,
+        description=(
+                f"Retrieve a list of {model_name} items. "
+                "Supports pagination with cursor and limit."
+        )
+    )
+    async def get_many_items(
+        cursor: Optional[int] = Query(None, ge=0, description="Cursor for pagination (ID of the last item from previous page)"),
+        limit: int = Query(100, ge=1, description="Maximum number of results to return"),
+        db: AsyncSession = Depends(get_db)
+    ):
+        items = await crud_base.get_many(db, cursor=cursor, limit=limit)
+        pk = inspect(crud_base.model).primary_key[0]
+        next_cursor = getattr(items[-1], pk.name) if items and len(items) == limit else None
+        return CursorPaginationResponse(
+            data=list(items),
+            next_cursor=next_cursor,
+            size=len(items)
+        )
+
+    @router.post(
+        "/",
+        response_model=response_schema,
+        status_code=status.HTTP_201_CREATED,
+        description=f"Create a new {model_name} with the provided data. Returns the created {model_name}."
+    )
+    async def create_item(obj_in: create_schema = Body(...), db: AsyncSession = Depends(get_db)):      # type: ignore
+        return await crud_base.create(db, obj_in)
+
+    @router.put(
+        "/{id}",
+        response_model=response_schema,
+        status_code=status.HTTP_200_OK,
+        description=(
+                f"Update an existing {model_name} identified by its ID with the provided data. "
+                f"Returns 404 if the {model_name} does not exist."
+        )
+    )
+    async def update_item(id: int = Path(..., ge=1), obj_in: update_schema = Body(...), db: AsyncSession = Depends(get_db)):     # type: ignore
+        db_obj = await crud_base.get(db, id)
+        if db_obj is None:
+            raise HTTPException(status_code=404, detail=f"{model_name} with id={id} not found")
+        return await crud_base.update(db, obj_in, db_obj)
+
+    @router.delete(
+        "/{id}",
+        status_code=status.HTTP_204_NO_CONTENT,
+        description=(
+                f"Delete an existing {model_name} by its unique ID. "
+                f"Returns 204 No Content on success. Returns 404 if the {model_name} does not exist."
+        )
+    )
+    async def delete_item(id: int = Path(..., ge=1), db: AsyncSession = Depends(get_db)):
+        db_obj = await crud_base.get(db, id)
+        if db_obj is None:
+            raise HTTPException(status_code=404, detail=f"{model_name} with id={id} not found")
+        await crud_base.delete(db, id)
+
+    return router
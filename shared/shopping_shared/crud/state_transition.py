@@ -0,0 +1,119 @@
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, TypeVar, Union
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, DeclarativeBase
+from fastapi import HTTPException
+
+"""
+    Declarative state transitions compiled into a single conditional UPDATE.
+    Instead of SELECT ... FOR UPDATE, checking in Python and flushing an UPDATE, a transition runs
+        UPDATE <table> SET <status> = :to, ... WHERE <id> = :id AND <status> IN (:from) AND <guards> RETURNING *
+    so the row is locked only for the statement itself. When nothing is returned, a plain SELECT of the
+    checked columns tells which precondition failed (404, then guards in declaration order).
+"""
+
+ModelType = TypeVar("ModelType", bound=DeclarativeBase)
+
+
+class Guard:
+    """A precondition of a transition (column == expected, or IN when expected is a collection)."""
+
+    def __init__(self, column: Any, expected: Any, status_code: int, detail: Union[str, Callable[[Any], str]]):
+        self.column = column
+        self.expected = expected
+        self.status_code = status_code
+        self.detail = detail
+
+    def _is_collection(self) -> bool:
+        return isinstance(self.expected, (list, tuple, set, frozenset))
+
+    def clause(self):
+        if self._is_collection():
+            return self.column.in_(self.expected)
+        if self.expected is None:
+            return self.column.is_(None)
+        return self.column == self.expected
+
+    def holds(self, actual: Any) -> bool:
+        return actual in self.expected if self._is_collection() else actual == self.expected
+
+    def error(self, actual: Any) -> HTTPException:
+        detail = self.detail(actual) if callable(self.detail) else self.detail
+        return HTTPException(status_code=self.status_code, detail=detail)
+
+
+class StateTransition(Generic[ModelType]):
+    """
+    Moves a row from one of `from_status` to `to_status` in one round trip.
+    Usage:
+        CANCEL = StateTransition(Meal, Meal.meal_id, Meal.meal_status, MealStatus.CREATED, MealStatus.CANCELLED, entity="meal")
+        meal = CANCEL.apply(db, id, guards=[Guard(Meal.group_id, group_id, 403, "...")])
+    entity names the row in the wrong-status message ("meal status must be ..."); 404 and 409 use the model name.
+    status_first decides whether a wrong status is reported before (default) or after the other guards.
+    version_column, when given, is incremented by every transition (optimistic concurrency / ETags).
+    """
+
+    def __init__(
+        self,
+        model: type[ModelType],
+        id_column: Any,
+        status_column: Any,
+        from_status: Any,
+        to_status: Any,
+        entity: Optional[str] = None,
+        status_first: bool = True,
+        version_column: Any = None
+    ):
+        self.model = model
+        self.id_column = id_column
+        self.to_status = to_status
+        self.entity = entity or model.__name__
+        self.status_first = status_first
+        self.version_column = version_column
+        allowed = list(from_status) if isinstance(from_status, (list, tuple, set, frozenset)) else from_status
+        self.status_guard = Guard(
+            status_column,
+            allowed,
+            400,
+            lambda actual: (
+                f"Operation not allowed: {self.entity} status must be "
+                f"{'one of ' if isinstance(allowed, list) else ''}{allowed}, got {actual}"
+            )
+        )
+
+    def apply(
+        self,
+        db: Session,
+        id: Any,
+        guards: Sequence[Guard] = (),
+        values: Optional[Dict[str, Any]] = None
+    ) -> ModelType:
+        """Runs the transition inside the caller's transaction and returns the updated row."""
+        ordered = self._ordered(guards)
+        new_values = {self.status_guard.column.key: self.to_status, **(values or {})}
+        if self.version_column is not None:
+            new_values[self.version_column.key] = self.version_column + 1
+        stmt = (
+            update(self.model)
+            .where(self.id_column == id, *[guard.clause() for guard in ordered])
+            .values(new_values)
+            .returning(self.model)
+        )
+        obj = db.execute(stmt).scalar_one_or_none()
+        if obj is None:
+            raise self._diagnose(db, id, ordered)
+        return obj
+
+    def _ordered(self, guards: Sequence[Guard]) -> list[Guard]:
+        return [self.status_guard, *guards] if self.status_first else [*guards, self.status_guard]
+
+    def _diagnose(self, db: Session, id: Any, guards: Sequence[Guard]) -> HTTPException:
+        row = db.execute(
+            select(*[guard.column for guard in guards]).where(self.id_column == id)
+        ).one_or_none()
+        if row is None:
+            return HTTPException(status_code=404, detail=f"{self.model.__name__} not found")
+        for guard, actual in zip(guards, row):
+            if not guard.holds(actual):
+                return guard.error(actual)
+        # Every precondition holds now, so the row changed between the UPDATE and this check
+        return HTTPException(status_code=409, detail=f"{self.model.__name__} was modified concurrently, please retry")
@@ -101,6 +101,21 @@ class DatabaseManager:
         finally:
             await session.close()
 
+    async def get_db(self) -> AsyncGenerator[AsyncSession, Any]:
+        """
+        FastAPI dependency yielding a session per request.
+        Unlike get_session(), it does not commit: CRUD classes own their transactions (mirrors the sync get_db).
+        Usage: db: AsyncSession = Depends(database_manager.get_db)
+        """
+        if not self.session_maker:
+            raise DatabaseError("Database not initialized. Call setup() first.")
+
+        session = self.session_maker()
+        try:
+            yield session
+        finally:
+            await session.close()
+
     async def dispose(self) -> None:
         """Dispose of the database engine and close all connections."""
         if self.engine:
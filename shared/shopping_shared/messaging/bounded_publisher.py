@@ -0,0 +1,59 @@
+# shared/shopping_shared/messaging/bounded_publisher.py
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from shopping_shared.messaging.kafka_manager import KafkaManager
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("Bounded Publisher")
+
+
+class BoundedPublisher:
+    """
+    Publishes many messages concurrently without awaiting each broker ack,
+    while capping the number of in-flight sends so memory stays bounded.
+    Usage:
+        async with BoundedPublisher(kafka_manager, max_in_flight=500) as publisher:
+            await publisher.publish(topic, value, key)
+        # leaving the block waits for every pending ack
+    """
+
+    def __init__(self, kafka_manager: KafkaManager, max_in_flight: int = 1000):
+        self._kafka = kafka_manager
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._pending: Set[asyncio.Future] = set()
+        self.sent = 0
+        self.failed = 0
+
+    async def publish(self, topic: str, value: Any, key: Optional[str] = None, headers: Optional[Dict[str, str]] = None):
+        """Buffers a message, waiting only when max_in_flight sends are still unacknowledged."""
+        await self._semaphore.acquire()
+        try:
+            future = await self._kafka.send_message(topic=topic, value=value, key=key, headers=headers, wait=False)
+        except Exception as e:
+            self._semaphore.release()
+            self.failed += 1
+            logger.error(f"Failed to buffer message for topic {topic} (key={key}): {e}")
+            return
+        self._pending.add(future)
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        self._pending.discard(future)
+        self._semaphore.release()
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+            logger.error(f"Message delivery failed: {'cancelled' if future.cancelled() else future.exception()}")
+        else:
+            self.sent += 1
+
+    async def drain(self) -> None:
+        """Waits until every buffered message is acknowledged or failed."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def __aenter__(self) -> "BoundedPublisher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.drain()
@@ -114,6 +114,7 @@ class KafkaManager:
         :param headers: Optional dictionary of headers.
         :param wait: If True, waits for broker acknowledgement (Slower, Safer).
                      If False, returns immediately after buffering (Faster, riskier).
+        :return: When wait=False, the delivery future, so callers can batch sends and await acks together.
         """
         producer = await self.get_producer()
         try:
@@ -131,7 +132,7 @@ class KafkaManager:
                 )
             else:
                 # Faster, fire-and-forget (Analytics, Logs)
-                await producer.send(
+                return await producer.send(
                     topic=topic,
                     value=value,
                     key=key_bytes,
@@ -141,22 +142,24 @@ class KafkaManager:
             logger.error(f"Failed to send message to topic {topic}: {e}")
             raise MessageBrokerError(f"Failed to send message: {e}") from e
 
-    def create_consumer(self, *topics, group_id: str, **kwargs) -> AIOKafkaConsumer:
+    def create_consumer(self, *topics, group_id: Optional[str], **kwargs) -> AIOKafkaConsumer:
         """
         Creates and returns a new AIOKafkaConsumer instance for the given topics.
         The consumer is NOT started automatically. The caller is responsible for
         starting and stopping the consumer.
+        group_id=None creates a standalone consumer that sees every message (e.g. per-replica cache invalidation).
         """
         if not self._bootstrap_servers:
             raise ConnectionError("KafkaManager is not configured. Call setup() first.")
 
         logger.info(f"Creating Kafka consumer for topics {topics} in group '{group_id}'")
+        # Start reading from the beginning of the topic if no offset is stored, unless the caller says otherwise
+        kwargs.setdefault('auto_offset_reset', 'earliest')
         consumer = AIOKafkaConsumer(
             *topics,
             bootstrap_servers=self._bootstrap_servers,
             group_id=group_id,
             value_deserializer=self._deserializer,
-            auto_offset_reset='earliest',  # Start reading from the beginning of the topic if no offset is stored
             **kwargs
         )
         self._consumers.append(consumer)
@@ -12,4 +12,12 @@ USER_UPDATE_TAG_EVENTS_TOPIC = "user_service.user.update_tags"
 LOGOUT_EVENTS_TOPIC = "user_service.user.logout_account"
 
 # General notification topic - all non-OTP notifications go here
-NOTIFICATION_TOPIC = "service_notifications"
\ No newline at end of file
+NOTIFICATION_TOPIC = "service_notifications"
+
+# Recipe summary changes (recipe_upserted / recipe_deleted), keyed by recipe_id.
+# Published by recipe-service through its outbox; meal-service keeps a local replica of recipe summaries.
+RECIPE_EVENTS_TOPIC = "recipe_service.recipe.change"
+
+# Recipe cook counters (recipe_cooked per finished meal, recipe_cook_counts snapshots), keyed by group_id.
+# Published by meal-service through its outbox; recipe-service folds the counters into recipe popularity.
+RECIPE_COOKED_EVENTS_TOPIC = "meal_service.recipe.cooked"
@@ -0,0 +1,198 @@
+# shared/shopping_shared/messaging/outbox.py
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, delete, select, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
+from sqlalchemy.sql import func
+
+from shopping_shared.databases.database_manager import DatabaseManager
+from shopping_shared.messaging.kafka_manager import KafkaManager
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("Outbox Relay")
+
+"""
+    Transactional outbox.
+    Events are written to an outbox table in the same transaction as the business change (enqueue_event),
+    and OutboxRelay publishes them to Kafka in batches, retrying with backoff until the broker acks.
+    Delivery is at-least-once; every message carries an `event_id` header so consumers can dedupe.
+"""
+
+
+class OutboxMixin:
+    """
+    Columns of an outbox table. Each service maps it onto its own Base:
+        class OutboxEvent(OutboxMixin, Base):
+            __tablename__ = "outbox_events"
+    """
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4, unique=True)
+    topic: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    payload: Mapped[Any] = mapped_column(JSONB, nullable=False)
+    headers: Mapped[Optional[Dict[str, str]]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    @declared_attr.directive
+    def __table_args__(cls):
+        # Only pending rows are ever scanned by the relay, so keep the index to those
+        return (
+            Index(f"ix_{cls.__tablename__}_pending", "available_at", "id", postgresql_where=text("sent_at IS NULL")),
+        )
+
+
+def enqueue_event(
+    session: Any,
+    model: Type[OutboxMixin],
+    topic: str,
+    value: Any,
+    key: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> OutboxMixin:
+    """
+    Adds an event to the outbox in the caller's transaction (works with both Session and AsyncSession).
+    Nothing is published until the transaction commits and the relay picks the row up.
+    """
+    event = model(topic=topic, key=key, payload=value, headers=headers)
+    session.add(event)
+    return event
+
+
+class OutboxRelay:
+    """
+    Background worker publishing pending outbox rows.
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several replicas can run a relay on the same table.
+    """
+
+    def __init__(
+        self,
+        model: Type[OutboxMixin],
+        database_manager: DatabaseManager,
+        kafka_manager: KafkaManager,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        retention: timedelta = timedelta(days=1),
+        purge_interval: float = 3600.0
+    ):
+        self.model = model
+        self._db = database_manager
+        self._kafka = kafka_manager
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Outbox relay started for table {self.model.__tablename__}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info(f"Outbox relay stopped for table {self.model.__tablename__}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_purge = loop.time()
+        while True:
+            try:
+                processed = await self.relay_batch()
+                if loop.time() - last_purge >= self.purge_interval:
+                    await self.purge_sent()
+                    last_purge = loop.time()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox relay iteration failed: {str(e)}", exc_info=True)
+                processed = 0
+
+            # A full batch means there is probably more backlog, so go again right away
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.base_backoff * (2 ** (attempts - 1)), self.max_backoff)
+
+    async def relay_batch(self) -> int:
+        """Publishes one batch of pending events. Returns the number of rows claimed."""
+        model = self.model
+        async with self._db.get_session() as session:
+            events = (await session.execute(
+                select(model)
+                .where(model.sent_at.is_(None), model.available_at <= func.now())
+                .order_by(model.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+
+            if not events:
+                return 0
+
+            # Buffer the whole batch first so the producer can pack it, then wait for all acks at once
+            futures = []
+            for event in events:
+                headers = dict(event.headers or {})
+                headers["event_id"] = str(event.event_id)
+                try:
+                    futures.append(await self._kafka.send_message(
+                        topic=event.topic,
+                        value=event.payload,
+                        key=event.key,
+                        headers=headers,
+                        wait=False
+                    ))
+                except Exception as e:
+                    futures.append(e)
+
+            results = await asyncio.gather(
+                *[f if isinstance(f, asyncio.Future) else _failed(f) for f in futures],
+                return_exceptions=True
+            )
+
+            now = datetime.now(timezone.utc)
+            failed = 0
+            for event, result in zip(events, results):
+                if isinstance(result, BaseException):
+                    failed += 1
+                    event.attempts += 1
+                    event.last_error = str(result)[:1000]
+                    event.available_at = now + timedelta(seconds=self._backoff(event.attempts))
+                else:
+                    event.sent_at = now
+
+            if failed:
+                logger.warning(f"Outbox relay: {failed}/{len(events)} events failed and will be retried")
+            else:
+                logger.debug(f"Outbox relay: published {len(events)} events")
+            return len(events)
+
+    async def purge_sent(self) -> None:
+        """Deletes rows that were published longer ago than the retention window."""
+        model = self.model
+        async with self._db.get_session() as session:
+            result = await session.execute(
+                delete(model).where(model.sent_at < func.now() - self.retention)
+            )
+        if result.rowcount:
+            logger.info(f"Outbox relay: purged {result.rowcount} sent events")
+
+
+async def _failed(error: Exception):
+    raise error
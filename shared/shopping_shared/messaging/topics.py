@@ -15,5 +15,6 @@ USER_EVENTS_TOPIC = "user_events"
 # Topic for component existence updates.
 # The shopping-storage-service will produce events here when storable units are added/removed.
 # The recipe-service will consume this to update component existence cache.
-# Example message: {'event_type': 'update_component_existence', 'data': {'group_id': 123, 'unit_names': ['...']}}
+# Example message: {'event_type': 'update_component_existence', 'data': {'group_id': 123, 'version': 7, 'unit_names': ['...']}}  (full snapshot)
+# Example message: {'event_type': 'component_existence_delta', 'data': {'group_id': 123, 'version': 8, 'added': ['...'], 'removed': ['...']}}
 COMPONENT_EXISTENCE_TOPIC = "component_existence"
\ No newline at end of file
@@ -0,0 +1,153 @@
+# shared/shopping_shared/middleware/asgi_auth.py
+import re
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from shopping_shared.caching.redis_manager import redis_manager
+from shopping_shared.exceptions import Unauthorized
+from shopping_shared.middleware.auth_utils import TokenStateCache, extract_kong_headers, validate_token_state
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("ASGI Auth Middleware")
+
+# Returns None to let the request through, or the response to send instead (e.g. a 403)
+Authorizer = Callable[[Dict[str, Any], Request], Awaitable[Optional[Response]]]
+
+
+class AuthRule:
+    """
+    Protects the requests whose method is in `methods` (any method when None) and whose whole path matches
+    the regular expression `pattern`. A rule without authorizer marks the matched requests as public.
+    """
+
+    def __init__(self, pattern: str, methods: Optional[Iterable[str]] = None, authorizer: Optional[Authorizer] = None):
+        self.pattern = re.compile(pattern)
+        self.methods = frozenset(method.upper() for method in methods) if methods is not None else None
+        self.authorizer = authorizer
+
+
+def require_role(role: str) -> Authorizer:
+    """Authorizer accepting users whose gateway role is `role`."""
+
+    async def authorize(auth_payload: Dict[str, Any], request: Request) -> Optional[Response]:
+        user_role = auth_payload.get("role")
+        if user_role == role:
+            return None
+        logger.warning(
+            f"User without role {role} attempted {request.method} {request.url.path}. "
+            f"User role: {user_role}, User ID: {auth_payload.get('sub')}"
+        )
+        return JSONResponse(
+            status_code=403,
+            content={
+                "detail": f"{role.capitalize()} role required for this operation",
+                "required_role": role,
+                "current_role": user_role
+            }
+        )
+
+    return authorize
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI authentication/authorization middleware for the FastAPI services.
+    Rules are checked in order and the first one matching the method and path applies; requests matching
+    no rule (and CORS preflights) pass through untouched. For protected requests, the Kong headers are
+    validated against Redis (with a short-TTL TokenStateCache), the payload is stored in the request state
+    so get_current_user reuses it, and the rule's authorizer decides. Unlike BaseHTTPMiddleware, the
+    request and response are never wrapped: an allowed request goes to the app with its original scope,
+    receive and send.
+    Usage:
+        app.add_middleware(AuthMiddleware, rules=[AuthRule(r"/v2/.*", methods={"POST"}, authorizer=require_role("admin"))])
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Iterable[AuthRule],
+        token_cache_ttl: float = 5.0,
+        error_detail: str = "Internal server error during authentication"
+    ):
+        self.app = app
+        self.error_detail = error_detail
+        self.token_cache = TokenStateCache(ttl_seconds=token_cache_ttl) if token_cache_ttl > 0 else None
+        self._rules: List[AuthRule] = list(rules)
+        # Rules are bucketed by method once, so a request only tries the patterns that can apply to it
+        self._rules_by_method: Dict[str, List[AuthRule]] = {}
+        self._any_method_rules = [rule for rule in self._rules if rule.methods is None]
+        for method in {method for rule in self._rules for method in (rule.methods or ())}:
+            self._rules_by_method[method] = [
+                rule for rule in self._rules if rule.methods is None or method in rule.methods
+            ]
+
+    def match(self, method: str, path: str) -> Optional[AuthRule]:
+        for rule in self._rules_by_method.get(method, self._any_method_rules):
+            if rule.pattern.fullmatch(path):
+                return rule
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.match(scope["method"], scope["path"])
+        if rule is None or rule.authorizer is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        response = await self._authorize(rule, request)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    async def _authorize(self, rule: AuthRule, request: Request) -> Optional[Response]:
+        try:
+            auth_payload = await authenticate(request, self.token_cache)
+            response = await rule.authorizer(auth_payload, request)
+            if response is None:
+                logger.debug(f"Access granted for {request.method} {request.url.path}. User ID: {auth_payload.get('sub')}")
+            return response
+        except Unauthorized as e:
+            logger.warning(f"Unauthorized request: {request.method} {request.url.path} - {str(e)}")
+            return JSONResponse(status_code=401, content={"detail": str(e)})
+        except Exception as e:
+            logger.exception(f"Error in auth middleware: {e}")
+            return JSONResponse(status_code=500, content={"detail": self.error_detail})
+
+
+async def authenticate(request: Request, cache: Optional[TokenStateCache] = None) -> Dict[str, Any]:
+    """
+    Validates the Kong headers and the token state, then attaches the payload to the request state.
+    A request already authenticated earlier in the stack (e.g. by AuthMiddleware) is not checked again.
+    """
+    auth_payload = getattr(request.state, "user", None)
+    if auth_payload is not None:
+        return auth_payload
+
+    auth_payload = extract_kong_headers(request.headers)
+
+    # The singleton redis_manager is used directly; redis_manager.setup() runs in the app lifespan
+    try:
+        redis_client = redis_manager.client
+    except Exception:
+        redis_client = None
+
+    await validate_token_state(
+        user_id=auth_payload["sub"],
+        jti=auth_payload["jti"],
+        iat=auth_payload["iat"],
+        redis_client=redis_client,
+        check_blocklist=True,
+        cache=cache
+    )
+
+    request.state.user = auth_payload
+    request.state.user_id = auth_payload["sub"]
+    return auth_payload
@@ -1,19 +1,54 @@
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional, Tuple
 from shopping_shared.exceptions import Unauthorized
 from shopping_shared.caching.redis_keys import RedisKeys
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("AuthUtils")
 
+class TokenStateCache:
+    """
+    Short-lived, per-process memory of tokens that passed validate_token_state, so a burst of requests
+    with the same token costs one Redis round trip. Only successful checks are remembered: a revoked token
+    is rejected by every replica again within ttl_seconds, which bounds how late a revocation takes effect.
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._valid_until: Dict[Tuple[str, str, int, bool], float] = {}
+
+    def is_valid(self, key: Tuple[str, str, int, bool]) -> bool:
+        valid_until = self._valid_until.get(key)
+        if valid_until is None:
+            return False
+        if valid_until > time.monotonic():
+            return True
+        del self._valid_until[key]
+        return False
+
+    def remember(self, key: Tuple[str, str, int, bool]) -> None:
+        if len(self._valid_until) >= self.max_entries:
+            now = time.monotonic()
+            for expired in [k for k, valid_until in self._valid_until.items() if valid_until <= now]:
+                del self._valid_until[expired]
+            if len(self._valid_until) >= self.max_entries:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._valid_until[next(iter(self._valid_until))]
+        self._valid_until[key] = time.monotonic() + self.ttl_seconds
+
+
 async def validate_token_state(
     user_id: str,
     jti: str,
     iat: int,
     redis_client: Any,
-    check_blocklist: bool = True
+    check_blocklist: bool = True,
+    cache: Optional[TokenStateCache] = None
 ) -> None:
     """
     Validates the state of the token against Redis (Blocklist and Global Revoke).
+    Both keys are read with a single MGET.
     
     Args:
         user_id: The user ID from the token.
@@ -22,6 +57,7 @@ async def validate_token_state(
         redis_client: The Redis client instance.
         check_blocklist: Whether to check the blocklist (default: True).
                          Set to False for logout requests where we want to allow revoked tokens.
+        cache: Optional TokenStateCache; a token validated within its TTL skips Redis.
     
     Raises:
         Unauthorized: If the token is revoked or invalid.
@@ -30,37 +66,43 @@ async def validate_token_state(
         logger.warning("Redis client not available. Skipping state check (Degraded mode).")
         return
 
-    # 1. Check Blocklist
-    if check_blocklist:
-        try:
-            blocklist_key = RedisKeys.jwt_blocklist(jti)
-            is_blocked = await redis_client.get(blocklist_key)
-            if is_blocked:
-                logger.info(f"Token jti found in blocklist: {jti}")
-                raise Unauthorized("Access token has been revoked.")
-        except Unauthorized:
-            raise
-        except Exception as ex:
+    cache_key = (user_id, jti, iat, check_blocklist)
+    if cache is not None and cache.is_valid(cache_key):
+        return
+
+    revoke_key = RedisKeys.global_revoke(user_id)
+    try:
+        if check_blocklist:
+            is_blocked, global_revoke_ts_str = await redis_client.mget(RedisKeys.jwt_blocklist(jti), revoke_key)
+        else:
+            is_blocked, global_revoke_ts_str = None, await redis_client.get(revoke_key)
+    except Exception as ex:
+        if check_blocklist:
             logger.exception(f"Error checking token blocklist: {ex}")
             # Fail closed for blocklist checks
             raise Unauthorized("Failed to validate token.") from ex
+        # Log but fail open for global revoke (consistent with legacy behavior)
+        logger.exception(f"Failed to read global revoke timestamp for user {user_id}: {ex}")
+        return
+
+    # 1. Check Blocklist
+    if is_blocked:
+        logger.info(f"Token jti found in blocklist: {jti}")
+        raise Unauthorized("Access token has been revoked.")
 
     # 2. Check Global Revoke Timestamp
-    try:
-        revoke_key = RedisKeys.global_revoke(user_id)
-        global_revoke_ts_str = await redis_client.get(revoke_key)
-        
-        if global_revoke_ts_str:
+    if global_revoke_ts_str:
+        try:
             global_revoke_ts = int(global_revoke_ts_str)
+        except (ValueError, TypeError):
+            logger.exception(f"Invalid global revoke timestamp for user {user_id}: {global_revoke_ts_str!r}")
+        else:
             if iat < global_revoke_ts:
                 logger.info(f"Token iat {iat} older than global revoke {global_revoke_ts} for user {user_id}")
                 raise Unauthorized("Token has been revoked by a security event.")
-    except Unauthorized:
-        raise
-    except Exception as ex:
-        # Log but fail open for global revoke (consistent with legacy behavior), 
-        # or consider failing closed if stricter security is needed.
-        logger.exception(f"Failed to read global revoke timestamp for user {user_id}: {ex}")
+
+    if cache is not None:
+        cache.remember(cache_key)
 
 
 def extract_kong_headers(headers: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,212 @@
+# shared/shopping_shared/scheduling/job_coordinator.py
+import asyncio
+import functools
+import inspect
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, NamedTuple, Optional, Set
+
+from sqlalchemy import Integer, Text, cast, func
+from sqlalchemy.sql.elements import ColumnElement
+
+from shopping_shared.caching.redis_keys import RedisKeys
+from shopping_shared.caching.redis_manager import RedisManager
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("Job Coordinator")
+
+# Takes the lease when it is free, or extends it when this instance already holds it
+_ACQUIRE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current == false or current == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Deletes the lease only if this instance still holds it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class Shard(NamedTuple):
+    """The part of a sharded job one instance is responsible for: rows whose hash % count == index."""
+    index: int
+    count: int
+
+
+def shard_filter(column: Any, shard: Shard) -> ColumnElement[bool]:
+    """
+    SQL condition keeping the rows of `column` (typically group_id) that belong to `shard`.
+    Hashing happens in Postgres (hashtext), so every instance splits the key space the same way.
+    """
+    bucket = func.hashtext(cast(column, Text)).op("&", return_type=Integer)(0x7FFFFFFF)
+    return bucket % shard.count == shard.index
+
+
+async def _call(job: Callable, *args, **kwargs) -> Any:
+    if inspect.iscoroutinefunction(job):
+        return await job(*args, **kwargs)
+    # APScheduler runs plain functions in a thread pool; keep doing so behind the async wrapper
+    return await asyncio.to_thread(job, *args, **kwargs)
+
+
+class JobCoordinator:
+    """
+    Coordinates APScheduler jobs across every worker of every replica through Redis.
+    - exclusive(job): a lease elects a single runner per fire. The lease is re-entrant, so the holder keeps
+      running an interval job while it is alive, and it is left to expire after a cron run so instances
+      firing a little later (clock skew) still find it taken.
+    - sharded(job): every live instance runs the job for its own hash range of group ids. Instances heartbeat
+      into a sorted set; the first one to fire pins the member list for that run, so all agree on (index, count).
+    When Redis cannot be reached, a job runs unguarded if fail_open (the previous behaviour), otherwise it is skipped.
+    Usage:
+        scheduler.add_job(job_coordinator.exclusive(expire_plans, "expire_plans"), trigger=...)
+        scheduler.add_job(job_coordinator.sharded(publish_digests, "publish_digests"), trigger=...)
+    """
+
+    def __init__(
+        self,
+        redis_manager: RedisManager,
+        service: str,
+        heartbeat_interval: float = 10.0,
+        member_ttl: float = 30.0
+    ):
+        self._redis = redis_manager
+        self.service = service
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_interval = heartbeat_interval
+        self.member_ttl = member_ttl
+        self._leases: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Job coordinator started as {self.instance_id}")
+
+    async def stop(self) -> None:
+        """Stops heartbeating and hands leases over right away instead of waiting for them to expire."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            client = self._redis.client
+            await client.zrem(RedisKeys.scheduler_members(self.service), self.instance_id)
+            for key in self._leases:
+                await client.eval(_RELEASE_SCRIPT, 1, key, self.instance_id)
+        except Exception as e:
+            logger.warning(f"Could not deregister scheduler instance {self.instance_id}: {e}")
+        self._leases.clear()
+        logger.info("Job coordinator stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scheduler heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _heartbeat(self) -> None:
+        key = RedisKeys.scheduler_members(self.service)
+        now = time.time()
+        async with self._redis.client.pipeline(transaction=False) as pipe:
+            pipe.zadd(key, {self.instance_id: now})
+            pipe.zremrangebyscore(key, "-inf", now - self.member_ttl)
+            await pipe.execute()
+
+    async def _acquire(self, key: str, ttl_ms: int) -> bool:
+        return bool(await self._redis.client.eval(_ACQUIRE_SCRIPT, 1, key, self.instance_id, ttl_ms))
+
+    async def _keep_lease(self, key: str, ttl_ms: int, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(ttl_ms / 3000)
+            try:
+                if not await self._acquire(key, ttl_ms):
+                    logger.warning(f"Lease of {job_id} was lost while the job was running")
+                    return
+            except Exception as e:
+                logger.warning(f"Could not renew lease of {job_id}: {e}")
+
+    def exclusive(self, job: Callable, job_id: str, lease_ttl: float = 60.0, fail_open: bool = True) -> Callable:
+        """Wraps `job` so that only the instance holding its lease runs it."""
+        key = RedisKeys.scheduler_lease(self.service, job_id)
+        ttl_ms = int(lease_ttl * 1000)
+
+        @functools.wraps(job)
+        async def runner(*args, **kwargs):
+            try:
+                acquired = await self._acquire(key, ttl_ms)
+            except Exception as e:
+                if not fail_open:
+                    logger.warning(f"Skipping {job_id}: cannot reach Redis to take its lease ({e})")
+                    return None
+                logger.warning(f"Running {job_id} without a lease: cannot reach Redis ({e})")
+                return await _call(job, *args, **kwargs)
+
+            if not acquired:
+                logger.debug(f"Skipping {job_id}: lease held by another instance")
+                return None
+
+            self._leases.add(key)
+            keeper = asyncio.create_task(self._keep_lease(key, ttl_ms, job_id))
+            try:
+                return await _call(job, *args, **kwargs)
+            finally:
+                keeper.cancel()
+                await asyncio.gather(keeper, return_exceptions=True)
+
+        return runner
+
+    async def _claim_shard(self, job_id: str, plan_ttl: float) -> Optional[Shard]:
+        client = self._redis.client
+        # Count ourselves in even if the first heartbeat has not happened yet
+        await self._heartbeat()
+        live = await client.zrangebyscore(
+            RedisKeys.scheduler_members(self.service), time.time() - self.member_ttl, "+inf"
+        )
+        plan_key = RedisKeys.scheduler_shard_plan(self.service, job_id)
+        candidate = json.dumps(sorted(live))
+        await client.set(plan_key, candidate, nx=True, px=int(plan_ttl * 1000))
+        plan = json.loads(await client.get(plan_key) or candidate)
+        if self.instance_id not in plan:
+            return None
+        return Shard(index=plan.index(self.instance_id), count=len(plan))
+
+    def sharded(self, job: Callable, job_id: str, plan_ttl: float = 60.0, fail_open: bool = True) -> Callable:
+        """
+        Wraps `job` so each live instance runs it with its own `shard` keyword argument.
+        plan_ttl must cover the clock skew between instances and stay below the job's interval.
+        """
+
+        @functools.wraps(job)
+        async def runner(*args, **kwargs):
+            try:
+                shard = await self._claim_shard(job_id, plan_ttl)
+            except Exception as e:
+                if not fail_open:
+                    logger.warning(f"Skipping {job_id}: cannot reach Redis to get a shard ({e})")
+                    return None
+                logger.warning(f"Running {job_id} unsharded: cannot reach Redis ({e})")
+                shard = Shard(index=0, count=1)
+
+            if shard is None:
+                logger.info(f"Skipping {job_id}: instance joined after this run was sharded")
+                return None
+
+            logger.info(f"Running {job_id} as shard {shard.index + 1}/{shard.count}")
+            return await _call(job, *args, shard=shard, **kwargs)
+
+        return runner
@@ -13,8 +13,11 @@ from models.shopping_plan import (
     ShoppingPlan, Report
 )
 from models.storage import (
-    StorableUnit, Storage
+    StorableUnit, Storage, StackedUnit
 )
+from models.outbox import OutboxEvent
+from models.component_existence import ComponentExistenceDirty, ComponentExistenceVersion
+from models.group_stats import DailyGroupStats, MonthlyGroupStats
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -0,0 +1,120 @@
+"""partition storable_units by group_id
+
+Revision ID: a7c9e1f3b568
+Revises: f6b8d0e2a457
+Create Date: 2026-10-19 15:42:07.318594
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1f3b568'
+down_revision: Union[str, Sequence[str], None] = 'f6b8d0e2a457'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match models.storage.STORABLE_UNIT_PARTITIONS
+PARTITIONS = 16
+
+INDEXES = [
+    ('ix_storable_units_storage_id', ['storage_id']),
+    ('ix_storable_units_unit_name', ['unit_name']),
+    ('ix_storable_units_component_id', ['component_id']),
+    ('ix_storable_units_expiration_date', ['expiration_date']),
+]
+
+
+def _columns(with_group: bool) -> list:
+    columns = [
+        sa.Column('unit_id', sa.Integer(), server_default=sa.text("nextval('storable_units_unit_id_seq'::regclass)"), nullable=False),
+        sa.Column('storage_id', sa.Integer(), nullable=False),
+        sa.Column('package_quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_name', sa.String(), nullable=False),
+        sa.Column('component_id', sa.Integer(), nullable=True),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('content_quantity', sa.Float(), nullable=True),
+        sa.Column('content_unit', postgresql.ENUM('G', 'ML', name='ucmeasurementunit', create_type=False), nullable=True),
+        sa.Column('added_date', sa.Date(), nullable=False),
+        sa.Column('expiration_date', sa.Date(), nullable=True),
+    ]
+    if with_group:
+        columns.insert(1, sa.Column('group_id', sa.UUID(), nullable=False))
+    return columns
+
+
+def _constraints() -> list:
+    return [
+        sa.CheckConstraint("(content_type = 'countable_ingredient' AND  content_quantity IS NULL AND content_unit IS NULL) OR (content_type = 'uncountable_ingredient' AND  content_quantity IS NOT NULL AND content_unit IS NOT NULL)", name='quantity_unit_required_for_measurable'),
+        sa.CheckConstraint('(component_id IS NULL AND content_type IS NULL) OR (component_id IS NOT NULL AND content_type IS NOT NULL)', name='component_id_type_pairing'),
+        sa.ForeignKeyConstraint(['storage_id'], ['storages.storage_id'], ),
+    ]
+
+
+def _swap_table() -> None:
+    # Index and primary key names are schema-wide, so the old table's must be moved out of the way first
+    op.execute("ALTER TABLE storable_units RENAME TO storable_units_old")
+    op.execute("ALTER INDEX storable_units_pkey RENAME TO storable_units_old_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='storable_units_old')
+
+
+def _finish_swap() -> None:
+    # The sequence is owned by the old unit_id column and would be dropped with it
+    op.execute("ALTER SEQUENCE storable_units_unit_id_seq OWNED BY storable_units.unit_id")
+    op.drop_table('storable_units_old')
+    for name, columns in INDEXES:
+        op.create_index(name, 'storable_units', columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _swap_table()
+    op.create_table('storable_units',
+    *_columns(with_group=True),
+    *_constraints(),
+    sa.PrimaryKeyConstraint('unit_id', 'group_id', name='storable_units_pkey'),
+    postgresql_partition_by='HASH (group_id)'
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE storable_units_p{remainder} PARTITION OF storable_units "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute("""
+        INSERT INTO storable_units (
+            unit_id, group_id, storage_id, package_quantity, unit_name, component_id,
+            content_type, content_quantity, content_unit, added_date, expiration_date
+        )
+        SELECT u.unit_id, s.group_id, u.storage_id, u.package_quantity, u.unit_name, u.component_id,
+               u.content_type, u.content_quantity, u.content_unit, u.added_date, u.expiration_date
+        FROM storable_units_old u
+        JOIN storages s ON s.storage_id = u.storage_id
+    """)
+    _finish_swap()
+    op.create_index('ix_storable_units_group_id_unit_name', 'storable_units', ['group_id', 'unit_name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_storable_units_group_id_unit_name', table_name='storable_units')
+    _swap_table()
+    op.create_table('storable_units',
+    *_columns(with_group=False),
+    *_constraints(),
+    sa.PrimaryKeyConstraint('unit_id', name='storable_units_pkey')
+    )
+    op.execute("""
+        INSERT INTO storable_units (
+            unit_id, storage_id, package_quantity, unit_name, component_id,
+            content_type, content_quantity, content_unit, added_date, expiration_date
+        )
+        SELECT unit_id, storage_id, package_quantity, unit_name, component_id,
+               content_type, content_quantity, content_unit, added_date, expiration_date
+        FROM storable_units_old
+    """)
+    _finish_swap()
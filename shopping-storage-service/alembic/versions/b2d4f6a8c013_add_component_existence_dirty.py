@@ -0,0 +1,35 @@
+"""add component existence dirty
+
+Revision ID: b2d4f6a8c013
+Revises: a1c3e5f7b901
+Create Date: 2026-10-19 10:03:17.224871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c013'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f7b901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('component_existence_dirty',
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    sa.Column('unit_name', sa.String(), nullable=False),
+    sa.Column('dirty_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('group_id', 'unit_name')
+    )
+    op.create_index(op.f('ix_component_existence_dirty_dirty_at'), 'component_existence_dirty', ['dirty_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_component_existence_dirty_dirty_at'), table_name='component_existence_dirty')
+    op.drop_table('component_existence_dirty')
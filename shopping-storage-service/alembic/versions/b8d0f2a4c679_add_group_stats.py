@@ -0,0 +1,78 @@
+"""add daily and monthly group stats
+
+Revision ID: b8d0f2a4c679
+Revises: a7c9e1f3b568
+Create Date: 2026-10-19 16:20:44.905126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d0f2a4c679'
+down_revision: Union[str, Sequence[str], None] = 'a7c9e1f3b568'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_stats_table(name: str) -> None:
+    op.create_table(name,
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('spent_amount', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('items_bought', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('items_consumed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('items_expired', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('group_id', 'period_start')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_stats_table('daily_group_stats')
+    _create_stats_table('monthly_group_stats')
+
+    # Backfill from history that still exists: ingested reports and units past their expiration date.
+    # Past consumption was never recorded, so items_consumed starts at zero.
+    op.execute("""
+        INSERT INTO daily_group_stats (group_id, period_start, spent_amount)
+        SELECT p.group_id, r.report_date::date, SUM(r.spent_amount)
+        FROM reports r
+        JOIN shopping_plans p ON p.plan_id = r.plan_id
+        WHERE r.ingested_at IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    op.execute("""
+        INSERT INTO daily_group_stats (group_id, period_start, items_bought)
+        SELECT s.group_id, r.report_date::date, SUM(COALESCE((item->>'package_quantity')::int, 1))
+        FROM reports r
+        CROSS JOIN LATERAL jsonb_array_elements(r.report_content) AS item
+        JOIN storages s ON s.storage_id = (item->>'storage_id')::int
+        WHERE r.ingested_at IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (group_id, period_start) DO UPDATE SET items_bought = EXCLUDED.items_bought
+    """)
+    op.execute("""
+        INSERT INTO daily_group_stats (group_id, period_start, items_expired)
+        SELECT group_id, expiration_date, SUM(package_quantity)
+        FROM storable_units
+        WHERE expiration_date <= CURRENT_DATE
+        GROUP BY 1, 2
+        ON CONFLICT (group_id, period_start) DO UPDATE SET items_expired = EXCLUDED.items_expired
+    """)
+    op.execute("""
+        INSERT INTO monthly_group_stats (group_id, period_start, spent_amount, items_bought, items_consumed, items_expired)
+        SELECT group_id, date_trunc('month', period_start)::date,
+               SUM(spent_amount), SUM(items_bought), SUM(items_consumed), SUM(items_expired)
+        FROM daily_group_stats
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_group_stats')
+    op.drop_table('daily_group_stats')
@@ -0,0 +1,59 @@
+"""add stacked units
+
+Revision ID: c3e5a7b9d124
+Revises: b2d4f6a8c013
+Create Date: 2026-10-19 11:26:02.731954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d124'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6a8c013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stacked_units',
+    sa.Column('stack_id', sa.Integer(), nullable=False),
+    sa.Column('storage_id', sa.Integer(), nullable=False),
+    sa.Column('unit_name', sa.String(), nullable=False),
+    sa.Column('component_id', sa.Integer(), nullable=True),
+    sa.Column('content_type', sa.String(), nullable=True),
+    sa.Column('content_quantity', sa.Float(), nullable=True),
+    sa.Column('content_unit', postgresql.ENUM('G', 'ML', name='ucmeasurementunit', create_type=False), nullable=True),
+    sa.Column('package_quantity', sa.Integer(), nullable=False),
+    sa.Column('batch_count', sa.Integer(), nullable=False),
+    sa.Column('earliest_expiration', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['storage_id'], ['storages.storage_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('stack_id'),
+    sa.UniqueConstraint('storage_id', 'unit_name', 'component_id', 'content_type', 'content_quantity', 'content_unit',
+                        name='uq_stacked_units_stack_key', postgresql_nulls_not_distinct=True)
+    )
+    op.create_index('ix_stacked_units_storage_id_stack_id', 'stacked_units', ['storage_id', 'stack_id'], unique=False)
+
+    # Backfill from the existing units, oldest stacks first so stack_id follows the old min(unit_id) ordering
+    op.execute("""
+        INSERT INTO stacked_units (
+            storage_id, unit_name, component_id, content_type, content_quantity, content_unit,
+            package_quantity, batch_count, earliest_expiration
+        )
+        SELECT storage_id, unit_name, component_id, content_type, content_quantity, content_unit,
+               sum(package_quantity), count(*), min(expiration_date)
+        FROM storable_units
+        GROUP BY storage_id, unit_name, component_id, content_type, content_quantity, content_unit
+        ORDER BY min(unit_id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_stacked_units_storage_id_stack_id', table_name='stacked_units')
+    op.drop_table('stacked_units')
@@ -0,0 +1,44 @@
+"""add jsonb_path_ops indexes on shopping lists and report contents
+
+Revision ID: c9e1a3b5d780
+Revises: b8d0f2a4c679
+Create Date: 2026-10-19 16:51:12.447013
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b5d780'
+down_revision: Union[str, Sequence[str], None] = 'b8d0f2a4c679'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_shopping_plans_shopping_list_path_ops',
+        'shopping_plans',
+        ['shopping_list'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'shopping_list': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_reports_report_content_path_ops',
+        'reports',
+        ['report_content'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'report_content': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reports_report_content_path_ops', table_name='reports')
+    op.drop_index('ix_shopping_plans_shopping_list_path_ops', table_name='shopping_plans')
@@ -0,0 +1,30 @@
+"""add active plan deadline index
+
+Revision ID: d4f6b8c0e235
+Revises: c3e5a7b9d124
+Create Date: 2026-10-19 13:41:55.093617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c0e235'
+down_revision: Union[str, Sequence[str], None] = 'c3e5a7b9d124'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_shopping_plans_active_deadline', 'shopping_plans', ['deadline'], unique=False,
+                    postgresql_where=sa.text("plan_status IN ('CREATED', 'IN_PROGRESS')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_shopping_plans_active_deadline', table_name='shopping_plans',
+                  postgresql_where=sa.text("plan_status IN ('CREATED', 'IN_PROGRESS')"))
@@ -0,0 +1,32 @@
+"""add component existence versions
+
+Revision ID: e1f3a5c7b942
+Revises: c9e1a3b5d780
+Create Date: 2026-10-19 21:14:36.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a5c7b942'
+down_revision: Union[str, Sequence[str], None] = 'c9e1a3b5d780'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('component_existence_versions',
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('group_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('component_existence_versions')
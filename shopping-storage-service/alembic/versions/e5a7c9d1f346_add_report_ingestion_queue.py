@@ -0,0 +1,39 @@
+"""add report ingestion queue
+
+Revision ID: e5a7c9d1f346
+Revises: d4f6b8c0e235
+Create Date: 2026-10-19 14:22:07.518342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d1f346'
+down_revision: Union[str, Sequence[str], None] = 'd4f6b8c0e235'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reports', sa.Column('ingested_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('reports', sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('reports', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('reports', sa.Column('last_error', sa.Text(), nullable=True))
+    # Existing reports were already handled by the old background task; don't ingest them twice
+    op.execute("UPDATE reports SET ingested_at = COALESCE(report_date, now())")
+    op.create_index('ix_reports_pending', 'reports', ['available_at', 'report_id'], unique=False,
+                    postgresql_where=sa.text('ingested_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reports_pending', table_name='reports', postgresql_where=sa.text('ingested_at IS NULL'))
+    op.drop_column('reports', 'last_error')
+    op.drop_column('reports', 'attempts')
+    op.drop_column('reports', 'available_at')
+    op.drop_column('reports', 'ingested_at')
@@ -1,6 +1,6 @@
 from contextlib import asynccontextmanager
-from core.database import engine, Base
-from core.messaging import kafka_manager
+from core.database import engine, Base, database_manager
+from core.messaging import kafka_manager, outbox_relay
 from core.config import settings
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,7 +8,11 @@ from fastapi.responses import HTMLResponse
 from apis.v1.plan_api import plan_router
 from apis.v1.storage_api import storage_router
 from apis.v1.storable_unit_api import storable_unit_router
-from tasks.scheduler import setup_scheduler
+from apis.v1.export_api import export_router
+from apis.v1.group_stats_api import group_stats_router
+from tasks.scheduler import setup_scheduler, job_coordinator
+from services.component_existence_publisher import component_existence_publisher
+from services.report_ingestor import report_ingestor
 from shopping_shared.caching.redis_manager import redis_manager
 from shopping_shared.utils.logger_utils import get_logger
 
@@ -26,7 +30,15 @@ async def lifespan(app: FastAPI):
             db=settings.REDIS_DB,
             password=settings.REDIS_PASSWORD
         )
+        await database_manager.setup(
+            database_uri=settings.ASYNC_DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW
+        )
         kafka_manager.setup(bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS)
+        outbox_relay.start()
+        component_existence_publisher.start()
+        report_ingestor.start()
         scheduler = setup_scheduler()
         scheduler.start()
         logger.info("Shopping Storage Service started successfully")
@@ -39,8 +51,13 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Shopping Storage Service...")
     try:
         scheduler.shutdown()
+        await job_coordinator.stop()
+        await report_ingestor.stop()
+        await component_existence_publisher.stop()
+        await outbox_relay.stop()
         await kafka_manager.close()
         await redis_manager.close()
+        await database_manager.dispose()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}", exc_info=True)
     
@@ -95,6 +112,8 @@ async def custom_swagger_ui_html(request: Request):
 app.include_router(plan_router)
 app.include_router(storage_router)
 app.include_router(storable_unit_router)
+app.include_router(export_router)
+app.include_router(group_stats_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+from uuid import UUID
+from sqlalchemy import Select
+from enums.export_format import ExportFormat
+from services.exporter import (
+    MEDIA_TYPES, stream_export, storable_units_export, shopping_plans_export, reports_export
+)
+
+export_router = APIRouter(
+    prefix="/v1/exports",
+    tags=["exports"]
+)
+
+
+def _export_response(dataset: str, stmt: Select, group_id: UUID, export_format: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(stmt, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}-{group_id}.{export_format.value}"'}
+    )
+
+
+@export_router.get(
+    "/storable_units",
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Stream every StorableUnit of a group (with its storage name) as NDJSON or CSV, in unit_id order. "
+        "Rows are streamed as they are read, so the whole inventory exports in one request."
+    )
+)
+async def export_storable_units(
+    group_id: UUID = Query(..., description="Group whose inventory is exported"),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Output format")
+):
+    return _export_response("storable_units", storable_units_export(group_id), group_id, format)
+
+
+@export_router.get(
+    "/shopping_plans",
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Stream every ShoppingPlan of a group as NDJSON or CSV, in plan_id order. "
+        "In CSV, shopping_list and others are embedded as JSON text."
+    )
+)
+async def export_shopping_plans(
+    group_id: UUID = Query(..., description="Group whose plans are exported"),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Output format")
+):
+    return _export_response("shopping_plans", shopping_plans_export(group_id), group_id, format)
+
+
+@export_router.get(
+    "/reports",
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Stream every completion Report of a group's plans as NDJSON or CSV, in report_id order. "
+        "In CSV, report_content is embedded as JSON text."
+    )
+)
+async def export_reports(
+    group_id: UUID = Query(..., description="Group whose plan reports are exported"),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Output format")
+):
+    return _export_response("reports", reports_export(group_id), group_id, format)
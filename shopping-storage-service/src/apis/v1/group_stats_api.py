@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.orm import Session
+from models.group_stats import DailyGroupStats, MonthlyGroupStats
+from schemas.group_stats_schemas import GroupStatsResponse
+from services.group_stats_service import list_group_stats
+from shopping_shared.schemas.cursor_pagination_schema import GenericResponse
+from core.database import get_db
+
+group_stats_router = APIRouter(
+    prefix="/v1/group_stats",
+    tags=["group_stats"]
+)
+
+MAX_DAYS = 366
+MAX_MONTHS = 120
+
+
+def _check_range(start: date, end: date, span: int, max_span: int, unit: str) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if span > max_span:
+        raise HTTPException(status_code=400, detail=f"Range must not exceed {max_span} {unit}")
+
+
+@group_stats_router.get(
+    "/daily",
+    response_model=GenericResponse[List[GroupStatsResponse]],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Daily spending and food-waste stats of a group: spent amount, packages bought (from plan reports), "
+        "consumed and expired. Defaults to the last 30 days; days without activity are omitted."
+    )
+)
+def get_daily_stats(
+    group_id: UUID = Query(..., description="Group ID"),
+    start_date: Optional[date] = Query(None, description="First day (inclusive), defaults to 29 days before end_date"),
+    end_date: Optional[date] = Query(None, description="Last day (inclusive), defaults to today"),
+    db: Session = Depends(get_db)
+):
+    end = end_date or date.today()
+    start = start_date or end - timedelta(days=29)
+    _check_range(start, end, (end - start).days + 1, MAX_DAYS, "days")
+    rows = list_group_stats(db, DailyGroupStats, group_id, start, end)
+    return GenericResponse(data=[GroupStatsResponse.model_validate(row) for row in rows])
+
+
+@group_stats_router.get(
+    "/monthly",
+    response_model=GenericResponse[List[GroupStatsResponse]],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Monthly spending and food-waste stats of a group; period_start is the first day of the month. "
+        "Defaults to the last 12 months; months without activity are omitted."
+    )
+)
+def get_monthly_stats(
+    group_id: UUID = Query(..., description="Group ID"),
+    start_date: Optional[date] = Query(None, description="Any day of the first month, defaults to 11 months before end_date"),
+    end_date: Optional[date] = Query(None, description="Any day of the last month, defaults to today"),
+    db: Session = Depends(get_db)
+):
+    end = (end_date or date.today()).replace(day=1)
+    if start_date is not None:
+        start = start_date.replace(day=1)
+    else:
+        months_back = end.year * 12 + end.month - 1 - 11
+        start = date(months_back // 12, months_back % 12 + 1, 1)
+    _check_range(start, end, (end.year - start.year) * 12 + end.month - start.month + 1, MAX_MONTHS, "months")
+    rows = list_group_stats(db, MonthlyGroupStats, group_id, start, end)
+    return GenericResponse(data=[GroupStatsResponse.model_validate(row) for row in rows])
@@ -1,13 +1,14 @@
 from datetime import datetime
-from fastapi import APIRouter, status, Depends, Body, BackgroundTasks, Query, Path
+from fastapi import APIRouter, status, Depends, Body, Query, Path, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect
-from typing import Any, Optional
+from typing import Any, List, Optional
 from uuid import UUID
 from services.plan_crud import PlanCRUD
 from services.plan_transition import PlanTransition
-from services.report_process import report_process
-from schemas.plan_schemas import PlanCreate, PlanUpdate, PlanResponse, PlanReport
+from schemas.plan_schemas import (
+    PlanCreate, PlanUpdate, PlanResponse, PlanReport, PatchOperation, ComponentPurchaseResponse
+)
 from models.shopping_plan import ShoppingPlan
 from enums.plan_status import PlanStatus
 from shopping_shared.schemas.cursor_pagination_schema import GenericResponse, CursorPaginationResponse
@@ -59,6 +60,40 @@ def filter_plans(
         size=len(plans),
     )
 
+@plan_router.get(
+    "/by_component",
+    response_model=GenericResponse[List[PlanResponse]],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "List the group's active (created / in progress) plans whose shopping list includes the component, "
+        "soonest deadline first. Use it to avoid planning the same purchase twice."
+    )
+)
+def get_active_plans_with_component(
+    group_id: UUID = Query(..., description="Group ID"),
+    component_id: int = Query(..., ge=0, description="Component ID"),
+    db: Session = Depends(get_db)
+):
+    plans = plan_crud.find_active_with_component(db, group_id, component_id)
+    return GenericResponse(data=[PlanResponse.model_validate(plan) for plan in plans])
+
+@plan_router.get(
+    "/purchases",
+    response_model=GenericResponse[List[ComponentPurchaseResponse]],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "List the group's latest completed plan reports that bought the component, newest first, "
+        "each narrowed to that component's items. limit=1 answers 'when did we last buy it'."
+    )
+)
+def get_component_purchases(
+    group_id: UUID = Query(..., description="Group ID"),
+    component_id: int = Query(..., ge=0, description="Component ID"),
+    limit: int = Query(1, ge=1, le=100, description="Maximum number of purchases to return"),
+    db: Session = Depends(get_db)
+):
+    return GenericResponse(data=plan_crud.get_component_purchases(db, group_id, component_id, limit))
+
 crud_router = create_crud_router(
     model=ShoppingPlan,
     crud_base=plan_crud,
@@ -70,6 +105,39 @@ crud_router = create_crud_router(
 plan_router.include_router(crud_router)
 
 
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Reads the plan version from an If-Match header ("3", W/"3" or *)."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail=f"Invalid If-Match header: {if_match!r}")
+    return int(tag)
+
+
+@plan_router.patch(
+    "/{id}",
+    response_model=PlanResponse,
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Partially update an active shopping plan with RFC 6902 JSON Patch operations on /shopping_list and /others. "
+        "The patch is applied atomically by the database. "
+        "Send the plan version as If-Match to reject the patch (412) if the plan changed since it was read; "
+        "the new version is returned in the ETag header."
+    )
+)
+def patch_plan(
+    response: Response,
+    id: int = Path(..., ge=1),
+    operations: List[PatchOperation] = Body(..., min_length=1, max_length=100, description="JSON Patch operations"),
+    if_match: Optional[str] = Header(None, alias="If-Match", description="Expected plan version (ETag)"),
+    db: Session = Depends(get_db)
+):
+    plan = plan_crud.patch(db, id, operations, expected_version=parse_if_match(if_match))
+    response.headers["ETag"] = f'"{plan.version}"'
+    return plan
+
+
 @plan_router.post(
     "/{id}/assign",
     response_model=PlanResponse,
@@ -80,13 +148,13 @@ plan_router.include_router(crud_router)
         "After assignment, the plan status will be IN_PROGRESS."
     )
 )
-async def assign_plan(
+def assign_plan(
     id: int = Path(..., ge=1),
     assignee_id: UUID = Query(..., description="The UUID of the user to assign the plan to"),
     assignee_username: str = Query(..., description="Username of the assignee (temporary required field)"),
     db: Session = Depends(get_db)
 ):
-    return await plan_transition.assign(db, id, assignee_id, assignee_username)
+    return plan_transition.assign(db, id, assignee_id, assignee_username)
 
 
 @plan_router.post(
@@ -134,11 +202,10 @@ def cancel_plan(
         "The plan status must be IN_PROGRESS and the assignee_id must match. "
         "If confirm=False, will validate the report content against the shopping list and complete the plan only if all required items are reported. "
         "If confirm=True, immediately complete the plan without validation. The plan status will be COMPLETED. "
-        "After successful report, items from report_content will be added to their respective storages as StorableUnits."
+        "After successful report, items from report_content are queued and added to their respective storages as StorableUnits shortly after."
     )
 )
-async def report_plan(
-    background_tasks: BackgroundTasks,
+def report_plan(
     id: int = Path(..., ge=1),
     report: PlanReport = Body(..., description="Report data containing the items purchased"),
     db: Session = Depends(get_db),
@@ -146,9 +213,7 @@ async def report_plan(
     assignee_username: str = Query(..., description="Username of the assignee (temporary required field)"),
     confirm: bool = Query(True, description="If True, immediately complete without validation. If False, validate report content first")
 ):
-    is_completed, message, data = await plan_transition.report(db, id, assignee_id, assignee_username, report, confirm)
-    if is_completed:
-        background_tasks.add_task(report_process, report)
+    is_completed, message, data = plan_transition.report(db, id, assignee_id, assignee_username, report, confirm)
     return GenericResponse(message=message, data=data)
 
 @plan_router.post(
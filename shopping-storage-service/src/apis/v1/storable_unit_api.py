@@ -4,7 +4,10 @@ from sqlalchemy import inspect
 from typing import Optional, List
 from uuid import UUID
 from services.storable_unit_crud import StorableUnitCRUD
-from schemas.storable_unit_schemas import StorableUnitCreate, StorableUnitUpdate, StorableUnitResponse, StorableUnitStackedResponse
+from schemas.storable_unit_schemas import (
+    StorableUnitCreate, StorableUnitUpdate, StorableUnitResponse, StorableUnitStackedResponse, BatchItem,
+    BatchConsumeRequest, ConsumedItemResponse, StockRequest, ComponentStockResponse
+)
 from models.storage import StorableUnit
 from shopping_shared.schemas.cursor_pagination_schema import GenericResponse, CursorPaginationResponse
 from core.database import get_db
@@ -50,24 +53,40 @@ def filter_units(
     "/stacked",
     response_model=CursorPaginationResponse[StorableUnitStackedResponse],
     status_code=status.HTTP_200_OK,
-    description="Retrieve a list of stacked StorableUnits. Units are grouped by common fields (unit_name, storage_id, component_id, content_type, content_quantity, content_unit). Supports pagination with cursor and limit."
+    description=(
+        "Retrieve a list of stacked StorableUnits. Units are grouped by common fields (unit_name, storage_id, component_id, content_type, content_quantity, content_unit). "
+        "Each stack carries its total quantity, batch count and earliest expiration; batches are fetched via /stacked/{stack_id}/batches. "
+        "Supports pagination with cursor and limit."
+    )
 )
 def get_stacked_units(
     storage_id: int = Query(..., ge=1, description="The storage ID to get stacked units from"),
-    cursor: Optional[int] = Query(None, ge=0, description="Cursor for pagination (ID of the last item from previous page)"),
+    cursor: Optional[int] = Query(None, ge=0, description="Cursor for pagination (stack_id of the last item from previous page)"),
     limit: int = Query(100, ge=1, description="Maximum number of results to return"),
     db: Session = Depends(get_db)
 ):
-    storable_units = storable_unit_crud.get_stacked(db, storage_id, cursor, limit)
-    data = [StorableUnitStackedResponse(**unit) for unit in storable_units]
-    next_cursor = storable_units[-1]["row_num"] if storable_units and len(storable_units) == limit else None
+    stacks = storable_unit_crud.get_stacked(db, storage_id, cursor, limit)
+    next_cursor = stacks[-1].stack_id if stacks and len(stacks) == limit else None
     return CursorPaginationResponse(
-        data=data,
+        data=[StorableUnitStackedResponse.model_validate(stack) for stack in stacks],
         next_cursor=next_cursor,
-        size=len(storable_units)
+        size=len(stacks)
     )
 
 
+@storable_unit_router.get(
+    "/stacked/{stack_id}/batches",
+    response_model=GenericResponse[List[BatchItem]],
+    status_code=status.HTTP_200_OK,
+    description="Retrieve the batches of a stack, oldest expiration first. Returns 404 if the stack does not exist."
+)
+def get_stack_batches(stack_id: int = Path(..., ge=1), db: Session = Depends(get_db)):
+    batches = storable_unit_crud.get_stack_batches(db, stack_id)
+    if batches is None:
+        raise HTTPException(status_code=404, detail=f"Stack with id={stack_id} not found")
+    return GenericResponse(data=[BatchItem.model_validate(batch) for batch in batches])
+
+
 @storable_unit_router.get(
     "/{id}",
     response_model=StorableUnitResponse,
@@ -107,10 +126,10 @@ def get_many_units(
     status_code=status.HTTP_201_CREATED,
     description="Create a new StorableUnit."
 )
-async def create_unit(
+def create_unit(
         obj_in: StorableUnitCreate = Body(..., description="Data to create a new StorableUnit"),
         db: Session = Depends(get_db)):
-    return await storable_unit_crud.create(db, obj_in)
+    return storable_unit_crud.create(db, obj_in)
 
 
 @storable_unit_router.put(
@@ -140,14 +159,48 @@ def update_unit(
         "Returns 400 if the requested quantity exceeds available quantity."
     )
 )
-async def consume_unit(
+def consume_unit(
     id: int = Path(..., ge=1),
     consume_quantity: int = Query(..., ge=1, description="The quantity to consume"),
     db: Session = Depends(get_db)
 ):
-    message, storable_unit = await storable_unit_crud.consume(db, id, consume_quantity)
+    message, storable_unit = storable_unit_crud.consume(db, id, consume_quantity)
     return GenericResponse(
         message=message,
         data=StorableUnitResponse.model_validate(storable_unit) if storable_unit else None
     )
 
+
+@storable_unit_router.post(
+    "/consume",
+    response_model=GenericResponse[List[ConsumedItemResponse]],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Consume several items of a group at once (e.g. the ingredients of a recipe). "
+        "Each item targets a component_id or a unit_name and is drawn down across matching units, oldest expiration first. "
+        "Units reaching zero are deleted. "
+        "Returns 400 without consuming anything if any item exceeds the available quantity."
+    )
+)
+def consume_units(
+    request: BatchConsumeRequest = Body(..., description="Group and items to consume"),
+    db: Session = Depends(get_db)
+):
+    results = storable_unit_crud.consume_batch(db, request.group_id, request.items)
+    return GenericResponse(message="Consumed", data=results)
+
+
+@storable_unit_router.post(
+    "/stock",
+    response_model=GenericResponse[List[ComponentStockResponse]],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Unexpired stock of a group for a batch of components (e.g. to diff a meal plan against the inventory). "
+        "Returns one entry per component and content unit; components the group does not hold are omitted."
+    )
+)
+def get_stock(
+    request: StockRequest = Body(..., description="Group and components to look up"),
+    db: Session = Depends(get_db)
+):
+    return GenericResponse(data=storable_unit_crud.stock_levels(db, request.group_id, request.component_ids))
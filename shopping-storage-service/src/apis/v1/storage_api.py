@@ -4,7 +4,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect
 from services.storage_crud import StorageCRUD
-from schemas.storage_schemas import StorageCreate, StorageUpdate, StorageResponse
+from schemas.storage_schemas import StorageCreate, StorageUpdate, StorageResponse, StorageSummaryResponse
 from models.storage import Storage
 from enums.storage_type import StorageType
 from shopping_shared.schemas.cursor_pagination_schema import CursorPaginationResponse
@@ -46,6 +46,40 @@ def filter_storages(
         size=len(storages)
     )
 
+@storage_router.get(
+    "/summary",
+    response_model=CursorPaginationResponse[StorageSummaryResponse],
+    status_code=status.HTTP_200_OK,
+    description=(
+        "List storages with aggregates of their units instead of the full unit lists: number of batches and packages, "
+        "distinct items, earliest expiration, and how many batches are expired or expire within expiring_within_days. "
+        "Units of a storage are fetched page by page via /v1/storable_units/filter?storage_id=. "
+        "Supports pagination with cursor and limit."
+    )
+)
+def summarize_storages(
+    group_id: Optional[UUID] = Query(None, description="Filter by group ID"),
+    storage_type: Optional[StorageType] = Query(None, description="Filter by storage type"),
+    expiring_within_days: int = Query(3, ge=0, le=365, description="Window for expiring_soon_count, in days from today"),
+    cursor: Optional[int] = Query(None, ge=0, description="Cursor for pagination (ID of the last item from previous page)"),
+    limit: int = Query(100, ge=1, description="Maximum number of results to return"),
+    db: Session = Depends(get_db)
+):
+    summaries = storage_crud.summarize(
+        db,
+        group_id=group_id,
+        storage_type=storage_type,
+        expiring_within_days=expiring_within_days,
+        cursor=cursor,
+        limit=limit
+    )
+    next_cursor = summaries[-1].storage_id if summaries and len(summaries) == limit else None
+    return CursorPaginationResponse(
+        data=[StorageSummaryResponse.model_validate(summary) for summary in summaries],
+        next_cursor=next_cursor,
+        size=len(summaries)
+    )
+
 crud_router = create_crud_router(
     model=Storage,
     crud_base=storage_crud,
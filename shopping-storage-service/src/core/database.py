@@ -1,9 +1,15 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from shopping_shared.databases.database_manager import DatabaseManager
 from .config import settings
 
 # Create engine using database URL from settings
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -12,4 +18,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async engine/sessions for AsyncCRUDBase-based routes and background workers.
+# Initialized in the app lifespan via database_manager.setup(settings.ASYNC_DATABASE_URL, ...)
+database_manager = DatabaseManager()
+get_async_db = database_manager.get_db
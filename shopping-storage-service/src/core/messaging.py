@@ -1,4 +1,7 @@
 from shopping_shared.messaging.kafka_manager import KafkaManager
+from shopping_shared.messaging.outbox import OutboxRelay
+from core.database import database_manager
+from models.outbox import OutboxEvent
 
 kafka_manager = KafkaManager()
-
+outbox_relay = OutboxRelay(OutboxEvent, database_manager, kafka_manager)
@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from core.database import Base
+
+class ComponentExistenceDirty(Base):
+    """Unit names whose existence changed in a group and still have to be published as a delta."""
+    __tablename__ = "component_existence_dirty"
+
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    unit_name: Mapped[str] = mapped_column(String, primary_key=True)
+    dirty_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+
+class ComponentExistenceVersion(Base):
+    """Per-group counter stamped on every published delta, so consumers can order them per unit name."""
+    __tablename__ = "component_existence_versions"
+
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,81 @@
+import uuid
+from datetime import date
+from typing import Optional
+from sqlalchemy import Integer, Date, select, func, literal, Select
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Mapped, mapped_column
+from core.database import Base
+from models.storage import StorableUnit
+from shopping_shared.scheduling.job_coordinator import Shard, shard_filter
+
+"""
+    Per-group spending and food-waste rollups, kept up to date by the writes that produce the data
+    (report ingestion, consumption, the daily expiry task) so dashboards read a few precomputed rows.
+    Counters are in packages. Monthly rows are keyed by the first day of the month.
+"""
+
+class GroupStatsMixin:
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    spent_amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    items_bought: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    items_consumed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Packages still stored on the day they expire
+    items_expired: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+class DailyGroupStats(GroupStatsMixin, Base):
+    __tablename__ = "daily_group_stats"
+
+
+class MonthlyGroupStats(GroupStatsMixin, Base):
+    __tablename__ = "monthly_group_stats"
+
+
+def record_group_activity(
+    connection,
+    group_id: uuid.UUID,
+    day: date,
+    spent_amount: int = 0,
+    items_bought: int = 0,
+    items_consumed: int = 0
+) -> None:
+    """Adds to the group's daily and monthly counters, in the caller's transaction."""
+    increments = {"spent_amount": spent_amount, "items_bought": items_bought, "items_consumed": items_consumed}
+    for model, period_start in ((DailyGroupStats, day), (MonthlyGroupStats, day.replace(day=1))):
+        stmt = insert(model).values(group_id=group_id, period_start=period_start, **increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.group_id, model.period_start],
+            set_={column: getattr(model, column) + getattr(stmt.excluded, column) for column in increments}
+        )
+        connection.execute(stmt)
+
+
+def expired_rollup_statements(day: date, shard: Optional[Shard] = None) -> list:
+    """
+    Statements setting items_expired for `day` and its month from the units expiring that day.
+    Values are overwritten rather than incremented, so re-running the expiry task for a day is harmless.
+    """
+    expiring: Select = (
+        select(StorableUnit.group_id, literal(day, Date), func.sum(StorableUnit.package_quantity))
+        .where(StorableUnit.expiration_date == day)
+        .group_by(StorableUnit.group_id)
+    )
+    month_start = day.replace(day=1)
+    month_total: Select = (
+        select(DailyGroupStats.group_id, literal(month_start, Date), func.sum(DailyGroupStats.items_expired))
+        .where(DailyGroupStats.period_start.between(month_start, day))
+        .group_by(DailyGroupStats.group_id)
+    )
+    if shard is not None:
+        expiring = expiring.where(shard_filter(StorableUnit.group_id, shard))
+        month_total = month_total.where(shard_filter(DailyGroupStats.group_id, shard))
+
+    statements = []
+    for model, source in ((DailyGroupStats, expiring), (MonthlyGroupStats, month_total)):
+        stmt = insert(model).from_select(["group_id", "period_start", "items_expired"], source)
+        statements.append(stmt.on_conflict_do_update(
+            index_elements=[model.group_id, model.period_start],
+            set_={"items_expired": stmt.excluded.items_expired}
+        ))
+    return statements
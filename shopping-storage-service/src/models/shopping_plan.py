@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Integer, DateTime, ForeignKey, Enum, Index, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -9,6 +9,9 @@ from typing import Optional
 from enums.plan_status import PlanStatus
 from core.database import Base
 
+# Literal predicate shared by the partial index and the expiry query, so the planner can always match them
+ACTIVE_PLAN_PREDICATE = "plan_status IN ('CREATED', 'IN_PROGRESS')"
+
 class ShoppingPlan(Base):
     __tablename__ = "shopping_plans"
 
@@ -21,9 +24,29 @@ class ShoppingPlan(Base):
     shopping_list: Mapped[list] = mapped_column(JSONB, nullable=False)
     others: Mapped[list] = mapped_column(JSONB, nullable=True)
     plan_status: Mapped[PlanStatus] = mapped_column(Enum(PlanStatus), nullable=False, default=PlanStatus.CREATED, index=True)
+    # Bumped by every change (ORM flushes via version_id_col, Core updates explicitly); exposed as the plan's ETag
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
     report: Mapped["Report"] = relationship(back_populates="plan")
 
+    __table_args__ = (
+        # Serves the expiry poller: only active plans are indexed, ordered by deadline
+        Index(
+            "ix_shopping_plans_active_deadline",
+            "deadline",
+            postgresql_where=text(ACTIVE_PLAN_PREDICATE)
+        ),
+        # Serves containment lookups by component (shopping_list @> '[{"component_id": 298}]')
+        Index(
+            "ix_shopping_plans_shopping_list_path_ops",
+            "shopping_list",
+            postgresql_using="gin",
+            postgresql_ops={"shopping_list": "jsonb_path_ops"}
+        ),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+
 class Report(Base):
     __tablename__ = "reports"
 
@@ -32,9 +55,24 @@ class Report(Base):
     report_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
     report_content: Mapped[list] = mapped_column(JSONB, nullable=False)
     spent_amount: Mapped[int] = mapped_column(Integer, default=0)
+    # Ingestion bookkeeping: pending reports form the durable queue drained by ReportIngestor
+    ingested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     plan: Mapped["ShoppingPlan"] = relationship(
         back_populates="report",
         foreign_keys=[plan_id],
         single_parent=True
-    )
\ No newline at end of file
+    )
+
+    __table_args__ = (
+        Index("ix_reports_pending", "available_at", "report_id", postgresql_where=text("ingested_at IS NULL")),
+        Index(
+            "ix_reports_report_content_path_ops",
+            "report_content",
+            postgresql_using="gin",
+            postgresql_ops={"report_content": "jsonb_path_ops"}
+        ),
+    )
@@ -1,13 +1,18 @@
 import uuid
-from sqlalchemy import Integer, String, Float, Enum, ForeignKey, CheckConstraint, Date, event, update
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Integer, String, Float, Enum, ForeignKey, CheckConstraint, UniqueConstraint, Index, Date, event, update, select,
+    delete, and_
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy.sql import func
 from datetime import date
-from typing import Optional
+from typing import Optional, Iterable
 from enums.uc_measurement_unit import UCMeasurementUnit
 from enums.storage_type import StorageType
 from core.database import Base
+from models.component_existence import ComponentExistenceDirty
 
 class Storage(Base):
     __tablename__ = "storages"
@@ -19,6 +24,8 @@ class Storage(Base):
 
     storage_unit_list: Mapped[list["StorableUnit"]] = relationship(
         back_populates="storage",
+        primaryjoin="and_(Storage.storage_id == foreign(StorableUnit.storage_id), "
+                    "Storage.group_id == foreign(StorableUnit.group_id))",
         cascade="all, delete-orphan"
     )
 
@@ -33,10 +40,18 @@ def set_storage_name_after_insert(mapper, connection, target):
         )
         target.storage_name = new_name
 
+# storable_units is hash-partitioned by group_id (created by migration a7c9e1f3b568)
+STORABLE_UNIT_PARTITIONS = 16
+
 class StorableUnit(Base):
+    """
+    A batch of packages in a storage. group_id is copied from the storage so the table can be hash-partitioned
+    by group: queries that filter on group_id only touch that group's partition.
+    """
     __tablename__ = "storable_units"
 
-    unit_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    unit_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
     storage_id: Mapped[int] = mapped_column(ForeignKey("storages.storage_id"), nullable=False, index=True)
     package_quantity: Mapped[int] = mapped_column(Integer, default=1)
     unit_name: Mapped[str] = mapped_column(String, nullable=False, index=True)
@@ -49,7 +64,8 @@ class StorableUnit(Base):
 
     storage: Mapped["Storage"] = relationship(
         back_populates="storage_unit_list",
-        foreign_keys=[storage_id]
+        primaryjoin="and_(Storage.storage_id == foreign(StorableUnit.storage_id), "
+                    "Storage.group_id == foreign(StorableUnit.group_id))"
     )
 
     __table_args__ = (
@@ -65,5 +81,193 @@ class StorableUnit(Base):
             "(content_type = 'uncountable_ingredient' AND "
             " content_quantity IS NOT NULL AND content_unit IS NOT NULL)",
             name="quantity_unit_required_for_measurable"
+        ),
+        Index("ix_storable_units_group_id_unit_name", "group_id", "unit_name"),
+        {"postgresql_partition_by": "HASH (group_id)"}
+    )
+
+@event.listens_for(StorableUnit, "before_insert")
+def set_group_before_insert(mapper, connection, target):
+    if target.group_id is None:
+        target.group_id = connection.scalar(select(Storage.group_id).where(Storage.storage_id == target.storage_id))
+
+class StackedUnit(Base):
+    """
+    One row per stack (units of a storage sharing name, component and content), maintained alongside storable_units.
+    Serves the stacked inventory listing without aggregating the units on every request.
+    """
+    __tablename__ = "stacked_units"
+
+    stack_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    storage_id: Mapped[int] = mapped_column(ForeignKey("storages.storage_id", ondelete="CASCADE"), nullable=False)
+    unit_name: Mapped[str] = mapped_column(String, nullable=False)
+    component_id: Mapped[Optional[int]] = mapped_column(Integer)
+    content_type: Mapped[Optional[str]] = mapped_column(String)
+    content_quantity: Mapped[Optional[float]] = mapped_column(Float)
+    content_unit: Mapped[Optional[UCMeasurementUnit]] = mapped_column(Enum(UCMeasurementUnit))
+    package_quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    batch_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    earliest_expiration: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "storage_id", "unit_name", "component_id", "content_type", "content_quantity", "content_unit",
+            name="uq_stacked_units_stack_key",
+            postgresql_nulls_not_distinct=True
+        ),
+        Index("ix_stacked_units_storage_id_stack_id", "storage_id", "stack_id"),
+    )
+
+STACK_KEY_COLUMNS = ("storage_id", "unit_name", "component_id", "content_type", "content_quantity", "content_unit")
+
+def stack_key(unit: StorableUnit) -> tuple:
+    return tuple(getattr(unit, column) for column in STACK_KEY_COLUMNS)
+
+def stack_match(model, key: tuple):
+    # Plain = / IS NULL rather than IS NOT DISTINCT FROM, which Postgres cannot serve from an index
+    return and_(*[
+        getattr(model, column).is_(None) if value is None else getattr(model, column) == value
+        for column, value in zip(STACK_KEY_COLUMNS, key)
+    ])
+
+def units_in_stack(key: tuple):
+    """Condition selecting a stack's units; the storage's group is added so Postgres prunes to one partition."""
+    group_id = select(Storage.group_id).where(Storage.storage_id == key[0]).scalar_subquery()
+    return and_(StorableUnit.group_id == group_id, stack_match(StorableUnit, key))
+
+def add_to_stack(connection, key: tuple, package_quantity: int, expiration_date: Optional[date]) -> None:
+    """Adds one batch to its stack, creating the stack if needed."""
+    stmt = insert(StackedUnit).values(
+        **dict(zip(STACK_KEY_COLUMNS, key)),
+        package_quantity=package_quantity,
+        batch_count=1,
+        earliest_expiration=expiration_date
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_stacked_units_stack_key",
+        set_={
+            "package_quantity": StackedUnit.package_quantity + stmt.excluded.package_quantity,
+            "batch_count": StackedUnit.batch_count + 1,
+            # LEAST ignores NULLs, so undated batches never hide a dated one
+            "earliest_expiration": func.least(StackedUnit.earliest_expiration, stmt.excluded.earliest_expiration),
+        }
+    )
+    connection.execute(stmt)
+
+def add_batches_to_stacks(connection, units: Iterable[dict]) -> None:
+    """Bulk variant of add_to_stack for Core inserts that bypass the mapper events: one upsert for all stacks."""
+    stacks: dict[tuple, dict] = {}
+    for unit in units:
+        key = tuple(unit.get(column) for column in STACK_KEY_COLUMNS)
+        expiration_date = unit.get("expiration_date")
+        stack = stacks.get(key)
+        if stack is None:
+            stacks[key] = {
+                **dict(zip(STACK_KEY_COLUMNS, key)),
+                "package_quantity": unit["package_quantity"],
+                "batch_count": 1,
+                "earliest_expiration": expiration_date,
+            }
+            continue
+        stack["package_quantity"] += unit["package_quantity"]
+        stack["batch_count"] += 1
+        if expiration_date is not None and (
+            stack["earliest_expiration"] is None or expiration_date < stack["earliest_expiration"]
+        ):
+            stack["earliest_expiration"] = expiration_date
+
+    if not stacks:
+        return
+    # Rows were merged per key above, since one upsert cannot touch the same stack twice
+    stmt = insert(StackedUnit).values(list(stacks.values()))
+    connection.execute(stmt.on_conflict_do_update(
+        constraint="uq_stacked_units_stack_key",
+        set_={
+            "package_quantity": StackedUnit.package_quantity + stmt.excluded.package_quantity,
+            "batch_count": StackedUnit.batch_count + stmt.excluded.batch_count,
+            "earliest_expiration": func.least(StackedUnit.earliest_expiration, stmt.excluded.earliest_expiration),
+        }
+    ))
+
+def refresh_stacks(connection, keys: Iterable[tuple]) -> None:
+    """Recomputes the given stacks from their units (used after deletes, key changes and Core bulk statements)."""
+    for key in set(keys):
+        # Lock the stack first so the aggregate below sees every batch committed by concurrent writers
+        connection.execute(select(StackedUnit.stack_id).where(stack_match(StackedUnit, key)).with_for_update())
+        totals = connection.execute(
+            select(
+                func.sum(StorableUnit.package_quantity),
+                func.count(),
+                func.min(StorableUnit.expiration_date)
+            ).where(units_in_stack(key))
+        ).one()
+        package_quantity, batch_count, earliest_expiration = totals
+        if batch_count == 0:
+            connection.execute(delete(StackedUnit).where(stack_match(StackedUnit, key)))
+            continue
+        stmt = insert(StackedUnit).values(
+            **dict(zip(STACK_KEY_COLUMNS, key)),
+            package_quantity=package_quantity,
+            batch_count=batch_count,
+            earliest_expiration=earliest_expiration
+        )
+        connection.execute(stmt.on_conflict_do_update(
+            constraint="uq_stacked_units_stack_key",
+            set_={
+                "package_quantity": stmt.excluded.package_quantity,
+                "batch_count": stmt.excluded.batch_count,
+                "earliest_expiration": stmt.excluded.earliest_expiration,
+            }
+        ))
+
+def mark_group_existence_dirty(connection, group_id: uuid.UUID, unit_names: set[str]) -> None:
+    """Flags unit names of a group for the component existence publisher (same transaction)."""
+    if unit_names:
+        connection.execute(
+            insert(ComponentExistenceDirty)
+            .values([{"group_id": group_id, "unit_name": unit_name} for unit_name in unit_names])
+            .on_conflict_do_nothing()
+        )
+
+@event.listens_for(StorableUnit, "after_insert")
+def mark_existence_after_insert(mapper, connection, target):
+    if target.component_id is not None:
+        mark_group_existence_dirty(connection, target.group_id, {target.unit_name})
+
+@event.listens_for(StorableUnit, "after_delete")
+def mark_existence_after_delete(mapper, connection, target):
+    if target.component_id is not None:
+        mark_group_existence_dirty(connection, target.group_id, {target.unit_name})
+
+@event.listens_for(StorableUnit, "after_update")
+def mark_existence_after_update(mapper, connection, target):
+    # Quantity changes don't affect existence; only renames, (un)linking a component or moving storage do
+    histories = {attr: get_history(target, attr) for attr in ("unit_name", "component_id", "storage_id")}
+    if not any(h.has_changes() for h in histories.values()):
+        return
+    old_name = (histories["unit_name"].deleted or [target.unit_name])[0]
+    mark_group_existence_dirty(connection, target.group_id, {old_name, target.unit_name})
+
+@event.listens_for(StorableUnit, "after_insert")
+def add_to_stack_after_insert(mapper, connection, target):
+    add_to_stack(connection, stack_key(target), target.package_quantity, target.expiration_date)
+
+@event.listens_for(StorableUnit, "after_delete")
+def refresh_stack_after_delete(mapper, connection, target):
+    refresh_stacks(connection, [stack_key(target)])
+
+@event.listens_for(StorableUnit, "after_update")
+def update_stack_after_update(mapper, connection, target):
+    key_changed = any(get_history(target, column).has_changes() for column in STACK_KEY_COLUMNS)
+    quantity_history = get_history(target, "package_quantity")
+    if key_changed or get_history(target, "expiration_date").has_changes():
+        old_key = tuple(
+            (get_history(target, column).deleted or [getattr(target, column)])[0] for column in STACK_KEY_COLUMNS
+        )
+        refresh_stacks(connection, [old_key, stack_key(target)])
+    elif quantity_history.has_changes() and quantity_history.deleted:
+        connection.execute(
+            update(StackedUnit)
+            .where(stack_match(StackedUnit, stack_key(target)))
+            .values(package_quantity=StackedUnit.package_quantity + target.package_quantity - quantity_history.deleted[0])
         )
-    )
\ No newline at end of file
@@ -0,0 +1,11 @@
+from datetime import date
+from pydantic import BaseModel, ConfigDict
+
+class GroupStatsResponse(BaseModel):
+    period_start: date
+    spent_amount: int
+    items_bought: int
+    items_consumed: int
+    items_expired: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,6 @@
 from datetime import datetime, date
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from typing import Optional, Literal, List
+from typing import Any, Optional, Literal, List
 from uuid import UUID
 from enums.plan_status import PlanStatus
 
@@ -38,9 +38,27 @@ class PlanResponse(BaseModel):
     shopping_list: List[PlanItemBase]
     others: dict
     plan_status: PlanStatus
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
 
+class PatchOperation(BaseModel):
+    """One RFC 6902 operation; paths point into shopping_list or others, e.g. /shopping_list/0/quantity."""
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Optional[Any] = None
+    from_: Optional[str] = Field(None, alias="from")
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    @model_validator(mode='after')
+    def check_operands(cls, model):
+        if model.op in ("add", "replace", "test") and "value" not in model.model_fields_set:
+            raise ValueError(f"'{model.op}' operation requires 'value'")
+        if model.op in ("move", "copy") and model.from_ is None:
+            raise ValueError(f"'{model.op}' operation requires 'from'")
+        return model
+
 class ReportUnitBase(BaseModel):
     storage_id: int = Field(ge=1)
     package_quantity: int = Field(1, gt=0)
@@ -69,3 +87,11 @@ class PlanReport(BaseModel):
     plan_id: int = Field(ge=1)
     report_content: List[ReportUnitBase]
     spent_amount: int = Field(0, ge=0)
+
+class ComponentPurchaseResponse(BaseModel):
+    """A completed plan's report, narrowed to the items of one component."""
+    report_id: int
+    plan_id: int
+    report_date: datetime
+    spent_amount: int
+    items: List[ReportUnitBase]
@@ -1,5 +1,6 @@
 from datetime import date
-from pydantic import BaseModel, ConfigDict, Field
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, List
 from enums.uc_measurement_unit import UCMeasurementUnit
 
@@ -37,12 +38,14 @@ class StorableUnitResponse(BaseModel):
 
 class BatchItem(BaseModel):
     unit_id: int
+    package_quantity: int
     added_date: date
     expiration_date: Optional[date] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 class StorableUnitStackedResponse(BaseModel):
+    stack_id: int
     unit_name: str
     storage_id: int
     package_quantity: int
@@ -50,6 +53,45 @@ class StorableUnitStackedResponse(BaseModel):
     content_type: Optional[str] = None
     content_quantity: Optional[float] = None
     content_unit: Optional[UCMeasurementUnit] = None
-    batch: List[BatchItem]
+    batch_count: int
+    earliest_expiration: Optional[date] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ConsumeItem(BaseModel):
+    component_id: Optional[int] = Field(None, ge=1)
+    unit_name: Optional[str] = None
+    quantity: int = Field(ge=1, description="Number of packages to consume")
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.component_id is None) == (self.unit_name is None):
+            raise ValueError("Exactly one of component_id or unit_name must be provided")
+        return self
+
+class BatchConsumeRequest(BaseModel):
+    group_id: UUID
+    items: List[ConsumeItem] = Field(min_length=1)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(extra="forbid")
+
+class ConsumedItemResponse(BaseModel):
+    component_id: Optional[int] = None
+    unit_name: Optional[str] = None
+    consumed_quantity: int
+    deleted_unit_ids: List[int]
+    updated_units: List[StorableUnitResponse]
+
+class StockRequest(BaseModel):
+    group_id: UUID
+    component_ids: List[int] = Field(min_length=1, max_length=1000)
+
+    model_config = ConfigDict(extra="forbid")
+
+class ComponentStockResponse(BaseModel):
+    component_id: int
+    content_unit: Optional[UCMeasurementUnit] = None
+    package_quantity: int
+    content_quantity: Optional[float] = Field(None, description="Total content (packages x content per package) for uncountable items")
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field
+from datetime import date
 from typing import Optional
 from uuid import UUID
 from enums.storage_type import StorageType
@@ -24,4 +25,18 @@ class StorageResponse(BaseModel):
     group_id: UUID
     storage_unit_list: list[StorableUnitResponse] = Field(default_factory=list)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class StorageSummaryResponse(BaseModel):
+    storage_id: int
+    storage_name: str
+    storage_type: StorageType
+    group_id: UUID
+    unit_count: int
+    package_count: int
+    distinct_items: int
+    earliest_expiration: Optional[date] = None
+    expired_count: int
+    expiring_soon_count: int
+
+    model_config = ConfigDict(from_attributes=True)
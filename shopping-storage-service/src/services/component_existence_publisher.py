@@ -0,0 +1,188 @@
+import asyncio
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Optional, Set
+from uuid import UUID
+from sqlalchemy import select, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from core.database import database_manager
+from models.component_existence import ComponentExistenceDirty, ComponentExistenceVersion
+from models.outbox import OutboxEvent
+from models.storage import StorableUnit, Storage
+from shopping_shared.messaging.outbox import enqueue_event
+from shopping_shared.messaging.topics import COMPONENT_EXISTENCE_TOPIC
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("ComponentExistencePublisher")
+
+
+class ComponentExistencePublisher:
+    """
+    Publishes component existence as per-group deltas.
+    StorableUnit mapper events flag touched unit names in component_existence_dirty (same transaction as the change).
+    Once a group's oldest flag is older than the debounce window, its flags are drained, the touched names are
+    checked against the current units in one query, and a single {added, removed} delta is queued in the outbox.
+    Deltas do not commute and the relay may publish them out of order, so each carries the group's next version;
+    bumping it locks the group's version row before the units are read, so a higher version always reflects a
+    later state. publish_snapshot() re-sends the full lists, stamped with the current version, to repair drift.
+    """
+
+    def __init__(self, debounce: float = 2.0, poll_interval: float = 1.0, max_groups: int = 500):
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.max_groups = max_groups
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Component existence publisher started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("Component existence publisher stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                flushed = await self.flush_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Component existence flush failed: {str(e)}", exc_info=True)
+                flushed = 0
+            if flushed < self.max_groups:
+                await asyncio.sleep(self.poll_interval)
+
+    async def flush_due(self) -> int:
+        """Drains due groups and queues one delta event per group. Returns the number of groups flushed."""
+        async with database_manager.get_session() as session:
+            due_groups = (
+                select(ComponentExistenceDirty.group_id)
+                .group_by(ComponentExistenceDirty.group_id)
+                .having(func.min(ComponentExistenceDirty.dirty_at) <= func.now() - timedelta(seconds=self.debounce))
+                .limit(self.max_groups)
+            )
+            drained = (await session.execute(
+                delete(ComponentExistenceDirty)
+                .where(ComponentExistenceDirty.group_id.in_(due_groups))
+                .returning(ComponentExistenceDirty.group_id, ComponentExistenceDirty.unit_name)
+            )).all()
+            if not drained:
+                return 0
+
+            touched: Dict[UUID, Set[str]] = defaultdict(set)
+            for group_id, unit_name in drained:
+                touched[group_id].add(unit_name)
+
+            # Sorted so concurrent flushes lock the version rows in the same order
+            bump = insert(ComponentExistenceVersion).values(
+                [{"group_id": group_id, "version": 1} for group_id in sorted(touched)]
+            )
+            versions: Dict[UUID, int] = dict((await session.execute(
+                bump.on_conflict_do_update(
+                    index_elements=[ComponentExistenceVersion.group_id],
+                    set_={"version": ComponentExistenceVersion.version + 1}
+                ).returning(ComponentExistenceVersion.group_id, ComponentExistenceVersion.version)
+            )).all())
+
+            present_rows = (await session.execute(
+                select(StorableUnit.group_id, StorableUnit.unit_name)
+                .where(
+                    StorableUnit.group_id.in_(touched.keys()),
+                    StorableUnit.unit_name.in_({name for names in touched.values() for name in names}),
+                    StorableUnit.component_id.isnot(None)
+                )
+                .distinct()
+            )).all()
+            present: Dict[UUID, Set[str]] = defaultdict(set)
+            for group_id, unit_name in present_rows:
+                present[group_id].add(unit_name)
+
+            for group_id, names in touched.items():
+                added = names & present[group_id]
+                enqueue_event(
+                    session,
+                    OutboxEvent,
+                    topic=COMPONENT_EXISTENCE_TOPIC,
+                    value={
+                        "event_type": "component_existence_delta",
+                        "data": {
+                            "group_id": str(group_id),
+                            "version": versions[group_id],
+                            "added": sorted(added),
+                            "removed": sorted(names - added),
+                        },
+                    },
+                    key=str(group_id),
+                )
+
+        logger.info(f"Queued component_existence deltas for {len(touched)} groups")
+        return len(touched)
+
+    async def publish_snapshot(self, chunk_size: int = 500) -> None:
+        """
+        Queues a full update_component_existence event for every group that owns a storage.
+        The lists and versions come from one statement, so a snapshot covers exactly the deltas up to its version.
+        """
+        stmt = (
+            select(Storage.group_id, func.coalesce(ComponentExistenceVersion.version, 0), StorableUnit.unit_name)
+            .outerjoin(ComponentExistenceVersion, ComponentExistenceVersion.group_id == Storage.group_id)
+            .outerjoin(
+                StorableUnit,
+                and_(
+                    StorableUnit.group_id == Storage.group_id,
+                    StorableUnit.storage_id == Storage.storage_id,
+                    StorableUnit.component_id.isnot(None)
+                )
+            )
+            .distinct()
+            .order_by(Storage.group_id)
+            .execution_options(yield_per=1000)
+        )
+
+        snapshots: Dict[UUID, list[str]] = {}
+        versions: Dict[UUID, int] = {}
+        total = 0
+
+        async def _flush_chunk():
+            async with database_manager.get_session() as write_session:
+                for gid, names in snapshots.items():
+                    enqueue_event(
+                        write_session,
+                        OutboxEvent,
+                        topic=COMPONENT_EXISTENCE_TOPIC,
+                        value={
+                            "event_type": "update_component_existence",
+                            "data": {"group_id": str(gid), "version": versions[gid], "unit_names": names},
+                        },
+                        key=str(gid),
+                    )
+            snapshots.clear()
+            versions.clear()
+
+        async with database_manager.get_session() as read_session:
+            result = await read_session.stream(stmt)
+            current: Optional[UUID] = None
+            async for group_id, version, unit_name in result:
+                if group_id != current:
+                    # Rows are ordered by group, so a chunk never splits a group
+                    if len(snapshots) >= chunk_size:
+                        total += len(snapshots)
+                        await _flush_chunk()
+                    current = group_id
+                    snapshots[group_id] = []
+                    versions[group_id] = version
+                if unit_name is not None:
+                    snapshots[group_id].append(unit_name)
+            if snapshots:
+                total += len(snapshots)
+                await _flush_chunk()
+
+        logger.info(f"Queued component_existence snapshots for {total} groups")
+
+
+component_existence_publisher = ComponentExistencePublisher()
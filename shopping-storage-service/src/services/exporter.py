@@ -0,0 +1,123 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator
+from uuid import UUID
+from sqlalchemy import Select, select, and_
+from core.database import database_manager
+from enums.export_format import ExportFormat
+from models.shopping_plan import ShoppingPlan, Report
+from models.storage import Storage, StorableUnit
+
+"""
+    Streams whole datasets of a group as NDJSON or CSV.
+    Rows are read through a server-side cursor (yield_per) as plain Core rows, never as ORM objects, and each
+    partition is encoded and handed to the response before the next one is fetched, so memory stays constant
+    regardless of how large the group's history is.
+"""
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    value = _plain(value)
+    # Nested JSONB values (shopping lists, report contents) are embedded as JSON text
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=_plain)
+    return "" if value is None else value
+
+
+def storable_units_export(group_id: UUID) -> Select:
+    return (
+        select(
+            StorableUnit.unit_id,
+            StorableUnit.storage_id,
+            Storage.storage_name,
+            StorableUnit.unit_name,
+            StorableUnit.package_quantity,
+            StorableUnit.component_id,
+            StorableUnit.content_type,
+            StorableUnit.content_quantity,
+            StorableUnit.content_unit,
+            StorableUnit.added_date,
+            StorableUnit.expiration_date,
+        )
+        .join(Storage, and_(Storage.group_id == StorableUnit.group_id, Storage.storage_id == StorableUnit.storage_id))
+        .where(StorableUnit.group_id == group_id)
+        .order_by(StorableUnit.unit_id)
+    )
+
+
+def shopping_plans_export(group_id: UUID) -> Select:
+    return (
+        select(
+            ShoppingPlan.plan_id,
+            ShoppingPlan.plan_status,
+            ShoppingPlan.deadline,
+            ShoppingPlan.last_modified,
+            ShoppingPlan.assigner_id,
+            ShoppingPlan.assignee_id,
+            ShoppingPlan.shopping_list,
+            ShoppingPlan.others,
+        )
+        .where(ShoppingPlan.group_id == group_id)
+        .order_by(ShoppingPlan.plan_id)
+    )
+
+
+def reports_export(group_id: UUID) -> Select:
+    return (
+        select(
+            Report.report_id,
+            Report.plan_id,
+            Report.report_date,
+            Report.spent_amount,
+            Report.report_content,
+        )
+        .join(ShoppingPlan, ShoppingPlan.plan_id == Report.plan_id)
+        .where(ShoppingPlan.group_id == group_id)
+        .order_by(Report.report_id)
+    )
+
+
+async def stream_export(stmt: Select, export_format: ExportFormat) -> AsyncIterator[str]:
+    """Yields the encoded rows of stmt one partition (EXPORT_BATCH_SIZE rows) at a time."""
+    async with database_manager.get_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+
+        if export_format == ExportFormat.NDJSON:
+            async for partition in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_plain) + "\n"
+                    for row in partition
+                )
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for partition in result.partitions():
+            writer.writerows([_csv_cell(value) for value in row] for row in partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
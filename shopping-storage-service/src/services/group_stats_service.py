@@ -0,0 +1,24 @@
+from datetime import date
+from typing import Sequence, Union
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.group_stats import DailyGroupStats, MonthlyGroupStats
+
+GroupStats = Union[DailyGroupStats, MonthlyGroupStats]
+
+
+def list_group_stats(
+    db: Session,
+    model: type[GroupStats],
+    group_id: UUID,
+    start: date,
+    end: date
+) -> Sequence[GroupStats]:
+    """Precomputed rows of a group whose period starts within [start, end], oldest first."""
+    stmt = (
+        select(model)
+        .where(model.group_id == group_id, model.period_start.between(start, end))
+        .order_by(model.period_start)
+    )
+    return db.execute(stmt).scalars().all()
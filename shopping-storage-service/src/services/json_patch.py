@@ -0,0 +1,153 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Text, case, func, literal, true
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from schemas.plan_schemas import PatchOperation
+
+"""
+    Compiles RFC 6902 JSON Patch operations into SQL expressions over JSONB columns, so a patch is applied
+    by Postgres in the UPDATE itself (jsonb_set / jsonb_insert / #-) instead of a read-modify-write in Python.
+    Operations are chained: each one transforms the expression produced by the previous one.
+    move/copy reference the document twice, and an add at a numeric token under a parent of unknown type three
+    times (it must check whether the parent is an array), so the copies they multiply are capped.
+"""
+
+MAX_MOVE_COPY = 10
+MAX_DOCUMENT_COPIES = 2 ** MAX_MOVE_COPY
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Splits a JSON Pointer (RFC 6901) into its unescaped reference tokens."""
+    if not pointer.startswith("/"):
+        raise HTTPException(status_code=400, detail=f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _path(tokens: Sequence[str]):
+    return literal(list(tokens), ARRAY(Text))
+
+
+def _value(value: Any):
+    return literal(value, JSONB)
+
+
+def _get(doc, tokens: Sequence[str]):
+    return doc if not tokens else doc.op("#>", return_type=JSONB)(_path(tokens))
+
+
+def _exists(doc, tokens: Sequence[str]):
+    return _get(doc, tokens).isnot(None)
+
+
+def _add(doc, tokens: Sequence[str], value, parent_type: Optional[str]):
+    if not tokens:
+        return value
+    parent, last = tokens[:-1], tokens[-1]
+    if last == "-":
+        appended = _get(doc, parent).op("||", return_type=JSONB)(func.jsonb_build_array(value))
+        return appended if not parent else func.jsonb_set(doc, _path(parent), appended, False)
+    # An index inserts into an array (shifting later items); on an object any token, digits included,
+    # adds or replaces the member. The parent's type is only checked in SQL when it is not known upfront.
+    if not last.isdigit() or parent_type == "object":
+        return func.jsonb_set(doc, _path(tokens), value, True)
+    if parent_type == "array":
+        return func.jsonb_insert(doc, _path(tokens), value)
+    return case(
+        (func.jsonb_typeof(_get(doc, parent)) == "array", func.jsonb_insert(doc, _path(tokens), value)),
+        else_=func.jsonb_set(doc, _path(tokens), value, True)
+    )
+
+
+def _remove(doc, tokens: Sequence[str]):
+    return doc.op("#-", return_type=JSONB)(_path(tokens))
+
+
+def _replace(doc, tokens: Sequence[str], value):
+    return value if not tokens else func.jsonb_set(doc, _path(tokens), value, False)
+
+
+class JsonPatchCompiler:
+    """
+    Maps the first pointer token to a JSONB column ({"shopping_list": ShoppingPlan.shopping_list, ...}).
+    Columns listed in `arrays` hold an array, the others an object.
+    compile() returns the new column expressions for UPDATE ... SET and the preconditions to put in the WHERE
+    clause (target exists, `test` value matches), each paired with the operation it belongs to.
+    """
+
+    def __init__(self, columns: Dict[str, Any], defaults: Dict[str, Any], arrays: Iterable[str] = ()):
+        self.columns = columns
+        self.defaults = defaults
+        self.arrays = frozenset(arrays)
+
+    def _parent_type(self, name: str, tokens: Sequence[str]) -> Optional[str]:
+        """Type of the container an add at `tokens` goes into, when it is the column itself."""
+        if len(tokens) != 1:
+            return None
+        return "array" if name in self.arrays else "object"
+
+    def _copies(self, operation: PatchOperation) -> int:
+        name, tokens = self._locate(operation.path)
+        if operation.op in ("move", "copy"):
+            return 2
+        if operation.op == "add" and tokens and tokens[-1].isdigit() and self._parent_type(name, tokens) is None:
+            return 3
+        return 1
+
+    def _locate(self, pointer: str) -> Tuple[str, List[str]]:
+        tokens = parse_pointer(pointer)
+        if tokens[0] not in self.columns:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid patch path {pointer!r}: must start with one of {['/' + name for name in self.columns]}"
+            )
+        return tokens[0], tokens[1:]
+
+    def compile(self, operations: Sequence[PatchOperation]) -> Tuple[Dict[str, Any], List[Tuple[PatchOperation, Any]]]:
+        if sum(operation.op in ("move", "copy") for operation in operations) > MAX_MOVE_COPY:
+            raise HTTPException(status_code=400, detail=f"A patch may contain at most {MAX_MOVE_COPY} move/copy operations")
+        copies = 1
+        for operation in operations:
+            copies *= self._copies(operation)
+        if copies > MAX_DOCUMENT_COPIES:
+            raise HTTPException(status_code=400, detail="Patch is too complex: too many move/copy operations and array inserts")
+        docs: Dict[str, Any] = {}
+        preconditions: List[Tuple[PatchOperation, Any]] = []
+
+        def doc(name: str):
+            if name not in docs:
+                column = self.columns[name]
+                default = self.defaults.get(name)
+                docs[name] = column if default is None else func.coalesce(column, _value(default))
+            return docs[name]
+
+        for operation in operations:
+            name, tokens = self._locate(operation.path)
+            current = doc(name)
+
+            if operation.op == "test":
+                preconditions.append((operation, _get(current, tokens) == _value(operation.value)))
+            elif operation.op == "add":
+                preconditions.append((operation, _exists(current, tokens[:-1]) if tokens else true()))
+                docs[name] = _add(current, tokens, _value(operation.value), self._parent_type(name, tokens))
+            elif operation.op == "replace":
+                preconditions.append((operation, _exists(current, tokens)))
+                docs[name] = _replace(current, tokens, _value(operation.value))
+            elif operation.op == "remove":
+                if not tokens:
+                    raise HTTPException(status_code=400, detail=f"Cannot remove {operation.path!r}")
+                preconditions.append((operation, _exists(current, tokens)))
+                docs[name] = _remove(current, tokens)
+            else:  # move / copy
+                source_name, source_tokens = self._locate(operation.from_)
+                if operation.op == "move" and not source_tokens:
+                    raise HTTPException(status_code=400, detail=f"Cannot move {operation.from_!r}")
+                source = doc(source_name)
+                moved = _get(source, source_tokens)
+                preconditions.append((operation, _exists(source, source_tokens)))
+                if operation.op == "move":
+                    docs[source_name] = _remove(source, source_tokens)
+                    current = doc(name)
+                preconditions.append((operation, _exists(current, tokens[:-1]) if tokens else true()))
+                docs[name] = _add(current, tokens, moved, self._parent_type(name, tokens))
+
+        return docs, preconditions
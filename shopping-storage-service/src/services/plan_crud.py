@@ -1,19 +1,87 @@
 from datetime import datetime, time, timedelta
-from typing import Optional
+from typing import Optional, List, Sequence
 from uuid import UUID
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import select, update, desc
 from fastapi import HTTPException
 from shopping_shared.crud.crud_base import CRUDBase
-from models.shopping_plan import ShoppingPlan
-from schemas.plan_schemas import PlanCreate, PlanUpdate
+from models.shopping_plan import ShoppingPlan, Report
+from schemas.plan_schemas import PlanCreate, PlanUpdate, PlanResponse, PatchOperation, ComponentPurchaseResponse
+from services.json_patch import JsonPatchCompiler
 from enums.plan_status import PlanStatus
 
+ACTIVE_STATUSES = [PlanStatus.CREATED, PlanStatus.IN_PROGRESS]
+
+plan_patch_compiler = JsonPatchCompiler(
+    columns={"shopping_list": ShoppingPlan.shopping_list, "others": ShoppingPlan.others},
+    defaults={"others": {}},
+    arrays={"shopping_list"}
+)
+
 class PlanCRUD(CRUDBase[ShoppingPlan, PlanCreate, PlanUpdate]):
     def update(self, db: Session, obj_in: PlanUpdate, db_obj: ShoppingPlan) -> ShoppingPlan:
-        if db_obj.plan_status not in [PlanStatus.CREATED, PlanStatus.IN_PROGRESS]:
+        if db_obj.plan_status not in ACTIVE_STATUSES:
             raise HTTPException(status_code=400, detail="Cannot update plan: plan is not active")
-        return super().update(db, obj_in, db_obj)
+        try:
+            return super().update(db, obj_in, db_obj)
+        except StaleDataError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Plan was modified concurrently, please retry")
+
+    def patch(
+        self,
+        db: Session,
+        id: int,
+        operations: List[PatchOperation],
+        expected_version: Optional[int] = None
+    ) -> PlanResponse:
+        """
+        Applies JSON Patch operations to shopping_list/others in a single UPDATE ... RETURNING.
+        The patch is evaluated by Postgres against the current row, so concurrent patches touching different
+        items both apply; expected_version (If-Match) additionally rejects the patch if anything changed.
+        """
+        docs, preconditions = plan_patch_compiler.compile(operations)
+        conditions = [ShoppingPlan.plan_status.in_(ACTIVE_STATUSES), *[condition for _, condition in preconditions]]
+        if expected_version is not None:
+            conditions.append(ShoppingPlan.version == expected_version)
+
+        with db.begin():
+            plan = db.execute(
+                update(ShoppingPlan)
+                .where(ShoppingPlan.plan_id == id, *conditions)
+                .values(**docs, version=ShoppingPlan.version + 1)
+                .returning(ShoppingPlan)
+            ).scalar_one_or_none()
+
+            if plan is None:
+                raise self._patch_failure(db, id, preconditions, expected_version)
+
+            try:
+                # Raising here rolls the UPDATE back, so a patch can never leave an invalid shopping list
+                return PlanResponse.model_validate(plan)
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=f"Patched plan is invalid: {e.errors(include_url=False)}")
+
+    def _patch_failure(self, db: Session, id: int, preconditions, expected_version: Optional[int]) -> HTTPException:
+        row = db.execute(
+            select(ShoppingPlan.plan_status, ShoppingPlan.version, *[condition for _, condition in preconditions])
+            .where(ShoppingPlan.plan_id == id)
+        ).one_or_none()
+        if row is None:
+            return HTTPException(status_code=404, detail="ShoppingPlan not found")
+        plan_status, version, *results = row
+        if expected_version is not None and version != expected_version:
+            return HTTPException(status_code=412, detail=f"Version mismatch: plan is at version {version}, not {expected_version}")
+        if plan_status not in ACTIVE_STATUSES:
+            return HTTPException(status_code=400, detail="Cannot update plan: plan is not active")
+        for (operation, _), result in zip(preconditions, results):
+            if result is not True:
+                if operation.op == "test":
+                    return HTTPException(status_code=409, detail=f"Patch test failed at {operation.path!r}")
+                return HTTPException(status_code=409, detail=f"Patch target does not exist for {operation.op} {operation.path!r}")
+        return HTTPException(status_code=409, detail="Plan was modified concurrently, please retry")
 
     def filter(
         self,
@@ -49,3 +117,46 @@ class PlanCRUD(CRUDBase[ShoppingPlan, PlanCreate, PlanUpdate]):
 
         stmt = stmt.limit(limit)
         return db.execute(stmt).scalars().all()
+
+    def find_active_with_component(self, db: Session, group_id: UUID, component_id: int) -> Sequence[ShoppingPlan]:
+        """Active plans of the group whose shopping list includes the component, soonest deadline first."""
+        stmt = (
+            select(ShoppingPlan)
+            .where(
+                ShoppingPlan.group_id == group_id,
+                ShoppingPlan.plan_status.in_(ACTIVE_STATUSES),
+                # @> containment is answered by the jsonb_path_ops GIN index
+                ShoppingPlan.shopping_list.contains([{"component_id": component_id}])
+            )
+            .order_by(ShoppingPlan.deadline, ShoppingPlan.plan_id)
+        )
+        return db.execute(stmt).scalars().all()
+
+    def get_component_purchases(
+        self,
+        db: Session,
+        group_id: UUID,
+        component_id: int,
+        limit: int = 1
+    ) -> List[ComponentPurchaseResponse]:
+        """The group's latest reports that bought the component, newest first, with only that component's items."""
+        stmt = (
+            select(Report)
+            .join(ShoppingPlan, ShoppingPlan.plan_id == Report.plan_id)
+            .where(
+                ShoppingPlan.group_id == group_id,
+                Report.report_content.contains([{"component_id": component_id}])
+            )
+            .order_by(desc(Report.report_date), desc(Report.report_id))
+            .limit(limit)
+        )
+        return [
+            ComponentPurchaseResponse(
+                report_id=report.report_id,
+                plan_id=report.plan_id,
+                report_date=report.report_date,
+                spent_amount=report.spent_amount,
+                items=[item for item in report.report_content if item.get("component_id") == component_id]
+            )
+            for report in db.execute(stmt).scalars().all()
+        ]
@@ -1,97 +1,72 @@
-from typing import Optional, Any, List
+from typing import Any
 from uuid import UUID
-from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from enums.plan_status import PlanStatus
-from models.shopping_plan import ShoppingPlan
+from models.shopping_plan import ShoppingPlan, Report
+from models.outbox import OutboxEvent
 from schemas.plan_schemas import PlanReport, PlanResponse
+from shopping_shared.crud.state_transition import StateTransition, Guard
 from shopping_shared.messaging.kafka_topics import NOTIFICATION_TOPIC
-from core.messaging import kafka_manager
+from shopping_shared.messaging.outbox import enqueue_event
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("PlanTransition")
 
+def _plan_transition(from_status, to_status) -> StateTransition:
+    return StateTransition(ShoppingPlan, ShoppingPlan.plan_id, ShoppingPlan.plan_status, from_status, to_status,
+                           entity="plan", version_column=ShoppingPlan.version)
+
 class PlanTransition:
-    def _preconditions_check(self, plan: Optional[ShoppingPlan], allowed_status: PlanStatus | List[PlanStatus]):
-        if plan is None:
-            raise HTTPException(status_code=404, detail=f"ShoppingPlan not found")
-        if isinstance(allowed_status, list):
-            if plan.plan_status not in allowed_status:
-                raise HTTPException(status_code=400,
-                                    detail=f"Operation not allowed: plan status must be one of {allowed_status}, got {plan.plan_status}")
-        else:
-            if plan.plan_status != allowed_status:
-                raise HTTPException(status_code=400,
-                                    detail=f"Operation not allowed: plan status must be {allowed_status}, got {plan.plan_status}")
-
-    async def assign(self, db: Session, id: int, assignee_id: UUID, assignee_username: str) -> PlanResponse:
+    # Each transition is a single conditional UPDATE ... RETURNING; see shopping_shared.crud.state_transition
+    ASSIGN = _plan_transition(PlanStatus.CREATED, PlanStatus.IN_PROGRESS)
+    UNASSIGN = _plan_transition(PlanStatus.IN_PROGRESS, PlanStatus.CREATED)
+    CANCEL = _plan_transition([PlanStatus.CREATED, PlanStatus.IN_PROGRESS], PlanStatus.CANCELLED)
+    COMPLETE = _plan_transition(PlanStatus.IN_PROGRESS, PlanStatus.COMPLETED)
+    REOPEN = _plan_transition(PlanStatus.CANCELLED, PlanStatus.CREATED)
+
+    @staticmethod
+    def _assignee_guard(assignee_id: UUID) -> Guard:
+        return Guard(ShoppingPlan.assignee_id, assignee_id, 403,
+                     f"Operation not allowed: user {assignee_id} is not the current assignee of this plan")
+
+    @staticmethod
+    def _assigner_guard(assigner_id: UUID) -> Guard:
+        return Guard(ShoppingPlan.assigner_id, assigner_id, 403,
+                     f"Operation not allowed: user {assigner_id} is not the assigner of this plan")
+
+    def assign(self, db: Session, id: int, assignee_id: UUID, assignee_username: str) -> PlanResponse:
         with db.begin():
-            plan = db.execute(
-                select(ShoppingPlan)
-                .where(ShoppingPlan.plan_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(plan, PlanStatus.CREATED)
-
-            plan.assignee_id = assignee_id
-            plan.plan_status = PlanStatus.IN_PROGRESS
-
-        await kafka_manager.send_message(
-            topic=NOTIFICATION_TOPIC,
-            value={
-                "event_type": "plan_assigned",
-                "group_id": str(plan.group_id),
-                "receivers": [str(plan.assigner_id)],
-                "data": {
-                    "plan_id": plan.plan_id,
-                    "deadline": plan.deadline.strftime("%H:%M %d/%m/%Y"),
-                    "assignee_username": assignee_username,
-                }
-            },
-            key=f"{plan.group_id}-plan",
-            wait=True,
-        )
-        logger.info(f"Published plan_assigned event: plan_id={plan.plan_id}, group_id={plan.group_id}")
+            plan = self.ASSIGN.apply(db, id, values={"assignee_id": assignee_id})
+
+            enqueue_event(
+                db,
+                OutboxEvent,
+                topic=NOTIFICATION_TOPIC,
+                value={
+                    "event_type": "plan_assigned",
+                    "group_id": str(plan.group_id),
+                    "receivers": [str(plan.assigner_id)],
+                    "data": {
+                        "plan_id": plan.plan_id,
+                        "deadline": plan.deadline.strftime("%H:%M %d/%m/%Y"),
+                        "assignee_username": assignee_username,
+                    }
+                },
+                key=f"{plan.group_id}-plan",
+            )
+        logger.info(f"Queued plan_assigned event: plan_id={plan.plan_id}, group_id={plan.group_id}")
 
         return PlanResponse.model_validate(plan)
 
     def unassign(self, db: Session, id: int, assignee_id: UUID) -> PlanResponse:
         with db.begin():
-            plan = db.execute(
-                select(ShoppingPlan)
-                .where(ShoppingPlan.plan_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(plan, PlanStatus.IN_PROGRESS)
-
-            if plan.assignee_id != assignee_id:
-                raise HTTPException(status_code=403, detail=f"Operation not allowed: user {assignee_id} is not the current assignee of this plan")
-
-            plan.assignee_id = None
-            plan.plan_status = PlanStatus.CREATED
-
+            plan = self.UNASSIGN.apply(db, id, guards=[self._assignee_guard(assignee_id)], values={"assignee_id": None})
             return PlanResponse.model_validate(plan)
 
     def cancel(self, db: Session, id: int, assigner_id: UUID) -> PlanResponse:
         with db.begin():
-            plan = db.execute(
-                select(ShoppingPlan)
-                .where(ShoppingPlan.plan_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(plan, [PlanStatus.CREATED, PlanStatus.IN_PROGRESS])
-
-            if plan.assigner_id != assigner_id:
-                raise HTTPException(status_code=403,
-                                    detail=f"Operation not allowed: user {assigner_id} is not the assigner of this plan")
-
-            plan.assignee_id = None
-            plan.plan_status = PlanStatus.CANCELLED
-
+            plan = self.CANCEL.apply(db, id, guards=[self._assigner_guard(assigner_id)], values={"assignee_id": None})
             return PlanResponse.model_validate(plan)
 
     def check_completion(self, plan: ShoppingPlan, report: PlanReport):
@@ -136,7 +111,7 @@ class PlanTransition:
         is_complete = len(missing_quantities) == 0
         return is_complete, missing_quantities
 
-    async def report(
+    def report(
         self,
         db: Session,
         id: int,
@@ -146,57 +121,45 @@ class PlanTransition:
         confirm: bool = True
     ) -> tuple[bool, str, Any]:
         with db.begin():
-            plan = db.execute(
-                select(ShoppingPlan)
-                .where(ShoppingPlan.plan_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(plan, PlanStatus.IN_PROGRESS)
-
-            if plan.assignee_id != assignee_id:
-                raise HTTPException(status_code=403,
-                                    detail=f"Operation not allowed: user {assignee_id} is not the current assignee of this plan")
-
+            guards = [self._assignee_guard(assignee_id)]
             if not confirm:
-                is_complete, missing_quantities = self.check_completion(plan, report)
-                if not is_complete:
-                    return False, "Report incomplete", {"missing_items": missing_quantities}
-
-            plan.plan_status = PlanStatus.COMPLETED
-
-        await kafka_manager.send_message(
-            topic=NOTIFICATION_TOPIC,
-            value={
-                "event_type": "plan_reported",
-                "group_id": str(plan.group_id),
-                "receivers": [str(plan.assigner_id)],
-                "data": {
-                    "plan_id": plan.plan_id,
-                    "assignee_username": assignee_username,
-                }
-            },
-            key=f"{plan.group_id}-plan",
-            wait=True,
-        )
-        logger.info(f"Published plan_reported event: plan_id={plan.plan_id}, group_id={plan.group_id}")
+                # Validate against a plain read, then only complete if the plan is unchanged since
+                plan = db.execute(select(ShoppingPlan).where(ShoppingPlan.plan_id == id)).scalar_one_or_none()
+                if plan is not None and plan.plan_status == PlanStatus.IN_PROGRESS and plan.assignee_id == assignee_id:
+                    is_complete, missing_quantities = self.check_completion(plan, report)
+                    if not is_complete:
+                        return False, "Report incomplete", {"missing_items": missing_quantities}
+                    guards.append(Guard(ShoppingPlan.last_modified, plan.last_modified, 409,
+                                        "Plan was modified while the report was being checked, please retry"))
+
+            plan = self.COMPLETE.apply(db, id, guards=guards)
+            # Units are added by ReportIngestor; persisting the report here makes that survive a restart
+            db.add(Report(
+                plan_id=plan.plan_id,
+                report_content=[item.model_dump(mode="json") for item in report.report_content],
+                spent_amount=report.spent_amount
+            ))
+
+            enqueue_event(
+                db,
+                OutboxEvent,
+                topic=NOTIFICATION_TOPIC,
+                value={
+                    "event_type": "plan_reported",
+                    "group_id": str(plan.group_id),
+                    "receivers": [str(plan.assigner_id)],
+                    "data": {
+                        "plan_id": plan.plan_id,
+                        "assignee_username": assignee_username,
+                    }
+                },
+                key=f"{plan.group_id}-plan",
+            )
+        logger.info(f"Queued plan_reported event: plan_id={plan.plan_id}, group_id={plan.group_id}")
 
         return True, "Report accepted and plan completed", PlanResponse.model_validate(plan)
 
     def reopen(self, db: Session, id: int, assigner_id: UUID) -> PlanResponse:
         with db.begin():
-            plan = db.execute(
-                select(ShoppingPlan)
-                .where(ShoppingPlan.plan_id == id)
-                .with_for_update()
-            ).scalar_one_or_none()
-
-            self._preconditions_check(plan, PlanStatus.CANCELLED)
-
-            if plan.assigner_id != assigner_id:
-                raise HTTPException(status_code=403,
-                                    detail=f"Operation not allowed: user {assigner_id} is not the assigner of this plan")
-
-            plan.plan_status = PlanStatus.CREATED
-
-            return PlanResponse.model_validate(plan)
\ No newline at end of file
+            plan = self.REOPEN.apply(db, id, guards=[self._assigner_guard(assigner_id)])
+            return PlanResponse.model_validate(plan)
@@ -0,0 +1,161 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from sqlalchemy import select, insert, func
+from sqlalchemy.orm import Session
+from core.database import database_manager
+from enums.uc_measurement_unit import UCMeasurementUnit
+from models.group_stats import record_group_activity
+from models.shopping_plan import Report, ShoppingPlan
+from models.storage import StorableUnit, Storage, add_batches_to_stacks, mark_group_existence_dirty
+from shopping_shared.utils.logger_utils import get_logger
+
+logger = get_logger("ReportIngestor")
+
+CONTENT_UNITS = {unit.value: unit for unit in UCMeasurementUnit}
+
+
+def ingest_report_units(session: Session, report: Report) -> tuple[int, int]:
+    """
+    Adds the report's items to their storages. Returns (inserted, skipped).
+    Items are validated in one pass against a single storage lookup, then inserted with one multi-row INSERT;
+    stacks and existence flags are updated in bulk since Core inserts bypass the StorableUnit mapper events.
+    The spend and bought packages are added to the group stats of the report's day.
+    """
+    items = report.report_content or []
+    storage_ids = {item["storage_id"] for item in items}
+    group_by_storage: Dict[int, UUID] = dict(session.execute(
+        select(Storage.storage_id, Storage.group_id).where(Storage.storage_id.in_(storage_ids))
+    ).all()) if storage_ids else {}
+
+    rows: List[dict] = []
+    names_by_group: Dict[UUID, Set[str]] = defaultdict(set)
+    skipped = 0
+    for item in items:
+        group_id = group_by_storage.get(item["storage_id"])
+        if group_id is None:
+            logger.warning(f"Skipping report item: storage_id={item['storage_id']} not found (plan_id={report.plan_id})")
+            skipped += 1
+            continue
+
+        content_unit = item.get("content_unit")
+        if content_unit is not None:
+            content_unit = CONTENT_UNITS.get(str(content_unit).upper())
+            if content_unit is None:
+                logger.warning(
+                    f"Skipping report item: invalid content_unit={item['content_unit']} "
+                    f"(plan_id={report.plan_id}, storage_id={item['storage_id']}, unit_name={item['unit_name']})"
+                )
+                skipped += 1
+                continue
+
+        expiration_date = item.get("expiration_date")
+        rows.append({
+            "group_id": group_id,
+            "storage_id": item["storage_id"],
+            "package_quantity": item.get("package_quantity", 1),
+            "unit_name": item["unit_name"],
+            "component_id": item.get("component_id"),
+            "content_type": item.get("content_type"),
+            "content_quantity": item.get("content_quantity"),
+            "content_unit": content_unit,
+            "expiration_date": date.fromisoformat(expiration_date) if expiration_date else None,
+        })
+        if item.get("component_id") is not None:
+            names_by_group[group_id].add(item["unit_name"])
+
+    connection = session.connection()
+    if rows:
+        session.execute(insert(StorableUnit).values(rows))
+        add_batches_to_stacks(connection, rows)
+        for group_id, unit_names in names_by_group.items():
+            mark_group_existence_dirty(connection, group_id, unit_names)
+
+    # Spending goes to the plan's group, bought packages to the groups owning the storages
+    day = report.report_date.date()
+    bought_by_group: Dict[UUID, int] = defaultdict(int)
+    for row in rows:
+        bought_by_group[row["group_id"]] += row["package_quantity"]
+    plan_group = session.execute(select(ShoppingPlan.group_id).where(ShoppingPlan.plan_id == report.plan_id)).scalar_one()
+    record_group_activity(connection, plan_group, day, spent_amount=report.spent_amount or 0,
+                          items_bought=bought_by_group.pop(plan_group, 0))
+    for group_id, items_bought in bought_by_group.items():
+        record_group_activity(connection, group_id, day, items_bought=items_bought)
+    return len(rows), skipped
+
+
+class ReportIngestor:
+    """
+    Turns completed plans' reports into storable units.
+    PlanTransition.report writes the Report row in the transaction that completes the plan, so a restart never
+    loses a report. Workers claim pending reports with FOR UPDATE SKIP LOCKED (safe across replicas) and ingest
+    each one in a savepoint; a failing report is retried with backoff instead of blocking the queue.
+    """
+
+    def __init__(self, workers: int = 2, poll_interval: float = 1.0, base_backoff: float = 5.0, max_backoff: float = 600.0):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+            logger.info(f"Report ingestor started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        if self._tasks:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            logger.info("Report ingestor stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.ingest_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Report ingestion iteration failed: {str(e)}", exc_info=True)
+                claimed = False
+            if not claimed:
+                await asyncio.sleep(self.poll_interval)
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.base_backoff * (2 ** (attempts - 1)), self.max_backoff)
+
+    async def ingest_next(self) -> bool:
+        """Ingests the oldest pending report. Returns False when there was nothing to claim."""
+        async with database_manager.get_session() as session:
+            report: Optional[Report] = (await session.execute(
+                select(Report)
+                .where(Report.ingested_at.is_(None), Report.available_at <= func.now())
+                .order_by(Report.report_id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )).scalar_one_or_none()
+            if report is None:
+                return False
+
+            now = datetime.now(timezone.utc)
+            try:
+                async with session.begin_nested():
+                    inserted, skipped = await session.run_sync(ingest_report_units, report)
+            except Exception as e:
+                report.attempts += 1
+                report.last_error = str(e)[:1000]
+                report.available_at = now + timedelta(seconds=self._backoff(report.attempts))
+                logger.error(f"Failed to ingest report {report.report_id} (plan_id={report.plan_id}): {str(e)}", exc_info=True)
+                return True
+
+            report.ingested_at = now
+        logger.info(f"Ingested report {report.report_id} (plan_id={report.plan_id}): {inserted} units added, {skipped} skipped")
+        return True
+
+
+report_ingestor = ReportIngestor()
@@ -1,50 +1,23 @@
 from fastapi import HTTPException
+from datetime import date
 from typing import Optional, Sequence, List
 from uuid import UUID
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, aliased
-from sqlalchemy import select, func, RowMapping
+from sqlalchemy.orm import Session
+from sqlalchemy import select, or_, delete, update, func
 from sqlalchemy.inspection import inspect
 from shopping_shared.crud.crud_base import CRUDBase
-from models.storage import StorableUnit, Storage
-from schemas.storable_unit_schemas import StorableUnitCreate, StorableUnitUpdate, StorableUnitResponse
-from core.messaging import kafka_manager
-from shopping_shared.messaging.topics import COMPONENT_EXISTENCE_TOPIC
-from shopping_shared.utils.logger_utils import get_logger
-
-logger = get_logger("StorableUnitCRUD")
+from models.storage import (
+    Storage, StorableUnit, StackedUnit, mark_group_existence_dirty, refresh_stacks, stack_key, units_in_stack
+)
+from models.group_stats import record_group_activity
+from schemas.storable_unit_schemas import (
+    StorableUnitCreate, StorableUnitUpdate, StorableUnitResponse, ConsumeItem, ConsumedItemResponse, ComponentStockResponse
+)
 
 
 class StorableUnitCRUD(CRUDBase[StorableUnit, StorableUnitCreate, StorableUnitUpdate]):
-    async def create(self, db: Session, obj_in: StorableUnitCreate) -> StorableUnit:
-        db_obj = super().create(db, obj_in)
-        storage = db.get(Storage, db_obj.storage_id)
-        if storage:
-            stmt = (
-                select(StorableUnit.unit_name)
-                .join(Storage, StorableUnit.storage_id == Storage.storage_id)
-                .where(Storage.group_id == storage.group_id)
-                .where(StorableUnit.component_id.isnot(None))
-                .distinct()
-            )
-            unit_names = db.execute(stmt).scalars().all()
-            payload = {
-                "event_type": "update_component_existence",
-                "data": {
-                    "group_id": str(storage.group_id),
-                    "unit_names": unit_names,
-                },
-            }
-            await kafka_manager.send_message(
-                topic=COMPONENT_EXISTENCE_TOPIC,
-                value=payload,
-                key=str(storage.group_id),  # type: ignore
-                wait=True,
-            )
-            logger.info(f"Published component_existence update: group_id={storage.group_id}")
-        return db_obj
-
-    async def consume(self, db: Session, id: int,consume_quantity: int) -> tuple[str, Optional[StorableUnitResponse]]:
+    def consume(self, db: Session, id: int,consume_quantity: int) -> tuple[str, Optional[StorableUnitResponse]]:
         try:
             with db.begin():
                 unit = db.execute(
@@ -62,32 +35,9 @@ class StorableUnitCRUD(CRUDBase[StorableUnit, StorableUnitCreate, StorableUnitUp
                         detail=f"Cannot consume from StorableUnit with id={id}: "
                                f"insufficient quantity (available: {unit.package_quantity}, requested: {consume_quantity})"
                     )
-                elif consume_quantity == unit.package_quantity:
-                    storage = db.get(Storage, unit.storage_id)
+                record_group_activity(db.connection(), unit.group_id, date.today(), items_consumed=consume_quantity)
+                if consume_quantity == unit.package_quantity:
                     db.delete(unit)
-                    if storage:
-                        stmt = (
-                            select(StorableUnit.unit_name)
-                            .join(Storage, StorableUnit.storage_id == Storage.storage_id)
-                            .where(Storage.group_id == storage.group_id)
-                            .where(StorableUnit.component_id.isnot(None))
-                            .distinct()
-                        )
-                        unit_names = db.execute(stmt).scalars().all()
-                        payload = {
-                            "event_type": "update_component_existence",
-                            "data": {
-                                "group_id": str(storage.group_id),
-                                "unit_names": unit_names,
-                            },
-                        }
-                        await kafka_manager.send_message(
-                            topic=COMPONENT_EXISTENCE_TOPIC,
-                            value=payload,
-                            key=str(storage.group_id),  # type: ignore
-                            wait=True,
-                        )
-                        logger.info(f"Published component_existence update: group_id={storage.group_id}")
                     return "Consumed and deleted", None
                 else:
                     unit.package_quantity -= consume_quantity
@@ -95,42 +45,152 @@ class StorableUnitCRUD(CRUDBase[StorableUnit, StorableUnitCreate, StorableUnitUp
         except IntegrityError as e:
             raise HTTPException(status_code=400, detail=f"Integrity error: {str(e)}")
 
-    def get_stacked(self, db: Session, storage_id: int, cursor: Optional[int] = None, limit: int = 100)\
-            -> Sequence[RowMapping]:
-        ref = aliased(StorableUnit)
-        subq = (
-            select(
-                ref.unit_name,
-                ref.storage_id,
-                ref.component_id,
-                ref.content_type,
-                ref.content_quantity,
-                ref.content_unit,
-                func.sum(ref.package_quantity).label("package_quantity"),
-                func.json_agg(
-                    func.json_build_object(
-                        "unit_id", ref.unit_id,
-                        "added_date", ref.added_date,
-                        "expiration_date", ref.expiration_date,
+    def consume_batch(self, db: Session, group_id: UUID, items: List[ConsumeItem]) -> List[ConsumedItemResponse]:
+        """
+        Consumes several items of a group in one transaction, oldest expiration first (FIFO, undated units last).
+        All matching units are locked by a single SELECT ... FOR UPDATE; the draw-down is then applied with one
+        bulk DELETE and one bulk UPDATE. Nothing is consumed if any item cannot be fully served.
+        """
+        component_ids = {item.component_id for item in items if item.component_id is not None}
+        unit_names = {item.unit_name for item in items if item.unit_name is not None}
+        conditions = []
+        if component_ids:
+            conditions.append(StorableUnit.component_id.in_(component_ids))
+        if unit_names:
+            conditions.append(StorableUnit.unit_name.in_(unit_names))
+
+        try:
+            with db.begin():
+                units = db.execute(
+                    select(StorableUnit)
+                    .where(StorableUnit.group_id == group_id)
+                    .where(or_(*conditions))
+                    .order_by(StorableUnit.expiration_date.asc().nulls_last(), StorableUnit.unit_id)
+                    .with_for_update()
+                ).scalars().all()
+
+                # Remaining packages per unit, shared across items in case two items match the same unit
+                remaining = {unit.unit_id: unit.package_quantity for unit in units}
+                touched_by_item: List[List[int]] = []
+                shortages = []
+                for item in items:
+                    needed = item.quantity
+                    touched: List[int] = []
+                    for unit in units:
+                        if needed == 0:
+                            break
+                        matches = (unit.component_id == item.component_id) if item.component_id is not None \
+                            else (unit.unit_name == item.unit_name)
+                        if not matches or remaining[unit.unit_id] == 0:
+                            continue
+                        taken = min(needed, remaining[unit.unit_id])
+                        remaining[unit.unit_id] -= taken
+                        needed -= taken
+                        touched.append(unit.unit_id)
+                    if needed > 0:
+                        shortages.append({
+                            "component_id": item.component_id,
+                            "unit_name": item.unit_name,
+                            "requested": item.quantity,
+                            "available": item.quantity - needed,
+                        })
+                    touched_by_item.append(touched)
+
+                if shortages:
+                    raise HTTPException(status_code=400, detail={
+                        "message": "Insufficient quantity, nothing was consumed",
+                        "shortages": shortages,
+                    })
+
+                units_by_id = {unit.unit_id: unit for unit in units}
+                changed = [unit for unit in units if remaining[unit.unit_id] != unit.package_quantity]
+                deleted_ids = [unit.unit_id for unit in changed if remaining[unit.unit_id] == 0]
+                updated = [
+                    {"unit_id": unit.unit_id, "group_id": group_id, "package_quantity": remaining[unit.unit_id]}
+                    for unit in changed if remaining[unit.unit_id] > 0
+                ]
+
+                if deleted_ids:
+                    db.execute(
+                        delete(StorableUnit)
+                        .where(StorableUnit.group_id == group_id, StorableUnit.unit_id.in_(deleted_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+                    # Bulk DELETE bypasses the mapper events, so flag the removed names once for the whole batch
+                    mark_group_existence_dirty(
+                        db.connection(),
+                        group_id,
+                        {units_by_id[unit_id].unit_name for unit_id in deleted_ids
+                         if units_by_id[unit_id].component_id is not None}
+                    )
+                if updated:
+                    db.execute(update(StorableUnit).execution_options(synchronize_session=False), updated)
+                if changed:
+                    refresh_stacks(db.connection(), [stack_key(unit) for unit in changed])
+                    record_group_activity(
+                        db.connection(), group_id, date.today(), items_consumed=sum(item.quantity for item in items)
                     )
-                ).label("batch"),
-                func.min(ref.unit_id).label("row_num")
+
+                deleted_set = set(deleted_ids)
+                return [
+                    ConsumedItemResponse(
+                        component_id=item.component_id,
+                        unit_name=item.unit_name,
+                        consumed_quantity=item.quantity,
+                        deleted_unit_ids=[unit_id for unit_id in touched if unit_id in deleted_set],
+                        updated_units=[
+                            StorableUnitResponse.model_validate(units_by_id[unit_id]).model_copy(
+                                update={"package_quantity": remaining[unit_id]}
+                            )
+                            for unit_id in touched if unit_id not in deleted_set
+                        ]
+                    )
+                    for item, touched in zip(items, touched_by_item)
+                ]
+        except IntegrityError as e:
+            raise HTTPException(status_code=400, detail=f"Integrity error: {str(e)}")
+
+    def stock_levels(self, db: Session, group_id: UUID, component_ids: List[int]) -> List[ComponentStockResponse]:
+        """
+        Unexpired stock of the group for each component, per content unit, in one aggregate over the group's partition.
+        Components the group does not hold are omitted.
+        """
+        today = date.today()
+        stmt = (
+            select(
+                StorableUnit.component_id,
+                StorableUnit.content_unit,
+                func.sum(StorableUnit.package_quantity).label("package_quantity"),
+                func.sum(StorableUnit.package_quantity * StorableUnit.content_quantity).label("content_quantity"),
             )
-            .where(ref.storage_id == storage_id)                                                # type: ignore
-            .group_by(
-                ref.unit_name,
-                ref.storage_id,                                                                 # type: ignore
-                ref.component_id,                                                               # type: ignore
-                ref.content_type,
-                ref.content_quantity,                                                           # type: ignore
-                ref.content_unit,
+            .where(
+                StorableUnit.group_id == group_id,
+                StorableUnit.component_id.in_(set(component_ids)),
+                or_(StorableUnit.expiration_date.is_(None), StorableUnit.expiration_date >= today),
             )
-        ).subquery()
-        stmt = select(subq)
+            .group_by(StorableUnit.component_id, StorableUnit.content_unit)
+            .order_by(StorableUnit.component_id)
+        )
+        return [ComponentStockResponse.model_validate(row._asdict()) for row in db.execute(stmt)]
+
+    def get_stacked(self, db: Session, storage_id: int, cursor: Optional[int] = None, limit: int = 100)\
+            -> Sequence[StackedUnit]:
+        stmt = select(StackedUnit).where(StackedUnit.storage_id == storage_id)
         if cursor is not None:
-            stmt = stmt.where(subq.c.row_num > cursor)
-        stmt = stmt.order_by(subq.c.row_num).limit(limit)
-        return db.execute(stmt).mappings().all()
+            stmt = stmt.where(StackedUnit.stack_id > cursor)
+        stmt = stmt.order_by(StackedUnit.stack_id).limit(limit)
+        return db.execute(stmt).scalars().all()
+
+    def get_stack_batches(self, db: Session, stack_id: int) -> Optional[Sequence[StorableUnit]]:
+        stack = db.get(StackedUnit, stack_id)
+        if stack is None:
+            return None
+        stmt = (
+            select(StorableUnit)
+            .where(units_in_stack(stack_key(stack)))
+            .order_by(StorableUnit.expiration_date.asc().nulls_last(), StorableUnit.unit_id)
+        )
+        return db.execute(stmt).scalars().all()
 
     def filter(
         self,
@@ -144,11 +204,15 @@ class StorableUnitCRUD(CRUDBase[StorableUnit, StorableUnitCreate, StorableUnitUp
         stmt = select(StorableUnit)
 
         if group_id is not None:
-            stmt = stmt.join(Storage, StorableUnit.storage_id == Storage.storage_id)
-            stmt = stmt.where(Storage.group_id == group_id)
+            stmt = stmt.where(StorableUnit.group_id == group_id)
 
         if storage_id is not None:
             stmt = stmt.where(StorableUnit.storage_id == storage_id)
+            if group_id is None:
+                # Resolve the storage's group so only its partition is scanned
+                stmt = stmt.where(
+                    StorableUnit.group_id == select(Storage.group_id).where(Storage.storage_id == storage_id).scalar_subquery()
+                )
 
         if unit_name is not None:
             if isinstance(unit_name, list) and len(unit_name) > 0:
@@ -1,10 +1,11 @@
+from datetime import date, timedelta
 from typing import Optional, Sequence
 from uuid import UUID
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select
+from sqlalchemy import select, func, and_, distinct, Row
 from sqlalchemy.inspection import inspect
 from shopping_shared.crud.crud_base import CRUDBase
-from models.storage import Storage
+from models.storage import Storage, StorableUnit
 from schemas.storage_schemas import StorageCreate, StorageUpdate
 from enums.storage_type import StorageType
 
@@ -30,4 +31,53 @@ class StorageCRUD(CRUDBase[Storage, StorageCreate, StorageUpdate]):
         if cursor is not None:
             stmt = stmt.where(pk < cursor)
         stmt = stmt.limit(limit)
-        return db.execute(stmt).scalars().all()
\ No newline at end of file
+        return db.execute(stmt).scalars().all()
+
+    def summarize(
+        self,
+        db: Session,
+        group_id: Optional[UUID] = None,
+        storage_type: Optional[StorageType] = None,
+        expiring_within_days: int = 3,
+        cursor: Optional[int] = None,
+        limit: int = 100
+    ) -> Sequence[Row]:
+        """
+        Lists storages with per-storage aggregates of their units, in one grouped query.
+        The page of storages is selected first, so only the units of those storages are aggregated.
+        """
+        page = select(Storage)
+        if group_id is not None:
+            page = page.where(Storage.group_id == group_id)
+        if storage_type is not None:
+            page = page.where(Storage.storage_type == storage_type)
+        if cursor is not None:
+            page = page.where(Storage.storage_id < cursor)
+        page = page.order_by(Storage.storage_id.desc()).limit(limit).subquery()
+
+        today = date.today()
+        cutoff = today + timedelta(days=expiring_within_days)
+        stmt = (
+            select(
+                page.c.storage_id,
+                page.c.storage_name,
+                page.c.storage_type,
+                page.c.group_id,
+                func.count(StorableUnit.unit_id).label("unit_count"),
+                func.coalesce(func.sum(StorableUnit.package_quantity), 0).label("package_count"),
+                func.count(distinct(StorableUnit.unit_name)).label("distinct_items"),
+                func.min(StorableUnit.expiration_date).label("earliest_expiration"),
+                func.count(StorableUnit.unit_id).filter(StorableUnit.expiration_date < today).label("expired_count"),
+                func.count(StorableUnit.unit_id).filter(
+                    StorableUnit.expiration_date.between(today, cutoff)
+                ).label("expiring_soon_count"),
+            )
+            .select_from(page)
+            .outerjoin(
+                StorableUnit,
+                and_(StorableUnit.group_id == page.c.group_id, StorableUnit.storage_id == page.c.storage_id)
+            )
+            .group_by(page.c.storage_id, page.c.storage_name, page.c.storage_type, page.c.group_id)
+            .order_by(page.c.storage_id.desc())
+        )
+        return db.execute(stmt).all()
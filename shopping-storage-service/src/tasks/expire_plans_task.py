@@ -1,39 +1,56 @@
+import time
 from datetime import datetime
-from sqlalchemy import update
+from sqlalchemy import update, select, text
 from enums.plan_status import PlanStatus
-from models.shopping_plan import ShoppingPlan
-from core.database import SessionLocal
-from core.messaging import kafka_manager
+from models.shopping_plan import ShoppingPlan, ACTIVE_PLAN_PREDICATE
+from models.outbox import OutboxEvent
+from core.database import database_manager
 from shopping_shared.messaging.kafka_topics import NOTIFICATION_TOPIC
+from shopping_shared.messaging.outbox import enqueue_event
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("Expire Plans Task")
 
+BATCH_SIZE = 200
+
 
 async def expire_plans():
-    db = SessionLocal()
-    now = datetime.now()
-    try:
-        with db.begin():
+    """
+    Expires active plans whose deadline has passed, in small batches.
+    Each batch picks the most overdue plans through the partial deadline index (ix_shopping_plans_active_deadline),
+    skips rows locked by a concurrent transition, and queues the plan_expired notifications in the same transaction.
+    Scheduled every few seconds, so a plan expires shortly after its deadline.
+    """
+    started = time.monotonic()
+    total = 0
+    while True:
+        now = datetime.now()
+        async with database_manager.get_session() as session:
+            due = (
+                select(ShoppingPlan.plan_id)
+                .where(text(ACTIVE_PLAN_PREDICATE), ShoppingPlan.deadline < now)
+                .order_by(ShoppingPlan.deadline)
+                .limit(BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
             stmt = (
                 update(ShoppingPlan)
-                .where(
-                    ShoppingPlan.plan_status.in_([PlanStatus.CREATED, PlanStatus.IN_PROGRESS]),
-                    ShoppingPlan.deadline < now
-                )
-                .values(plan_status=PlanStatus.EXPIRED)
+                .where(ShoppingPlan.plan_id.in_(due.scalar_subquery()))
+                .values(plan_status=PlanStatus.EXPIRED, version=ShoppingPlan.version + 1)
                 .returning(
                     ShoppingPlan.plan_id,
                     ShoppingPlan.group_id,
                     ShoppingPlan.assigner_id,
                     ShoppingPlan.deadline,
                 )
+                .execution_options(synchronize_session=False)
             )
-            expired_plans = list(db.execute(stmt).all())
+            expired_plans = (await session.execute(stmt)).all()
 
-        for plan_id, group_id, assigner_id, deadline in expired_plans:
-            try:
-                await kafka_manager.send_message(
+            for plan_id, group_id, assigner_id, deadline in expired_plans:
+                enqueue_event(
+                    session,
+                    OutboxEvent,
                     topic=NOTIFICATION_TOPIC,
                     value={
                         "event_type": "plan_expired",
@@ -45,9 +62,11 @@ async def expire_plans():
                         }
                     },
                     key=f"{group_id}-plan",
-                    wait=True,
                 )
-            except Exception as e:
-                logger.error(f"Failed to publish plan_expired for group_id={group_id}, plan_id={plan_id}: {e}", exc_info=True)
-    finally:
-        db.close()
\ No newline at end of file
+
+        total += len(expired_plans)
+        if len(expired_plans) < BATCH_SIZE:
+            break
+
+    if total:
+        logger.info(f"Expired {total} plans in {time.monotonic() - started:.2f}s")
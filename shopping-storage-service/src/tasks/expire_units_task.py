@@ -1,103 +1,108 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import time
 from datetime import date, timedelta
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
 
-from core.database import SessionLocal
+from core.database import database_manager
 from core.messaging import kafka_manager
+from models.group_stats import expired_rollup_statements
 from models.storage import Storage, StorableUnit
+from shopping_shared.messaging.bounded_publisher import BoundedPublisher
 from shopping_shared.messaging.kafka_topics import NOTIFICATION_TOPIC
+from shopping_shared.scheduling.job_coordinator import Shard, shard_filter
 from shopping_shared.utils.logger_utils import get_logger
 
 
 logger = get_logger("Expiration Units Task")
 
-
-async def publish_expiration_notifications() -> None:
-    db: Session = SessionLocal()
-    try:
-        today = date.today()
-        expiring_soon_day = today + timedelta(days=3)
-
-        stmt = (
-            select(
-                Storage.group_id,
-                Storage.storage_id,
-                Storage.storage_name,
-                StorableUnit.unit_name,
-                StorableUnit.expiration_date,
-            )
-            .join(Storage, StorableUnit.storage_id == Storage.storage_id)
-            .where(StorableUnit.expiration_date.in_([today, expiring_soon_day]))
+STREAM_BATCH_SIZE = 2000
+MAX_IN_FLIGHT = 500
+
+
+async def publish_expiration_notifications(shard: Optional[Shard] = None) -> None:
+    """
+    Sends one food_expiration_digest per group listing its units that expire today and in 3 days.
+    Rows are streamed with a server-side cursor ordered by group, so only one group is held in memory,
+    and digests are published concurrently with a bounded number of unacknowledged sends.
+    Before that, today's expiring packages are rolled up into the groups' items_expired stats.
+    With a shard, only the groups hashing into it are handled (see JobCoordinator.sharded).
+    """
+    started = time.monotonic()
+    today = date.today()
+    expiring_soon_day = today + timedelta(days=3)
+
+    async with database_manager.get_session() as session:
+        for stmt in expired_rollup_statements(today, shard):
+            await session.execute(stmt)
+
+    stmt = (
+        select(
+            StorableUnit.group_id,
+            Storage.storage_id,
+            Storage.storage_name,
+            StorableUnit.unit_name,
+            StorableUnit.expiration_date,
         )
-        rows = db.execute(stmt).all()
-
-        expired_today: Dict[str, List[Tuple[str, str, date]]] = defaultdict(list)
-        expiring_soon: Dict[str, List[Tuple[str, str, date]]] = defaultdict(list)
-
-        for group_id, storage_id, storage_name, unit_name, expiration_date in rows:
-            if expiration_date is None:
-                continue
-
-            storage_name_final = storage_name or f"Storage #{storage_id}"
-
-            if expiration_date == today:
-                expired_today[str(group_id)].append((storage_name_final, unit_name, expiration_date))
-            elif expiration_date == expiring_soon_day:
-                expiring_soon[str(group_id)].append((storage_name_final, unit_name, expiration_date))
-
-        for group_id, items in expired_today.items():
-            for storage_name, unit_name, exp_date in items:
-                try:
-                    await kafka_manager.send_message(
-                        topic=NOTIFICATION_TOPIC,
-                        value={
-                            "event_type": "food_expired",
-                            "group_id": group_id,
-                            "receiver_is_head_chef": False,
-                            "data": {
-                                "unit_name": unit_name,
-                                "storage_name": storage_name,
-                            }
-                        },
-                        key=f"{group_id}-food-expired",
-                        wait=True,
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to publish food_expired for group={group_id}, unit={unit_name}: {e}",
-                        exc_info=True,
-                    )
-
-        for group_id, items in expiring_soon.items():
-            for storage_name, unit_name, exp_date in items:
-                try:
-                    await kafka_manager.send_message(
-                        topic=NOTIFICATION_TOPIC,
-                        value={
-                            "event_type": "food_expiring_soon",
-                            "group_id": group_id,
-                            "receiver_is_head_chef": False,
-                            "data": {
-                                "unit_name": unit_name,
-                                "storage_name": storage_name,
-                                "expiration_date": exp_date.strftime("%d/%m/%Y"),
-                            }
-                        },
-                        key=f"{group_id}-food-expiring-soon",
-                        wait=True,
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to publish food_expiring_soon for group={group_id}, unit={unit_name}: {e}",
-                        exc_info=True,
-                    )
-
-    finally:
-        db.close()
-
+        .join(StorableUnit.storage)
+        .where(StorableUnit.expiration_date.in_([today, expiring_soon_day]))
+        .order_by(StorableUnit.group_id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    if shard is not None:
+        stmt = stmt.where(shard_filter(StorableUnit.group_id, shard))
+
+    groups = 0
+    items = 0
+    current_group: Optional[UUID] = None
+    expired: List[Dict[str, Any]] = []
+    expiring_soon: List[Dict[str, Any]] = []
+
+    async with BoundedPublisher(kafka_manager, max_in_flight=MAX_IN_FLIGHT) as publisher:
+        async def publish_digest(group_id: UUID, expired: List[Dict[str, Any]], expiring_soon: List[Dict[str, Any]]):
+            await publisher.publish(
+                topic=NOTIFICATION_TOPIC,
+                value={
+                    "event_type": "food_expiration_digest",
+                    "group_id": str(group_id),
+                    "receiver_is_head_chef": False,
+                    "data": {
+                        "expired": expired,
+                        "expiring_soon": expiring_soon,
+                    }
+                },
+                key=f"{group_id}-food-expiration",
+            )
 
+        async with database_manager.get_session() as session:
+            result = await session.stream(stmt)
+            async for group_id, storage_id, storage_name, unit_name, expiration_date in result:
+                if group_id != current_group:
+                    if current_group is not None:
+                        await publish_digest(current_group, expired, expiring_soon)
+                        groups += 1
+                    current_group = group_id
+                    expired, expiring_soon = [], []
+
+                storage_name_final = storage_name or f"Storage #{storage_id}"
+                if expiration_date == today:
+                    expired.append({"unit_name": unit_name, "storage_name": storage_name_final})
+                else:
+                    expiring_soon.append({
+                        "unit_name": unit_name,
+                        "storage_name": storage_name_final,
+                        "expiration_date": expiration_date.strftime("%d/%m/%Y"),
+                    })
+                items += 1
+
+        if current_group is not None:
+            await publish_digest(current_group, expired, expiring_soon)
+            groups += 1
+
+    logger.info(
+        f"Expiration digests: groups={groups}, items={items}, sent={publisher.sent}, failed={publisher.failed}, "
+        f"elapsed={time.monotonic() - started:.2f}s"
+    )
@@ -1,29 +1,48 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from tasks.expire_plans_task import expire_plans
 from tasks.expire_units_task import publish_expiration_notifications
+from services.component_existence_publisher import component_existence_publisher
+from shopping_shared.caching.redis_manager import redis_manager
+from shopping_shared.scheduling.job_coordinator import JobCoordinator
 from shopping_shared.utils.logger_utils import get_logger
 
 logger = get_logger("Scheduler")
 
 scheduler = AsyncIOScheduler()
 
+# Every replica runs this scheduler; the coordinator makes each fire do the work once
+job_coordinator = JobCoordinator(redis_manager, service="shopping-storage-service")
+
 def setup_scheduler():
+    job_coordinator.start()
+
     scheduler.add_job(
-        expire_plans,
-        trigger=CronTrigger(hour="*", minute=1),
+        job_coordinator.exclusive(expire_plans, "expire_plans"),
+        trigger=IntervalTrigger(seconds=30),
         id="expire_plans",
-        name="Expire expired shopping plans",
-        replace_existing=True
+        name="Expire overdue shopping plans (every 30s)",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
     )
 
     scheduler.add_job(
-        publish_expiration_notifications,
+        job_coordinator.sharded(publish_expiration_notifications, "publish_expiration_notifications"),
         trigger=CronTrigger(hour=0, minute=0),
         id="publish_expiration_notifications",
         name="Publish expiration notifications (00:00)",
         replace_existing=True
     )
 
-    logger.info("Scheduler setup completed with 2 jobs")
+    scheduler.add_job(
+        job_coordinator.exclusive(component_existence_publisher.publish_snapshot, "publish_component_existence_snapshot"),
+        trigger=CronTrigger(hour=3, minute=0),
+        id="publish_component_existence_snapshot",
+        name="Publish full component existence snapshots (03:00)",
+        replace_existing=True
+    )
+
+    logger.info("Scheduler setup completed with 3 jobs")
     return scheduler
\ No newline at end of file
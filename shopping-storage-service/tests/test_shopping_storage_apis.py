@@ -233,7 +233,18 @@ def test_storable_unit_apis():
         verify=VERIFY_SSL
     )
     if resp.status_code == 200:
-        print_success(f"Get Stacked Units: Found {len(resp.json()['data'])} stacked groups")
+        stacks = resp.json()['data']
+        print_success(f"Get Stacked Units: Found {len(stacks)} stacked groups")
+        if stacks:
+            resp = requests.get(
+                f"{BASE_URL}/v1/storable_units/stacked/{stacks[0]['stack_id']}/batches",
+                headers=context["headers"],
+                verify=VERIFY_SSL
+            )
+            if resp.status_code == 200:
+                print_success(f"Get Stack Batches: Found {len(resp.json()['data'])} batches")
+            else:
+                print_error(f"Get Stack Batches failed: {resp.text}")
 
     # 5. Filter Units
     resp = requests.get(
@@ -245,6 +256,43 @@ def test_storable_unit_apis():
     if resp.status_code == 200:
         print_success(f"Filter Units by Group: Found {len(resp.json()['data'])} items")
 
+    # 5b. Storage Summary (aggregates instead of unit lists)
+    resp = requests.get(
+        f"{BASE_URL}/v1/storages/summary",
+        params={"group_id": context["group_id"], "expiring_within_days": 7},
+        headers=context["headers"],
+        verify=VERIFY_SSL
+    )
+    if resp.status_code == 200:
+        summary = next((s for s in resp.json()["data"] if s["storage_id"] == context["storage_id"]), None)
+        print_success(f"Storage Summary: {summary}")
+    else:
+        print_error(f"Storage Summary failed: {resp.text}")
+
+    # 5c. Streaming Export (NDJSON)
+    resp = requests.get(
+        f"{BASE_URL}/v1/exports/storable_units",
+        params={"group_id": context["group_id"], "format": "ndjson"},
+        headers=context["headers"],
+        verify=VERIFY_SSL
+    )
+    if resp.status_code == 200:
+        print_success(f"Export Units: {len(resp.text.splitlines())} rows")
+    else:
+        print_error(f"Export Units failed: {resp.text}")
+
+    # 5d. Component Stock (used by meal-service's shopping plan draft)
+    resp = requests.post(
+        f"{BASE_URL}/v1/storable_units/stock",
+        json={"group_id": context["group_id"], "component_ids": [298]},
+        headers=context["headers"],
+        verify=VERIFY_SSL
+    )
+    if resp.status_code == 200:
+        print_success(f"Component Stock: {resp.json()['data']}")
+    else:
+        print_error(f"Component Stock failed: {resp.text}")
+
     # 6. Get Many Units (List)
     resp = requests.get(f"{BASE_URL}/v1/storable_units/", headers=context["headers"], verify=VERIFY_SSL)
     if resp.status_code == 200:
@@ -259,7 +307,31 @@ def test_storable_unit_apis():
     )
     if resp.status_code == 200:
         print_success(f"Consumed 3 units: {resp.json()['message']}")
-        
+
+    # 8. Batch Consume (FIFO by expiration)
+    resp = requests.post(
+        f"{BASE_URL}/v1/storable_units/consume",
+        json={"group_id": context["group_id"], "items": [{"component_id": 298, "quantity": 2}]},
+        headers=context["headers"],
+        verify=VERIFY_SSL
+    )
+    if resp.status_code == 200:
+        print_success(f"Batch consumed: {resp.json()['data']}")
+    else:
+        print_error(f"Batch consume failed: {resp.text}")
+
+    # 9. Daily Group Stats (consumption rolled up incrementally)
+    resp = requests.get(
+        f"{BASE_URL}/v1/group_stats/daily",
+        params={"group_id": context["group_id"]},
+        headers=context["headers"],
+        verify=VERIFY_SSL
+    )
+    if resp.status_code == 200:
+        print_success(f"Daily Stats: {resp.json()['data']}")
+    else:
+        print_error(f"Daily Stats failed: {resp.text}")
+
     return True
 
 def test_shopping_plan_apis():
@@ -297,6 +369,18 @@ def test_shopping_plan_apis():
         print_error(f"Failed to create plan: {resp.text}")
         return False
 
+    # 1b. Active Plans Including a Component (GIN containment lookup)
+    resp = requests.get(
+        f"{BASE_URL}/v1/shopping_plans/by_component",
+        params={"group_id": context["group_id"], "component_id": 424},
+        headers=context["headers"],
+        verify=VERIFY_SSL
+    )
+    if resp.status_code == 200 and any(p["plan_id"] == context["plan_id"] for p in resp.json()["data"]):
+        print_success("Plans By Component: new plan found")
+    else:
+        print_error(f"Plans By Component failed: {resp.text}")
+
     # 2. Get Plan By ID
     resp = requests.get(f"{BASE_URL}/v1/shopping_plans/{context['plan_id']}", headers=context["headers"], verify=VERIFY_SSL)
     if resp.status_code == 200:
@@ -307,6 +391,45 @@ def test_shopping_plan_apis():
     resp = requests.put(f"{BASE_URL}/v1/shopping_plans/{context['plan_id']}", json=update_payload, headers=context["headers"], verify=VERIFY_SSL)
     if resp.status_code == 200:
         print_success("Updated Plan: OK")
+        version = resp.json()["version"]
+
+        # 3b. Patch Plan (JSON Patch guarded by If-Match)
+        patch_ops = [{"op": "replace", "path": "/shopping_list/0/quantity", "value": 1500}]
+        resp = requests.patch(
+            f"{BASE_URL}/v1/shopping_plans/{context['plan_id']}",
+            json=patch_ops,
+            headers={**context["headers"], "If-Match": f'"{version}"'},
+            verify=VERIFY_SSL
+        )
+        if resp.status_code == 200 and resp.json()["shopping_list"][0]["quantity"] == 1500:
+            print_success(f"Patched Plan: OK (ETag {resp.headers.get('ETag')})")
+        else:
+            print_error(f"Patch failed: {resp.text}")
+
+        # Re-sending with the old version must be rejected
+        resp = requests.patch(
+            f"{BASE_URL}/v1/shopping_plans/{context['plan_id']}",
+            json=patch_ops,
+            headers={**context["headers"], "If-Match": f'"{version}"'},
+            verify=VERIFY_SSL
+        )
+        if resp.status_code == 412:
+            print_success("Stale If-Match rejected with 412")
+        else:
+            print_error(f"Expected 412 for stale version, got {resp.status_code}: {resp.text}")
+
+        # 3c. Digit keys in `others` are object members: adding an existing one replaces it (RFC 6902)
+        for value in ["first", "second"]:
+            resp = requests.patch(
+                f"{BASE_URL}/v1/shopping_plans/{context['plan_id']}",
+                json=[{"op": "add", "path": "/others/2", "value": value}],
+                headers=context["headers"],
+                verify=VERIFY_SSL
+            )
+        if resp.status_code == 200 and resp.json()["others"].get("2") == "second":
+            print_success("Patched digit key in others: replaced")
+        else:
+            print_error(f"Patch of digit key in others failed: {resp.status_code} - {resp.text}")
 
     # 4. Assign Plan
     resp = requests.post(